@@ -0,0 +1,119 @@
+#!/bin/bash
+
+# exp_workloads 의 각 워크로드에서 GDB 경로(*.sh)와 GDB 없는 경로(analyze_workload.sh)의
+# startup/attach 시간과 전체 시간을 비교하고 두 경로의 ISA set CSV가 같은지 확인
+# 사용법: ./gdb_free_benchmark.sh [RUNS]
+
+RUNS=${1:-3}
+
+analyzer_path="/home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer"
+root_path="$analyzer_path/bytecode_tracking/exp_workloads"
+result_path="/home/ubuntu/result/gdb_free_benchmark"
+summary="$result_path/summary.csv"
+
+declare -A ready_strings
+ready_strings["beautifulsoup4/bs4_example.py"]="Main div"
+ready_strings["dask_matmul/dask_matmul.py"]="]]"
+ready_strings["dask_uuid/dask_uuid.py"]="Final Result"
+ready_strings["falcon_http/falcon_http.py"]="healthy"
+ready_strings["fastapi/fastapi_example.py"]="Created"
+ready_strings["int8dot/int8dot_test.py"]="Execution time"
+ready_strings["llm/llm.py"]="remaining 1 prompt tokens to eval"
+ready_strings["matmul/matmul.py"]="]]"
+ready_strings["matplotlib/matplotlib_example.py"]="Histogram generated"
+ready_strings["pku/pku_test.py"]="Memory has been released"
+ready_strings["rand/rand.py"]="Generated random number"
+ready_strings["rsa/rsa_test.py"]="Encrypted text"
+ready_strings["sha/sha_test.py"]="SHA-256 hash"
+ready_strings["sklearn/sklearn_example.py"]="Their importance scores"
+ready_strings["xgboost/xgb_example.py"]="mlogloss"
+
+test_array=("beautifulsoup4/bs4_example.py" "dask_matmul/dask_matmul.py" "dask_uuid/dask_uuid.py" "falcon_http/falcon_http.py" "fastapi/fastapi_example.py" "int8dot/int8dot_test.py" "llm/llm.py" "matmul/matmul.py" "matplotlib/matplotlib_example.py" "pku/pku_test.py" "rand/rand.py" "rsa/rsa_test.py" "sha/sha_test.py" "sklearn/sklearn_example.py" "xgboost/xgb_example.py")
+
+# 분석 방법별 GDB 경로의 쉘 스크립트와 analyze_workload.sh 의 ANALYSIS_METHOD
+declare -A gdb_scripts
+gdb_scripts["full_scan"]="text_segment_full_scan.sh"
+gdb_scripts["exepath"]="execution_path_tracking.sh"
+gdb_scripts["bytecode_only"]="bytecode_only_execution_path_tracking.sh"
+methods=("full_scan" "exepath" "bytecode_only")
+
+# 분석 로그에서 시간 값 추출 (없으면 빈 값)
+extract() {
+    grep -m1 "^$1:" "$2" | awk '{print $(NF-1)}'
+}
+
+mkdir -p "$result_path"
+echo "workload,method,path,run,wall_time,startup_time,total_time,same_result" > "$summary"
+
+cd "$analyzer_path"
+
+for test in "${test_array[@]}"; do
+    test_dir="${test%/*}"
+    test_file="${test##*/}"
+    log_file="$result_path/$test_dir.log"
+    ready_string="${ready_strings[$test]}"
+
+    echo "--- [START] Test: $test ---"
+
+    cd "$root_path/$test_dir"
+    setsid python3 "$test_file" < /dev/null &> "$log_file" &
+    pid=$(pgrep -f "python3 $test_file")
+    cd "$analyzer_path"
+
+    while ! ([ -f "$log_file" ] && grep -qF "$ready_string" "$log_file"); do
+        if ! kill -0 $pid 2>/dev/null; then
+            echo "  -> ERROR: Process $pid exited prematurely. Check log file for details."
+            continue 2
+        fi
+        sleep 1
+    done
+
+    for method in "${methods[@]}"; do
+        for (( i=1; i<=RUNS; i++ )); do
+            for path in gdb gdb_free; do
+                run_log="$result_path/${test_dir}_${method}_${path}_$i.log"
+                rm -f log/isa_set.csv
+
+                start=$(date +%s.%N)
+                if [ "$path" == "gdb" ]; then
+                    if [ "$method" == "full_scan" ]; then
+                        sudo -E ./${gdb_scripts[$method]} $pid &> "$run_log"
+                    else
+                        sudo -E ./${gdb_scripts[$method]} $pid python "$root_path/$test" &> "$run_log"
+                    fi
+                else
+                    sudo -E ./analyze_workload.sh $pid $method python "$root_path/$test" &> "$run_log"
+                fi
+                wall_time=$(echo "$(date +%s.%N) - $start" | bc)
+                cp log/isa_set.csv "$result_path/${test_dir}_${method}_${path}.csv" 2>/dev/null
+
+                # GDB 경로의 startup time은 GDB가 심볼을 로드하고 스크립트를 시작하기까지의 시간
+                if [ "$path" == "gdb" ]; then
+                    startup_time=$(extract "GDB load time" "$run_log")
+                else
+                    startup_time=$(extract "attach time" "$run_log")
+                fi
+                total_time=$(extract "total time" "$run_log")
+
+                same_result=""
+                if [ "$path" == "gdb_free" ]; then
+                    if cmp -s "$result_path/${test_dir}_${method}_gdb.csv" "$result_path/${test_dir}_${method}_gdb_free.csv"; then
+                        same_result="yes"
+                    else
+                        same_result="no"
+                    fi
+                fi
+
+                echo "$test_dir,$method,$path,$i,$wall_time,$startup_time,$total_time,$same_result" >> "$summary"
+                echo "  -> $method ($path, run $i): ${wall_time} sec"
+            done
+        done
+    done
+
+    kill -9 $pid
+    echo "--- [DONE] Test: $test ---"
+    echo ""
+done
+
+echo "Results: $summary"
+sudo chown -R ubuntu:ubuntu "$result_path"
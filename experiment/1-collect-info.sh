@@ -1,6 +1,8 @@
 #!/bin/bash
 export LD_LIBRARY_PATH=/home/ubuntu/xed/obj:$LD_LIBRARY_PATH
 export LD_BIND_NOW=1
+# 1이면 워크로드마다 analyze_workload.sh 로 한 번만 attach 하여 모든 결과를 수집
+COMBINED_RUN=${COMBINED_RUN:-0}
 
 cd /home/ubuntu/LiveMigrate-Detector
 git pull
@@ -84,49 +86,62 @@ for test in "${test_array[@]}"; do
     # criu dump를 위한 디렉토리 생성
     mkdir -p "$result_path/$test_dir"
 
-    # 이전 추적 결과 삭제
-    rm -rf log/isa_set.csv
+    if [ "$COMBINED_RUN" == "1" ]; then
+        # 한 번의 attach로 네 가지 결과를 함께 수집 (GDB 없이 실행)
+        rm -f log/isa_set.*.csv
+        echo "  -> Running combined analysis for $pid..."
+        sudo -E ./analyze_workload.sh $pid all python "$root_path/$test" &> "$result_path/${test_dir}_combined.log"
 
-    # 실행 경로 추적 시작
-    echo "  -> Running execution path tracking for $pid..."
-    sudo -E ./execution_path_tracking.sh $pid native &> "$result_path/${test_dir}_native_ept.log"
+        for method in native bytecode text_segment_full_scan bytecode_only_ept; do
+            cp log/isa_set.$method.csv "$result_path/$test_dir.$method.csv"
+            echo "  -> Result copied to $result_path/$test_dir.$method.csv"
+        done
+    else
+        # 이전 추적 결과 삭제
+        rm -rf log/isa_set.csv
 
-    # 추적 결과 복사
-    cp log/isa_set.csv "$result_path/$test_dir.native.csv"
-    echo "  -> Result copied to $result_path/$test_dir.native.csv"
+        # 실행 경로 추적 시작
+        echo "  -> Running execution path tracking for $pid..."
+        sudo -E ./execution_path_tracking.sh $pid native &> "$result_path/${test_dir}_native_ept.log"
 
-    # 이전 추적 결과 삭제
-    rm -rf log/isa_set.csv
+        # 추적 결과 복사
+        cp log/isa_set.csv "$result_path/$test_dir.native.csv"
+        echo "  -> Result copied to $result_path/$test_dir.native.csv"
 
-    # 바이트코드 실행 경로 추적 시작
-    echo "  -> Running bytecode execution path tracking for $pid..."
-    sudo -E ./execution_path_tracking.sh $pid python "$root_path/$test" &> "$result_path/${test_dir}_bytecode_ept.log"
+        # 이전 추적 결과 삭제
+        rm -rf log/isa_set.csv
 
-    # 추적 결과 복사
-    cp log/isa_set.csv "$result_path/$test_dir.bytecode.csv"
-    echo "  -> Result copied to $result_path/$test_dir.bytecode.csv"
+        # 바이트코드 실행 경로 추적 시작
+        echo "  -> Running bytecode execution path tracking for $pid..."
+        sudo -E ./execution_path_tracking.sh $pid python "$root_path/$test" &> "$result_path/${test_dir}_bytecode_ept.log"
 
-    # 이전 추적 결과 삭제
-    rm -rf log/isa_set.csv
+        # 추적 결과 복사
+        cp log/isa_set.csv "$result_path/$test_dir.bytecode.csv"
+        echo "  -> Result copied to $result_path/$test_dir.bytecode.csv"
 
-    # text segment full scan 시작
-    echo "  -> Running text segment full scan for $pid..."
-    sudo -E ./text_segment_full_scan.sh $pid &> "$result_path/${test_dir}_text_segment_full_scan.log"
+        # 이전 추적 결과 삭제
+        rm -rf log/isa_set.csv
 
-    # 추적 결과 복사
-    cp log/isa_set.csv "$result_path/$test_dir.text_segment_full_scan.csv"
-    echo "  -> Result copied to $result_path/$test_dir.text_segment_full_scan.csv"
+        # text segment full scan 시작
+        echo "  -> Running text segment full scan for $pid..."
+        sudo -E ./text_segment_full_scan.sh $pid &> "$result_path/${test_dir}_text_segment_full_scan.log"
 
-    # 이전 추적 결과 삭제
-    rm -rf log/isa_set.csv
+        # 추적 결과 복사
+        cp log/isa_set.csv "$result_path/$test_dir.text_segment_full_scan.csv"
+        echo "  -> Result copied to $result_path/$test_dir.text_segment_full_scan.csv"
 
-    # bytecode only execution path tracking 시작
-    echo "  -> Running bytecode only execution path tracking for $pid..."
-    sudo -E ./bytecode_only_execution_path_tracking.sh $pid python "$root_path/$test" &> "$result_path/${test_dir}_bytecode_only_ept.log"
+        # 이전 추적 결과 삭제
+        rm -rf log/isa_set.csv
 
-    # 추적 결과 복사
-    cp log/isa_set.csv "$result_path/$test_dir.bytecode_only_ept.csv"
-    echo "  -> Result copied to $result_path/$test_dir.bytecode_only_ept.csv"
+        # bytecode only execution path tracking 시작
+        echo "  -> Running bytecode only execution path tracking for $pid..."
+        sudo -E ./bytecode_only_execution_path_tracking.sh $pid python "$root_path/$test" &> "$result_path/${test_dir}_bytecode_only_ept.log"
+
+        # 추적 결과 복사
+        cp log/isa_set.csv "$result_path/$test_dir.bytecode_only_ept.csv"
+        echo "  -> Result copied to $result_path/$test_dir.bytecode_only_ept.csv"
+
+    fi
 
     # 프로세스 상태 덤프
     echo "  -> Dumping process $pid..."
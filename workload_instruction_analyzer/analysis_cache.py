@@ -0,0 +1,206 @@
+'''
+공유 객체별 분석 결과를 ELF build-id 기준으로 디스크에 저장하는 캐시.
+libc, libpython 등은 모든 노드에서 동일하므로 한 번 분석한 함수는 다시 디코딩하지 않음.
+모든 주소는 load base 기준 오프셋으로 저장하며 사용 시 현재 load base로 rebase 함.
+
+ANALYSIS_CACHE=0            캐시 비활성화
+ANALYSIS_CACHE_DIR          캐시 DB 경로 (기본값: workload_instruction_analyzer/cache)
+ANALYSIS_CACHE_MAX_MB       캐시 최대 크기. 초과 시 가장 오래 사용되지 않은 공유 객체부터 삭제
+'''
+
+import json
+import os
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+from elftools.elf.elffile import ELFFile
+
+import elf_utils
+import phase_tracer
+
+rootdir = str(Path(__file__).resolve().parent)
+
+# 엔트리 종류
+FUNCTION = 'func'
+SCAN = 'scan'
+# 기본 ISA 대표 인코딩을 추가하기 전에 캐시된 prefilter 결과는 사용하지 않음
+PREFILTER_SCAN = 'prefilter_scan2'
+METHODS = 'methods'
+OBJECT_ISA = 'object_isa'
+
+DEFAULT_MAX_MB = 1024
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS objects (
+    build_id TEXT PRIMARY KEY,
+    path TEXT,
+    last_used REAL,
+    size INTEGER
+);
+CREATE TABLE IF NOT EXISTS entries (
+    build_id TEXT,
+    kind TEXT,
+    offset INTEGER,
+    data TEXT,
+    PRIMARY KEY (build_id, kind, offset)
+);
+'''
+
+
+class AnalysisCache:
+    def __init__(self, cache_dir, max_bytes):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(cache_dir, 'analysis.db'))
+        self.db.executescript(SCHEMA)
+        self.max_bytes = max_bytes
+
+        # path -> build-id (build-id가 없는 객체는 None 이며 캐시하지 않음)
+        self.build_ids = {}
+        # (build_id, kind) -> {offset: data}
+        self.loaded = {}
+        # 종료 시 한 번에 기록할 엔트리
+        self.pending = []
+        self.used = {}
+
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evicted = 0
+
+    def build_id(self, path):
+        if path not in self.build_ids:
+            try:
+                with open(path, 'rb') as f:
+                    self.build_ids[path] = elf_utils.get_build_id(ELFFile(f))
+            except Exception:
+                self.build_ids[path] = None
+        return self.build_ids[path]
+
+    def _entries(self, build_id, kind):
+        key = (build_id, kind)
+        if key not in self.loaded:
+            # 공유 객체의 엔트리는 처음 조회할 때 한 번의 쿼리로 모두 읽음
+            rows = self.db.execute(
+                'SELECT offset, data FROM entries WHERE build_id = ? AND kind = ?', key)
+            self.loaded[key] = {offset: data for offset, data in rows}
+        return self.loaded[key]
+
+    def lookup(self, kind, path, offset=0):
+        '''
+        캐시된 결과를 반환. 캐시에 없거나 build-id가 없는 객체라면 None.
+        '''
+        build_id = self.build_id(path)
+        if build_id is None:
+            return None
+
+        data = self._entries(build_id, kind).get(offset)
+        self.used[build_id] = path
+        if data is None:
+            self.misses[kind] += 1
+            phase_tracer.count(phase_tracer.CACHE_MISSES)
+            return None
+
+        self.hits[kind] += 1
+        phase_tracer.count(phase_tracer.CACHE_HITS)
+        if isinstance(data, str):
+            data = json.loads(data)
+            self._entries(build_id, kind)[offset] = data
+        return data
+
+    def store(self, kind, path, offset, data):
+        build_id = self.build_id(path)
+        if build_id is None:
+            return
+
+        self._entries(build_id, kind)[offset] = data
+        self.pending.append((build_id, kind, offset, json.dumps(data)))
+        self.used[build_id] = path
+
+    def flush(self):
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)', self.pending)
+            for build_id, path in self.used.items():
+                size = self.db.execute(
+                    'SELECT COALESCE(SUM(LENGTH(data)), 0) FROM entries WHERE build_id = ?',
+                    (build_id,)).fetchone()[0]
+                self.db.execute('INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?)',
+                                (build_id, path, now, size))
+        self.pending = []
+        self.used = {}
+
+        self.evict()
+
+    def evict(self):
+        '''
+        캐시 크기가 제한을 넘으면 가장 오래 사용되지 않은 공유 객체부터 삭제 (LRU).
+        '''
+        total = self.db.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM objects').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        with self.db:
+            for build_id, size in self.db.execute(
+                    'SELECT build_id, size FROM objects ORDER BY last_used').fetchall():
+                if total <= self.max_bytes:
+                    break
+                self.db.execute('DELETE FROM entries WHERE build_id = ?', (build_id,))
+                self.db.execute('DELETE FROM objects WHERE build_id = ?', (build_id,))
+                self.loaded = {key: value for key, value in self.loaded.items()
+                               if key[0] != build_id}
+                total -= size
+                self.evicted += 1
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    def summary(self):
+        kinds = sorted(set(self.hits) | set(self.misses))
+        counts = ', '.join(
+            f'{kind} hit {self.hits[kind]} / miss {self.misses[kind]}' for kind in kinds)
+        return f'analysis cache: {counts or "unused"}, evicted objects: {self.evicted}'
+
+
+_cache = None
+
+
+def cache_enabled():
+    return os.getenv('ANALYSIS_CACHE', '1') != '0'
+
+
+def cache_dir():
+    return os.getenv('ANALYSIS_CACHE_DIR', f'{rootdir}/cache')
+
+
+def get_cache():
+    '''
+    프로세스 내에서 공유하는 캐시를 반환. ANALYSIS_CACHE=0 이면 None.
+    '''
+    global _cache
+
+    if not cache_enabled():
+        return None
+
+    if _cache is None:
+        max_mb = int(os.getenv('ANALYSIS_CACHE_MAX_MB', DEFAULT_MAX_MB))
+        _cache = AnalysisCache(cache_dir(), max_mb * 1024 * 1024)
+    return _cache
+
+
+def close_cache():
+    '''
+    대기 중인 엔트리를 기록하고 hit/miss 요약을 반환.
+    '''
+    global _cache
+
+    if _cache is None:
+        return None
+
+    _cache.close()
+    summary = _cache.summary()
+    _cache = None
+    return summary
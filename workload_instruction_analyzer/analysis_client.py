@@ -0,0 +1,57 @@
+'''
+analysis_daemon.py 에 분석을 요청하고 결과를 다른 분석 스크립트와 같이 log/isa_set.csv (와 isa_set.json)에 기록.
+
+WORKLOAD_PID            분석할 프로세스
+LANGUAGE_TYPE           워크로드 언어 (python이면 SCRIPT_PATH로 bytecode tracking 수행)
+SCRIPT_PATH             python 워크로드의 엔트리 스크립트
+ANALYSIS_SOCKET         데몬의 Unix socket 경로 (기본값: log/analysis.sock)
+ANALYSIS_STATS=1        분석 대신 데몬의 요청별 latency 통계를 출력
+'''
+
+import json
+import os
+import socket
+
+import utils
+
+SOCKET_PATH = os.getenv('ANALYSIS_SOCKET', utils.analysis_socket_file)
+
+
+def request(message, path=SOCKET_PATH):
+    '''
+    데몬에 요청(dict)을 보내고 응답(dict)을 반환.
+    '''
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps(message).encode() + b'\n')
+        with sock.makefile('rb') as f:
+            return json.loads(f.readline())
+
+
+if __name__ == '__main__':
+    if os.getenv('ANALYSIS_STATS', '0') == '1':
+        print(json.dumps(request({'command': 'stats'}), indent=2))
+        exit()
+
+    PID = int(os.getenv('WORKLOAD_PID', '0'))
+    LANGUAGE_TYPE = os.getenv('LANGUAGE_TYPE', '0')
+    SCRIPT_PATH = os.getenv('SCRIPT_PATH')
+
+    response = request(
+        {'pid': PID, 'language': LANGUAGE_TYPE, 'script_path': SCRIPT_PATH})
+    if 'error' in response:
+        print(f"error: {response['error']}")
+        exit(1)
+
+    with open(utils.workload_isa_file, 'w', newline='') as f:
+        f.write(response['csv'])
+    if os.getenv('ISA_SET_JSON', '0') == '1' or 'approximated' in response['json']['objects'].values():
+        with open(utils.workload_isa_json_file, 'w') as f:
+            json.dump(response['json'], f, indent=2)
+
+    print(f"ISA set count: {len(response['json']['isa_sets'])}")
+    print(f"tracked function count: {response['tracked_functions']}")
+    print(response['coverage'])
+    for phase, latency in response['latency'].items():
+        print(f'{phase} time: {latency:.6f} sec')
+    print(response['phases'])
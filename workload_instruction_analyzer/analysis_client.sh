@@ -0,0 +1,33 @@
+#!/bin/bash
+
+# Prints the daemon's per-request latency statistics
+if [ "$1" == "stats" ]; then
+    export ANALYSIS_STATS=1
+    python3 /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/analysis_client.py
+    exit $?
+fi
+
+if [ -z "$1" ]; then
+    echo "Warning: A PID must be provided as a parameter."
+    exit 1
+fi
+
+if [ -z "$2" ]; then
+    echo "Warning: A language type must be provided as a parameter."
+    exit 1
+fi
+
+if [ "$2" == "python" ]; then
+    if [ -z "$3" ]; then
+        echo "Warning: A script path must be provided as a parameter for python."
+        exit 1
+    else
+        export SCRIPT_PATH=$(realpath "$3")
+    fi
+fi
+
+export WORKLOAD_PID=$1
+export LANGUAGE_TYPE=$2
+
+# The analysis runs in analysis_daemon.sh, which keeps library summaries and symbols warm across workloads
+python3 /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/analysis_client.py
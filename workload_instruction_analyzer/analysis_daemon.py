@@ -0,0 +1,244 @@
+'''
+호스트의 여러 워크로드를 분석하는 상주 데몬. Unix socket으로 analyze(pid, language, script_path) 요청을 받아
+워크로드의 스냅샷을 캡처한 뒤 GDB 없이 execution path tracking(python이면 bytecode tracking 포함)을 수행하고
+ISA set CSV/JSON을 반환함.
+요청마다 GDB를 시작하고 심볼을 로드하지 않으며 다음 상태가 요청 사이에 메모리에 유지됨.
+  - 공유 객체별 함수 요약, PyMethodDef 매핑 (analysis_cache), 인스트럭션 분류 결과 (decode_cache)
+  - 공유 객체별 ELF 섹션, 함수 심볼, .dynamic 파싱 결과 (elf_utils.parse_cached)
+  - bytecode tracking의 모듈 인덱스 (module_index, 요청마다 mtime이 바뀐 디렉토리만 다시 읽음)와
+    모듈별 call map (call_map_cache)
+
+요청과 응답은 한 줄의 JSON.
+  {"pid": 1234, "language": "python", "script_path": "/path/to/main.py"}
+      -> {"pid": 1234, "csv": "...", "json": {...}, "latency": {...}, "phases": "..."}
+  {"command": "stats"}
+      -> 요청 수, 오류 수, 단계별 latency 통계 (mean, p50, p95, max)
+
+요청은 연결마다 스레드에서 받아 바로 스냅샷을 캡처하고 (워크로드가 멈추는 시간은 대기열과 무관),
+분석은 캐시와 bytecode tracking의 전역 상태를 공유하므로 분석 스레드 하나가 순서대로 수행함.
+
+ANALYSIS_SOCKET         Unix socket 경로 (기본값: log/analysis.sock)
+EPT_DEADLINE            요청별 분석 시간 제한 (sec, 요청을 받은 시점 기준)
+'''
+
+import json
+import os
+import queue
+import signal
+import socketserver
+import threading
+import time
+
+import utils
+
+import process_memory
+import symbol_index
+import workload_analysis
+import analysis_cache
+import decode_cache
+import phase_tracer
+
+SOCKET_PATH = os.getenv('ANALYSIS_SOCKET', utils.analysis_socket_file)
+LATENCY_PHASES = ('freeze', 'capture', 'queue', 'analysis', 'total')
+
+
+class AnalysisJob:
+    def __init__(self, pid, language, script_path, snapshot, received, deadline):
+        self.pid = pid
+        self.language = language
+        self.script_path = script_path
+        self.snapshot = snapshot
+        self.received = received
+        self.deadline = deadline
+
+        self.queued = time.time()
+        self.response = None
+        self.done = threading.Event()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+class AnalysisDaemon:
+    def __init__(self, deadline=0):
+        self.deadline = deadline
+        self.jobs = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name='analysis')
+
+        self.lock = threading.Lock()
+        # 요청별 {단계: sec}
+        self.latencies = []
+        self.errors = 0
+        self.in_flight = 0
+
+    def start(self):
+        self.worker.start()
+
+    def stop(self):
+        self.jobs.put(None)
+        self.worker.join()
+
+    def submit(self, pid, language, script_path=None):
+        '''
+        워크로드를 캡처하고 분석이 끝날 때까지 기다려 응답을 반환. (연결을 처리하는 스레드에서 호출)
+        '''
+        received = time.time()
+        with self.lock:
+            self.in_flight += 1
+        try:
+            if language == 'python' and not script_path:
+                return self._error(pid, 'a script path must be provided for python')
+
+            try:
+                snapshot = process_memory.capture_process(pid)
+            except OSError as e:
+                return self._error(pid, f'capture failed: {e}')
+
+            job = AnalysisJob(pid, language, script_path, snapshot, received,
+                              received + self.deadline if self.deadline > 0 else None)
+            capture_time = job.queued - received
+            self.jobs.put(job)
+            job.done.wait()
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+        response = job.response
+        if 'error' in response:
+            with self.lock:
+                self.errors += 1
+            return response
+
+        latency = response['latency']
+        latency['capture'] = capture_time
+        latency['freeze'] = snapshot.freeze_time
+        latency['total'] = time.time() - received
+        response['consistent'] = snapshot.consistent
+        with self.lock:
+            self.latencies.append(latency)
+        return response
+
+    def _error(self, pid, message):
+        with self.lock:
+            self.errors += 1
+        return {'pid': pid, 'error': message}
+
+    def _run(self):
+        # 캐시(sqlite 연결)는 분석 스레드에서만 사용
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+
+            started = time.time()
+            try:
+                job.response = self.analyze(job)
+            except Exception as e:
+                job.response = {'pid': job.pid, 'error': f'{type(e).__name__}: {e}'}
+            job.response.setdefault('latency', {})
+            job.response['latency'].update(queue=started - job.queued, analysis=time.time() - started)
+            job.done.set()
+
+        for cache_summary in (analysis_cache.close_cache(), decode_cache.close_cache()):
+            if cache_summary:
+                print(cache_summary)
+
+    def analyze(self, job):
+        # 요청별 단계 시간과 카운터를 따로 집계
+        phase_tracer.reset()
+        snapshot = job.snapshot
+        cache = analysis_cache.get_cache()
+        memory = process_memory.SnapshotMemory(snapshot)
+        try:
+            with phase_tracer.span('attach'):
+                symbols = symbol_index.SymbolIndex(maps=snapshot.maps, bases=snapshot.bases)
+
+            tracker, module_count = workload_analysis.execution_path_tracking(
+                memory, symbols, snapshot.exe, job.language, job.script_path,
+                snapshot.glibc_rtm_enable, cache, job.deadline)
+            aggregator = tracker.aggregate()
+            is_tsx_run, xtest_enable = tracker.is_tsx_run, tracker.xtest_enable
+        finally:
+            memory.close()
+            if cache is not None:
+                cache.flush()
+
+        tracer = phase_tracer.get_tracer()
+        return {
+            'pid': job.pid,
+            'csv': aggregator.csv_text(is_tsx_run, xtest_enable),
+            'json': aggregator.json_data(is_tsx_run, xtest_enable),
+            'tracked_functions': len(tracker.tracking_functions),
+            'modules': module_count,
+            'coverage': tracker.coverage_summary(),
+            'latency': {'btracking': tracer.time('btracking'),
+                        'exepath_tracking': tracer.time('exepath_tracking')},
+            'phases': tracer.summary(),
+        }
+
+    def stats(self):
+        with self.lock:
+            latencies = list(self.latencies)
+            stats = {'requests': len(latencies) + self.errors, 'errors': self.errors,
+                     'in_flight': self.in_flight, 'queued': self.jobs.qsize()}
+
+        stats['latency'] = {}
+        for phase in LATENCY_PHASES:
+            values = [latency[phase] for latency in latencies if phase in latency]
+            if values:
+                stats['latency'][phase] = {
+                    'mean': sum(values) / len(values), 'p50': percentile(values, 0.5),
+                    'p95': percentile(values, 0.95), 'max': max(values)}
+        return stats
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # 한 연결에서 여러 요청을 순서대로 처리
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get('command') == 'stats':
+                    response = self.server.analysis.stats()
+                else:
+                    response = self.server.analysis.submit(
+                        int(request['pid']), request.get('language', 'c'), request.get('script_path'))
+            except (ValueError, KeyError) as e:
+                response = {'error': f'invalid request: {e}'}
+
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class AnalysisServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, analysis):
+        self.analysis = analysis
+        super().__init__(path, RequestHandler)
+
+
+def serve(path=SOCKET_PATH, deadline=0):
+    if os.path.exists(path):
+        os.unlink(path)
+
+    analysis = AnalysisDaemon(deadline)
+    analysis.start()
+    server = AnalysisServer(path, analysis)
+    # SIGTERM도 Ctrl+C 와 같이 캐시를 저장한 뒤 종료
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    print(f'analysis daemon listening on {path}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
+        analysis.stop()
+        print(json.dumps(analysis.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    serve(SOCKET_PATH, float(os.getenv('EPT_DEADLINE', '0')))
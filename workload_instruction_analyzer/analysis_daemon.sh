@@ -0,0 +1,15 @@
+#!/bin/bash
+
+# Optional: Unix socket path (default: log/analysis.sock)
+if [ ! -z "$1" ]; then
+    export ANALYSIS_SOCKET=$1
+fi
+
+# xedlib
+export LD_LIBRARY_PATH=/home/ubuntu/xed/obj:$LD_LIBRARY_PATH
+
+# stdlib_list
+export PYTHONPATH=$PYTHONPATH:/home/ubuntu/.local/lib/python3.10/site-packages/
+
+# Serves analyze(pid, language, script_path) requests until SIGINT/SIGTERM
+python3 /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/analysis_daemon.py
@@ -0,0 +1,110 @@
+'''
+GDB 없이 실행 중인 워크로드를 분석하는 CLI. GDB와 같이 분석하는 동안 프로세스를 멈추지만
+공유 객체의 DWARF를 로드하지 않고 섹션/심볼은 ELF 파일(symbol_index), 메모리는 /proc/PID/mem(ProcMemory),
+디스어셈블은 XED로 처리함.
+
+WORKLOAD_PID            분석할 프로세스
+ANALYSIS_METHOD         full_scan | exepath | bytecode_only | all (기본값: exepath)
+                        all: 한 번의 attach로 모든 결과를 log/isa_set.<method>.csv 에 기록 (workload_analysis.combined_analysis)
+LANGUAGE_TYPE           python이면 bytecode tracking으로 찾은 C 함수를 루트에 추가 (exepath, bytecode_only)
+SCRIPT_PATH             python 워크로드의 entry 스크립트 경로
+ATTACH_MODE             ptrace | signal (기본값: ptrace). ptrace attach 권한이 없으면 (ex. ptrace_scope)
+                        PermissionError로 종료하므로 signal로 실행 (SIGSTOP/SIGCONT로 멈춤)
+FULL_SCAN_WORKERS       full scan 워커 프로세스 수 (기본값 1)
+EPT_DEADLINE            분석 시간 제한 (sec, 쉘 스크립트 시작 기준)
+START_TIME              쉘 스크립트 시작 시간. attach 전까지의 시간(startup time)을 출력하는 데 사용
+'''
+
+import os
+import time
+
+import elf_utils
+import symbol_index
+import process_memory
+import workload_analysis
+import analysis_cache
+import decode_cache
+import phase_tracer
+
+METHODS = ('full_scan', 'exepath', 'bytecode_only', 'all')
+
+
+def attach(pid, mode):
+    if mode == 'ptrace':
+        return process_memory.attach_process(pid)
+    return process_memory.stop_process(pid)
+
+
+def analyze(pid, method, language, script_path, workers=1, deadline=None):
+    cache = analysis_cache.get_cache()
+    with phase_tracer.span('attach'):
+        exe = os.readlink(f'/proc/{pid}/exe')
+        maps = elf_utils.read_proc_maps(pid)
+        symbols = symbol_index.SymbolIndex(maps=maps)
+        memory = process_memory.ProcMemory(pid)
+
+    try:
+        if method == 'full_scan':
+            aggregator, unique_count = workload_analysis.text_segment_full_scan(
+                memory, maps, symbols, exe, cache, workers)
+            aggregator.write()
+            print(f'unique encodings: {unique_count}, ISA set count: {len(aggregator)}')
+            return
+
+        if method == 'all':
+            results, timings, module_count = workload_analysis.combined_analysis(
+                memory, maps, symbols, exe, language, script_path, process_memory.glibc_rtm_enabled(pid),
+                cache, workers, deadline)
+            for name, (aggregator, is_tsx_run, xtest_enable) in results.items():
+                aggregator.write(is_tsx_run, xtest_enable, name)
+                print(f'{name} ISA set count: {len(aggregator)}')
+            for name, elapsed in timings.items():
+                print(f'{name} time: {elapsed:.6f} sec')
+            print(f'Number of modules searched: {module_count}')
+            return
+
+        tracker, module_count = workload_analysis.execution_path_tracking(
+            memory, symbols, exe, language, script_path, process_memory.glibc_rtm_enabled(pid),
+            cache, deadline, main_root=method == 'exepath')
+        aggregator = tracker.aggregate()
+        aggregator.write(tracker.is_tsx_run, tracker.xtest_enable)
+        print(f'ISA set count: {len(aggregator)}')
+        print(tracker.coverage_summary())
+        print(f'tracked function count: {len(tracker.tracking_functions)}')
+        print(f'Number of modules searched: {module_count}')
+    finally:
+        memory.close()
+
+
+if __name__ == '__main__':
+    start_time = float(os.getenv('START_TIME', '0'))
+    cli_time = time.time()
+
+    # 쉘 스크립트에서 전달된 workload PID 가져오기
+    PID = int(os.getenv('WORKLOAD_PID', '0'))
+    METHOD = os.getenv('ANALYSIS_METHOD', 'exepath')
+    LANGUAGE_TYPE = os.getenv('LANGUAGE_TYPE', 'c')
+    SCRIPT_PATH = os.getenv('SCRIPT_PATH')
+    ATTACH_MODE = os.getenv('ATTACH_MODE', 'ptrace')
+    WORKERS = int(os.getenv('FULL_SCAN_WORKERS', '1'))
+    DEADLINE = float(os.getenv('EPT_DEADLINE', '0'))
+    deadline = (start_time or cli_time) + DEADLINE if DEADLINE > 0 else None
+
+    if METHOD not in METHODS:
+        raise SystemExit(f'unknown analysis method: {METHOD} (expected one of {", ".join(METHODS)})')
+
+    attach_start = time.time()
+    with attach(PID, ATTACH_MODE):
+        attach_time = time.time() - attach_start
+        analyze(PID, METHOD, LANGUAGE_TYPE, SCRIPT_PATH, WORKERS, deadline)
+
+    end_time = time.time()
+    tracer = phase_tracer.get_tracer()
+    print(f"startup time: {cli_time - (start_time or cli_time):.6f} sec")
+    print(f"attach time: {attach_time + tracer.time('attach'):.6f} sec")
+    print(f"total time: {end_time - (start_time or cli_time):.6f} sec")
+
+    for cache_summary in (analysis_cache.close_cache(), decode_cache.close_cache()):
+        if cache_summary:
+            print(cache_summary)
+    print(phase_tracer.finish())
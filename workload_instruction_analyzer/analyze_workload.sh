@@ -0,0 +1,42 @@
+#!/bin/bash
+
+# Usage: ./analyze_workload.sh PID METHOD [LANGUAGE] [SCRIPT_PATH]
+#   METHOD: full_scan | exepath | bytecode_only | all (한 번의 attach로 모든 결과를 log/isa_set.<method>.csv 에 기록)
+if [ -z "$1" ]; then
+    echo "Warning: A PID must be provided as a parameter."
+    exit 1
+fi
+
+if [ -z "$2" ]; then
+    echo "Warning: An analysis method (full_scan, exepath, bytecode_only, all) must be provided as a parameter."
+    exit 1
+fi
+
+if [ "$3" == "python" ] && [ -z "$4" ]; then
+    echo "Warning: A script path must be provided as a parameter for python."
+    exit 1
+fi
+
+export WORKLOAD_PID=$1
+export ANALYSIS_METHOD=$2
+export LANGUAGE_TYPE=${3:-c}
+if [ ! -z "$4" ]; then
+    export SCRIPT_PATH=$4
+fi
+
+# xedlib
+export LD_LIBRARY_PATH=/home/ubuntu/xed/obj:$LD_LIBRARY_PATH
+
+# Bytecode Tracking
+export PYTHONPATH=$PYTHONPATH:/home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/bytecode_tracking
+# stdlib_list
+export PYTHONPATH=$PYTHONPATH:/home/ubuntu/.local/lib/python3.10/site-packages/
+# entry path
+if [ ! -z "$4" ]; then
+    export PYTHONPATH=$PYTHONPATH:$(dirname "$4")
+fi
+
+export START_TIME=$(date +%s.%N)
+
+# Run without GDB
+python3 /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/analyze_workload.py
@@ -1,26 +1,30 @@
-import re
+from inspect import iscode
 
-pattern = re.compile(r'\((.*?)\)')
+from bcode_utils import opcodes
+
+LOAD_CONST = opcodes('LOAD_CONST')
+LOAD_ATTR = opcodes('LOAD_ATTR')
+LOAD_METHOD = opcodes('LOAD_METHOD')
+LOAD_BUILD_CLASS = opcodes('LOAD_BUILD_CLASS')
+LOAD_ASSERTION_ERROR = opcodes('LOAD_ASSERTION_ERROR')
+STORE_NAME = opcodes('STORE_NAME')
+CALL_FUNCTION = opcodes('CALL_FUNCTION')
+CALL_FUNCTION_ALL = opcodes('CALL_FUNCTION', 'CALL_FUNCTION_KW', 'CALL_FUNCTION_EX')
+CALL_METHOD = opcodes('CALL_METHOD')
 
 
 def import_name(idx, shared_variables):
     byte_code = shared_variables.byte_code
     keys_list = shared_variables.keys_list
 
-    line = byte_code[keys_list[idx]]
-
-    try:
-        module = pattern.search(line).group(1)
+    module = byte_code[keys_list[idx]].text
 
-        # 스택에서 임포트 레벨과 fromlist를 팝
-        shared_variables.LOAD.pop(0)
-        shared_variables.LOAD.pop(0)
-        shared_variables.LOAD.insert(0, module)
-    except AttributeError:
+    # from . import module 과 같이 상대경로에서 import 하는 경우 모듈 이름이 비어 있음
+    if module is None:
         prev_line = byte_code[keys_list[idx - 1]]
 
-        # 상대경로에서 가져오는 모듈 추출
-        module = re.findall(r"\'([^\']+)\'", prev_line)
+        # 상대경로에서 가져오는 모듈 추출 (fromlist)
+        module = list(prev_line.argval) if isinstance(prev_line.argval, tuple) else []
         shared_variables.from_list.clear()
         shared_variables.from_list.extend(module)
 
@@ -30,10 +34,15 @@ def import_name(idx, shared_variables):
 
         return None, None
 
+    # 스택에서 임포트 레벨과 fromlist를 팝
+    shared_variables.LOAD.pop(0)
+    shared_variables.LOAD.pop(0)
+    shared_variables.LOAD.insert(0, module)
+
     # 다음 라인을 확인해 import된 모듈이 어떤 이름으로 사용되는지 파악
     next_line = byte_code[keys_list[idx + 1]]
-    if 'STORE_NAME' in next_line:
-        alias = (pattern.search(next_line).group(1))
+    if next_line.opcode in STORE_NAME:
+        alias = next_line.text
 
         if '.' in module:
             return module, module
@@ -41,14 +50,13 @@ def import_name(idx, shared_variables):
         return module, alias
 
     prev_line = byte_code[keys_list[idx - 1]]
-    if 'LOAD_CONST' in prev_line:
-        args = pattern.search(prev_line).group(1)
-        if args == 'None':
+    if prev_line.opcode in LOAD_CONST:
+        if prev_line.text == 'None':
             i = 1
             while True:
                 next_line = byte_code[keys_list[idx + i]]
-                if 'STORE_NAME' in next_line:
-                    alias = (pattern.search(next_line).group(1))
+                if next_line.opcode in STORE_NAME:
+                    alias = next_line.text
                     shared_variables.from_pass = module.count('.')
                     return module, alias
                 i += 1
@@ -60,15 +68,13 @@ def import_name(idx, shared_variables):
 def import_from(idx, shared_variables):
     byte_code = shared_variables.byte_code
     keys_list = shared_variables.keys_list
-    line = byte_code[keys_list[idx]]
-
-    func = (pattern.search(line).group(1))
+    func = byte_code[keys_list[idx]].text
     shared_variables.LOAD.insert(0, func)
 
     # 다음 라인을 확인해 import된 모듈이 어떤 이름으로 사용되는지 파악
     next_line = byte_code[keys_list[idx + 1]]
-    if 'STORE_NAME' in next_line:
-        alias = (pattern.search(next_line).group(1))
+    if next_line.opcode in STORE_NAME:
+        alias = next_line.text
 
         if shared_variables.from_list:
             module = func
@@ -82,11 +88,10 @@ def import_from(idx, shared_variables):
     return func, None
 
 
-def raise_varargs(content, shared_variables):
+def raise_varargs(instruction, shared_variables):
     LOAD = shared_variables.LOAD
-    operation_option = int(content.split('RAISE_VARARGS')[1].strip())
 
-    for _ in range(operation_option):
+    for _ in range(instruction.arg):
         LOAD.pop(0)
 
 
@@ -101,38 +106,35 @@ def load_build_class(shared_variables):
     shared_variables.LOAD.insert(0, '__build_class__')
 
 
-def load_attr(content, shared_variables):
-    value = shared_variables.LOAD.pop(
-        0) + '.' + pattern.search(content).group(1)
+def load_attr(instruction, shared_variables):
+    # 스택의 최상단에 있는 객체로부터 속성을 로드하고, 이 속성 값을 스택의 최상단에 푸시
+    # self 객체 자체가 스택에서 제거되고 self의 value 속성 값만 스택에 남음
+    # LOAD_METHOD는 스택의 최상단에 있는 객체에서 메서드를 찾음
+    value = shared_variables.LOAD.pop(0) + '.' + instruction.text
     shared_variables.LOAD.insert(0, value)
 
 
-def load_etc(content, shared_variables):
-    shared_variables.LOAD.insert(0, pattern.search(content).group(1))
+def load_etc(instruction, shared_variables):
+    shared_variables.LOAD.insert(0, instruction.text)
 
 
-def load(content, shared_variables):
-    LOAD = shared_variables.LOAD
+def load_assertion_error(instruction, shared_variables):
+    shared_variables.LOAD.insert(0, 'AssertionError')
+
 
+LOAD_HANDLERS = {
     # 클래스 정의
-    if 'LOAD_BUILD_CLASS' in content:
-        LOAD.insert(0, '__build_class__')
-    # 스택의 최상단에 있는 객체로부터 속성을 로드하고, 이 속성 값을 스택의 최상단에 푸시
-    # self 객체 자체가 스택에서 제거되고 self의 value 속성 값만 스택에 남음
-    elif 'LOAD_ATTR' in content:
-        value = LOAD.pop(0) + '.' + pattern.search(content).group(1)
-        LOAD.insert(0, value)
-    # LOAD_METHOD는 스택의 최상단에 있는 객체에서 메서드를 찾음
-    elif 'LOAD_METHOD' in content:
-        value = LOAD.pop(0) + '.' + pattern.search(content).group(1)
-        LOAD.insert(0, value)
-    elif 'LOAD_ASSERTION_ERROR' in content:
-        LOAD.insert(0, 'AssertionError')
-    else:
-        LOAD.insert(0, pattern.search(content).group(1))
+    **dict.fromkeys(LOAD_BUILD_CLASS, lambda instruction, shared_variables: load_build_class(shared_variables)),
+    **dict.fromkeys(LOAD_ATTR | LOAD_METHOD, load_attr),
+    **dict.fromkeys(LOAD_ASSERTION_ERROR, load_assertion_error),
+}
 
 
-def make_function(idx, content, shared_variables):
+def load(instruction, shared_variables):
+    LOAD_HANDLERS.get(instruction.opcode, load_etc)(instruction, shared_variables)
+
+
+def make_function(idx, instruction, shared_variables):
     def pop(options, LOAD):
         # 시작 팝 횟수: 코드 객체 + 함수 이름 = 2
         pop_count = 2
@@ -163,24 +165,20 @@ def make_function(idx, content, shared_variables):
     LOAD = shared_variables.LOAD
     addr_map = shared_variables.addr_map
 
-    operation_option = int(content.split(
-        'MAKE_FUNCTION')[1].strip().split()[0])
     maked_func = LOAD[0].strip("'")
-    pop(operation_option, LOAD)
+    pop(instruction.arg, LOAD)
 
     offset = 0
     prev_line = byte_code[keys_list[idx - 1]]
     # 생성되는 함수가 특정 클래스에 종속적인 경우
-    if 'LOAD_CONST' in prev_line:
-        if '.' in (pattern.search(prev_line).group(1)):
-            parents_object = pattern.search(prev_line).group(
-                1).split('.')[0].replace("'", "")
-            child_object = pattern.search(prev_line).group(
-                1).split('.')[-1].replace("'", "")
+    if prev_line.opcode in LOAD_CONST:
+        if '.' in prev_line.text:
+            parents_object = prev_line.text.split('.')[0].replace("'", "")
+            child_object = prev_line.text.split('.')[-1].replace("'", "")
             while True:
                 # 클래스에서 정의되는 메서드가 구현될 주소 파악
-                if '(<code object' in prev_line:
-                    obj_addr = prev_line.split('at ')[1].split(',')[0].strip()
+                if iscode(prev_line.argval):
+                    obj_addr = repr(prev_line.argval).split('at ')[1].split(',')[0].strip()
                     addr_map[obj_addr] = {parents_object: child_object}
                     break
                 offset -= 1
@@ -190,58 +188,74 @@ def make_function(idx, content, shared_variables):
 
     if hasattr(shared_variables, 'decorator_map'):
         next_line = byte_code[keys_list[idx + 1]]
-        if 'CALL_FUNCTION' in next_line:
-            func_offset = int(next_line.split('CALL_FUNCTION')[1].strip())
+        if next_line.opcode in CALL_FUNCTION:
+            func_offset = next_line.arg
             shared_variables.decorator_map[maked_func] = LOAD[func_offset]
             shared_variables.decorators.add(LOAD[func_offset])
 
 
-def build(content, shared_variables):
-    LOAD = shared_variables.LOAD
+def build_string(args_count, LOAD):
+    merge_str = ''
+    for _ in range(args_count):
+        merge_str += LOAD.pop(0)
+    LOAD.insert(0, merge_str)
 
-    if 'BUILD_STRING' in content:
-        args_count = int(content.split('BUILD_STRING')[1].strip())
-        merge_str = ''
+
+def build_list(args_count, LOAD):
+    merge_list = ''
+    if args_count == 0:
+        LOAD.insert(0, '[]')
+    else:
         for _ in range(args_count):
-            merge_str += LOAD.pop(0)
-        LOAD.insert(0, merge_str)
-    elif 'BUILD_LIST' in content:
-        args_count = int(content.split('BUILD_LIST')[1].strip())
-        merge_list = ''
-        if args_count == 0:
-            LOAD.insert(0, '[]')
-        else:
-            for _ in range(args_count):
-                merge_list += LOAD.pop(0)
-            LOAD.insert(0, '[' + merge_list + ']')
-    elif 'BUILD_MAP' in content:
-        args_count = int(content.split('BUILD_MAP')[1].strip())
-        merge_list = ''
-        if args_count == 0:
-            LOAD.insert(0, '\{\}')
-        else:
-            for _ in range(args_count * 2):
-                merge_list += LOAD.pop(0)
-            LOAD.insert(0, '{' + merge_list + '}')
-    elif 'BUILD_TUPLE' in content:
-        args_count = int(content.split('BUILD_TUPLE')[1].strip())
-        merge_list = ''
-        if args_count == 0:
-            LOAD.insert(0, '()')
-        else:
-            for _ in range(args_count):
-                merge_list += LOAD.pop(0)
-            LOAD.insert(0, '(' + merge_list + ')')
-    elif 'BUILD_CONST_KEY_MAP' in content:
-        args_count = int(content.split('BUILD_CONST_KEY_MAP')[1].strip())
-        merge_list = ''
-        if args_count == 0:
-            LOAD.insert(0, '()')
-        else:
-            # 키 튜플을 포함해 pop
-            for _ in range(args_count + 1):
-                merge_list += LOAD.pop(0)
-            LOAD.insert(0, 'KEY_MAP')
+            merge_list += LOAD.pop(0)
+        LOAD.insert(0, '[' + merge_list + ']')
+
+
+def build_map(args_count, LOAD):
+    merge_list = ''
+    if args_count == 0:
+        LOAD.insert(0, '\{\}')
+    else:
+        for _ in range(args_count * 2):
+            merge_list += LOAD.pop(0)
+        LOAD.insert(0, '{' + merge_list + '}')
+
+
+def build_tuple(args_count, LOAD):
+    merge_list = ''
+    if args_count == 0:
+        LOAD.insert(0, '()')
+    else:
+        for _ in range(args_count):
+            merge_list += LOAD.pop(0)
+        LOAD.insert(0, '(' + merge_list + ')')
+
+
+def build_const_key_map(args_count, LOAD):
+    merge_list = ''
+    if args_count == 0:
+        LOAD.insert(0, '()')
+    else:
+        # 키 튜플을 포함해 pop
+        for _ in range(args_count + 1):
+            merge_list += LOAD.pop(0)
+        LOAD.insert(0, 'KEY_MAP')
+
+
+# BUILD_SET, BUILD_SLICE 등 나머지 BUILD_* 는 스택을 변경하지 않음
+BUILD_HANDLERS = {
+    **dict.fromkeys(opcodes('BUILD_STRING'), build_string),
+    **dict.fromkeys(opcodes('BUILD_LIST'), build_list),
+    **dict.fromkeys(opcodes('BUILD_MAP'), build_map),
+    **dict.fromkeys(opcodes('BUILD_TUPLE'), build_tuple),
+    **dict.fromkeys(opcodes('BUILD_CONST_KEY_MAP'), build_const_key_map),
+}
+
+
+def build(instruction, shared_variables):
+    handler = BUILD_HANDLERS.get(instruction.opcode)
+    if handler is not None:
+        handler(instruction.arg, shared_variables.LOAD)
 
 
 def store_attr(idx, shared_variables):
@@ -257,7 +271,7 @@ def store_attr(idx, shared_variables):
     prev_line = byte_code[keys_list[idx - 1]]
     with_call = False
     while True:
-        if 'CALL_FUNCTION' in prev_line or 'CALL_METHOD' in prev_line:
+        if prev_line.opcode in CALL_FUNCTION_ALL | CALL_METHOD:
             with_call = True
             break
         offset -= 1
@@ -266,8 +280,7 @@ def store_attr(idx, shared_variables):
         prev_line = byte_code[keys_list[idx + offset]]
 
     if with_call:
-        result = (pattern.search(line).group(1))
-        return result
+        return line.text
     return None
 
 
@@ -301,10 +314,10 @@ def call_function_stack(func_offset, shared_variables):
     LOAD.insert(0, call_result)
 
 
-def call_method(content, shared_variables):
+def call_method(instruction, shared_variables):
     LOAD = shared_variables.LOAD
 
-    method_offset = int(content.split('CALL_METHOD')[1].strip())
+    method_offset = instruction.arg
     called_method = LOAD[method_offset]
 
     call_result = ''
@@ -320,10 +333,9 @@ def call_method(content, shared_variables):
     return called_method
 
 
-def list_extend(content, shared_variables):
+def list_extend(instruction, shared_variables):
     # 스택의 상단부터 취합해 N 번째에 있는 리스트를 확장하지만 확장된 리스트 정보는 필요하지 않으므로 pop만 수행함.
-    args_count = int(content.split('LIST_EXTEND')[1].strip())
-    for i in range(args_count):
+    for i in range(instruction.arg):
         shared_variables.LOAD.pop(0)
 
 
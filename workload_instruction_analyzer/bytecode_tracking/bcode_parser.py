@@ -1,10 +1,23 @@
 import bcode_instructions
-import importlib
-import sys
+import module_resolver
 
 import re
 
-pattern = re.compile(r'\((.*?)\)')
+from bcode_utils import opcodes
+
+IMPORT_NAME = opcodes('IMPORT_NAME')
+IMPORT_FROM = opcodes('IMPORT_FROM')
+IMPORT_STAR = opcodes('IMPORT_STAR')
+POP_JUMP_IF_FALSE = opcodes('POP_JUMP_IF_FALSE')
+JUMP_IF_FALSE_OR_POP = opcodes('JUMP_IF_FALSE_OR_POP')
+JUMP_FORWARD = opcodes('JUMP_FORWARD')
+MAKE_FUNCTION = opcodes('MAKE_FUNCTION')
+STORE_ATTR = opcodes('STORE_ATTR')
+STORE_VARIABLE = opcodes('STORE_NAME', 'STORE_FAST')
+CALL_FUNCTION = opcodes('CALL_FUNCTION', 'CALL_FUNCTION_KW', 'CALL_FUNCTION_EX')
+# keyword, args 까지 스택에 푸시되므로 해당 키워드를 건너뛰고 호출하는 함수가 있는 offset
+CALL_FUNCTION_KW = opcodes('CALL_FUNCTION_KW', 'CALL_FUNCTION_EX')
+CALL_METHOD = opcodes('CALL_METHOD')
 
 
 def module_classification(__module, __from):
@@ -20,7 +33,7 @@ def module_classification(__module, __from):
             •	설치된 패키지의 경로로, 일반적으로 site-packages 디렉토리에 위치. 예를 들어, Unix 시스템에서는 /usr/local/lib/python3.x/site-packages와 같은 경로.
     '''
 
-    # 아래 순서로 import를 시도하여 모듈을 구분함.
+    # 아래 순서로 모듈을 찾아 구분함.
     # ex) __from : numpy.ma.extras, __module : core
     # 1. numpy.ma.extras.core - numpy.ma.extras가 numpy.ma의 서브 패키지인 경우
     # 2. numpy.ma.core - numpy.ma.extras가 numpy.ma의 모듈인 경우
@@ -34,28 +47,15 @@ def module_classification(__module, __from):
     case4 = '.'.join(__from.split('.')[:-3]) + '.' + __module
     case5 = __module
 
+    # 모듈 코드를 실행하지 않도록 import 하지 않고 spec만 찾음 (module_resolver)
     modules = [case1, case2, case3, case4, case5]
     for module in modules:
-        # 모듈이 이미 로드된 경우를 처리
-        if module in sys.modules:
-            return module
-
         # main, xgboost와 같은 최상위 패키지에서 import하는 경우 .numpy와 같이 잘못 생성된 import path를 건너뜀
         if module.startswith('.'):
             continue
 
-        try:
-            importlib.import_module(module)
+        if module_resolver.is_module(module):
             return module
-        except ModuleNotFoundError:
-            pass
-        # 특정 OS에 최적화된 모듈을 import 하려는 경우 발생
-        except ImportError as e:
-            return e
-        except AttributeError as e:
-            return e
-        except AssertionError as e:
-            return e
 
 
 def func_classification(func, called_objs, obj_sets, obj_map):
@@ -101,12 +101,12 @@ def lazy_loading(byte_code, idx, keys_list, called_objs, cap_stack):
 
     if module not in called_objs.keys():
         next_line = byte_code[keys_list[idx + 1]]
-        store = (pattern.search(next_line).group(1)).replace("'", '')
+        store = next_line.text.replace("'", '')
         called_objs[store] = {'__called': set(), '__origin_name': module}
 
 
-def parse_import_instructions(content, called_objs, shared_variables, i):
-    if 'IMPORT_NAME' in content:
+def parse_import_instructions(instruction, called_objs, shared_variables, i):
+    if instruction.opcode in IMPORT_NAME:
         module, shared_variables.alias = bcode_instructions.import_name(
             i, shared_variables)
 
@@ -119,18 +119,9 @@ def parse_import_instructions(content, called_objs, shared_variables, i):
         if module_path == None:
             return False
 
-        if isinstance(module_path, ModuleNotFoundError):
-            module_path = module
-        elif isinstance(module_path, AttributeError):
-            return True
-        elif isinstance(module_path, ImportError):
-            return True
-        elif isinstance(module_path, AssertionError):
-            return True
-
         called_objs[shared_variables.alias] = {
             '__origin_name': module_path, '__called': set(), '__from': shared_variables.current_module}
-    elif 'IMPORT_FROM' in content:
+    elif instruction.opcode in IMPORT_FROM:
         # IMPORT_FROM 으로 모듈을 로드하는 경우에 대한 처리
         if shared_variables.from_list:
             shared_variables.from_list.pop(0)
@@ -142,15 +133,6 @@ def parse_import_instructions(content, called_objs, shared_variables, i):
             if module_path == None:
                 return False
 
-            if isinstance(module_path, ModuleNotFoundError):
-                module_path = module
-            elif isinstance(module_path, AttributeError):
-                return True
-            elif isinstance(module_path, ImportError):
-                return True
-            elif isinstance(module_path, AssertionError):
-                return True
-
             called_objs[shared_variables.alias] = {
                 '__origin_name': module_path, '__called': set(), '__from': shared_variables.current_module}
             return True
@@ -179,14 +161,14 @@ def parse_import_instructions(content, called_objs, shared_variables, i):
         called_objs[shared_variables.alias]['__func_alias'][from_alias] = from_func
 
         return True
-    elif 'IMPORT_STAR' in content:
+    elif instruction.opcode in IMPORT_STAR:
         bcode_instructions.pop(shared_variables)
         return True
 
     return False
 
 
-def parse_branch_instructions(content, offset, branch_shared_variables, shared_variables, verification):
+def parse_branch_instructions(instruction, offset, branch_shared_variables, shared_variables, verification):
     # 아래와 같은 경우 조건이 else라면 분기 전 스택을 기준으로 동작함.
     # 즉, 조건이 참인 경우에 변화할 스택 상태로 else를 처리하면 에러가 발생하므로 분기문에 대한 처리가 필요함.
     '''
@@ -281,95 +263,96 @@ def parse_branch_instructions(content, offset, branch_shared_variables, shared_v
         branch_shared_variables.stack_cap.pop(-1)
         return False
 
-    if 'POP_JUMP_IF_FALSE' in content:
+    # 점프 명령의 argval은 점프 대상 offset
+    if instruction.opcode in POP_JUMP_IF_FALSE:
         bcode_instructions.pop(shared_variables)
 
         branch_shared_variables.stack_cap.append(shared_variables.LOAD.copy())
-        branch_shared_variables.branch_targets.add(
-            int((pattern.search(content).group(1)).split()[1]))
+        branch_shared_variables.branch_targets.add(instruction.argval)
 
         return True
-    elif 'JUMP_IF_FALSE_OR_POP' in content:
+    elif instruction.opcode in JUMP_IF_FALSE_OR_POP:
         branch_shared_variables.stack_cap.append(shared_variables.LOAD.copy())
-        branch_shared_variables.branch_targets.add(
-            int((pattern.search(content).group(1)).split()[1]))
+        branch_shared_variables.branch_targets.add(instruction.argval)
 
         bcode_instructions.pop(shared_variables)
 
-    if 'JUMP_FORWARD' in content:
-        branch_shared_variables.jp_offset.add(
-            int((pattern.search(content).group(1)).split()[1]))
+    if instruction.opcode in JUMP_FORWARD:
+        branch_shared_variables.jp_offset.add(instruction.argval)
         return True
 
 
-def parse_shared_instructions(content, shared_variables):
-    binary_operations = {'BINARY_POWER', 'BINARY_MULTIPLY', 'BINARY_MATRIX_MULTIPLY', 'BINARY_FLOOR_DIVIDE',
-                         'BINARY_TRUE_DIVIDE', 'BINARY_MODULO', 'BINARY_ADD', 'BINARY_SUBTRACT', 'BINARY_SUBSCR',
-                         'BINARY_LSHIFT', 'BINARY_RSHIFT', 'BINARY_AND', 'BINARY_XOR', 'BINARY_OR'}
+def pop_top(instruction, shared_variables):
+    bcode_instructions.pop(shared_variables)
 
-    inplace_operations = {'INPLACE_ADD', 'INPLACE_SUBTRACT', 'INPLACE_MULTIPLY',
-                          'INPLACE_DIVIDE', 'INPLACE_FLOOR_DIVIDE', 'INPLACE_TRUE_DIVIDE',
-                          'INPLACE_MODULO', 'INPLACE_POWER', 'INPLACE_LSHIFT',
-                          'INPLACE_RSHIFT', 'INPLACE_AND', 'INPLACE_XOR', 'INPLACE_OR'}
 
-    instruction = content.split()[0]
-    if 'LOAD' in instruction:
-        bcode_instructions.load(content, shared_variables)
-    elif 'STORE_NAME' in instruction or 'STORE_FAST' in instruction:
-        bcode_instructions.pop(shared_variables)
-    # 객체의 특정 인덱스나 키에 값을 할당 ex) sys.modules['importlib._bootstrap'] = _bootstrap
-    elif 'STORE_SUBSCR' in instruction:
-        [bcode_instructions.pop(shared_variables) for _ in range(3)]
+def pop_two(instruction, shared_variables):
+    [bcode_instructions.pop(shared_variables) for _ in range(2)]
 
-    # stack controll
-    elif 'POP_TOP' in instruction:
-        bcode_instructions.pop(shared_variables)
-    elif 'DUP_TOP' in instruction:
-        try:
-            bcode_instructions.dup(shared_variables)
-        # except 문에서는 아래와 같이 DUP_TOP을 통해 스택 최상단의 예외 객체를 복사.
-        # 예외 객체는 런타임에 스택에 삽입되므로 정적 분석에서는 스택이 비어있는 상태.
-        # 따라서 비어있는 스택을 참조하려 하기 때문에 IndexError 가 발생함
-        # 371 except ValueError:
-        # 371     >>   58 DUP_TOP
-        #              60 LOAD_GLOBAL              4 (ValueError)
-        #              62 JUMP_IF_NOT_EXC_MATCH    38 (to 76)
-        #              64 POP_TOP
-        #              66 POP_TOP
-        #              68 POP_TOP
-        except IndexError:
-            pass
-    elif 'RETURN_VALUE' in instruction:
-        try:
-            bcode_instructions.pop(shared_variables)
-        except IndexError:
-            return
 
-    # 예외를 발생시키는 명령어
-    elif 'RAISE_VARARGS' in instruction:
-        bcode_instructions.raise_varargs(content, shared_variables)
-    elif 'RERAISE' in instruction:
-        bcode_instructions.reraise(shared_variables)
+def pop_three(instruction, shared_variables):
+    [bcode_instructions.pop(shared_variables) for _ in range(3)]
+
+
+def dup_top(instruction, shared_variables):
+    try:
+        bcode_instructions.dup(shared_variables)
+    # except 문에서는 아래와 같이 DUP_TOP을 통해 스택 최상단의 예외 객체를 복사.
+    # 예외 객체는 런타임에 스택에 삽입되므로 정적 분석에서는 스택이 비어있는 상태.
+    # 따라서 비어있는 스택을 참조하려 하기 때문에 IndexError 가 발생함
+    # 371 except ValueError:
+    # 371     >>   58 DUP_TOP
+    #              60 LOAD_GLOBAL              4 (ValueError)
+    #              62 JUMP_IF_NOT_EXC_MATCH    38 (to 76)
+    #              64 POP_TOP
+    #              66 POP_TOP
+    #              68 POP_TOP
+    except IndexError:
+        pass
+
+
+def pop2_push1(instruction, shared_variables):
+    bcode_instructions.pop2_push1(shared_variables)
+
 
+def reraise(instruction, shared_variables):
+    bcode_instructions.reraise(shared_variables)
+
+
+# 호출, import, 분기 외의 명령어가 스택에 주는 영향 (opcode -> 처리 함수)
+SHARED_HANDLERS = {
+    **dict.fromkeys(opcodes('LOAD_BUILD_CLASS', 'LOAD_ASSERTION_ERROR', 'LOAD_CONST', 'LOAD_NAME', 'LOAD_ATTR',
+                            'LOAD_GLOBAL', 'LOAD_FAST', 'LOAD_CLOSURE', 'LOAD_DEREF', 'LOAD_CLASSDEREF',
+                            'LOAD_METHOD'), bcode_instructions.load),
+    **dict.fromkeys(opcodes('STORE_NAME', 'STORE_FAST', 'POP_TOP', 'RETURN_VALUE'), pop_top),
+    # 객체의 특정 인덱스나 키에 값을 할당 ex) sys.modules['importlib._bootstrap'] = _bootstrap
+    **dict.fromkeys(opcodes('STORE_SUBSCR'), pop_three),
+    **dict.fromkeys(opcodes('DELETE_SUBSCR'), pop_two),
+    # stack controll
+    **dict.fromkeys(opcodes('DUP_TOP', 'DUP_TOP_TWO'), dup_top),
+    # 예외를 발생시키는 명령어
+    **dict.fromkeys(opcodes('RAISE_VARARGS'), bcode_instructions.raise_varargs),
+    **dict.fromkeys(opcodes('RERAISE'), reraise),
     # 스택에 있는 N 개의 값을 합쳐 새로운 문자열을 만듦
-    elif 'BUILD' in instruction:
-        bcode_instructions.build(content, shared_variables)
+    **dict.fromkeys(opcodes('BUILD_TUPLE', 'BUILD_LIST', 'BUILD_SET', 'BUILD_MAP', 'BUILD_SLICE',
+                            'BUILD_CONST_KEY_MAP', 'BUILD_STRING'), bcode_instructions.build),
     # 스택의 최상단에서 N번째 리스트를 확장
-    elif 'LIST_EXTEND' in instruction:
-        bcode_instructions.list_extend(content, shared_variables)
-    # 두 값을 pop해 비교 후 true or flase를 푸시
-    elif 'COMPARE_OP' in instruction or 'IS_OP' in instruction:
-        bcode_instructions.pop2_push1(shared_variables)
+    **dict.fromkeys(opcodes('LIST_EXTEND'), bcode_instructions.list_extend),
+    # 두 값을 pop해 비교 또는 연산 후 결과를 푸시
+    **dict.fromkeys(opcodes('COMPARE_OP', 'IS_OP',
+                            'BINARY_POWER', 'BINARY_MULTIPLY', 'BINARY_MATRIX_MULTIPLY', 'BINARY_FLOOR_DIVIDE',
+                            'BINARY_TRUE_DIVIDE', 'BINARY_MODULO', 'BINARY_ADD', 'BINARY_SUBTRACT', 'BINARY_SUBSCR',
+                            'BINARY_LSHIFT', 'BINARY_RSHIFT', 'BINARY_AND', 'BINARY_XOR', 'BINARY_OR',
+                            'INPLACE_ADD', 'INPLACE_SUBTRACT', 'INPLACE_MULTIPLY', 'INPLACE_FLOOR_DIVIDE',
+                            'INPLACE_TRUE_DIVIDE', 'INPLACE_MODULO', 'INPLACE_POWER', 'INPLACE_LSHIFT',
+                            'INPLACE_RSHIFT', 'INPLACE_AND', 'INPLACE_XOR', 'INPLACE_OR'), pop2_push1),
+}
 
-    elif instruction in inplace_operations:
-        bcode_instructions.pop2_push1(shared_variables)
-    elif 'STORE_SUBSCR' in instruction:
-        [bcode_instructions.pop(shared_variables) for _ in range(3)]
-    elif 'DELETE_SUBSCR' in instruction:
-        [bcode_instructions.pop(shared_variables) for _ in range(2)]
 
-    elif instruction in binary_operations:
-        bcode_instructions.pop2_push1(shared_variables)
+def parse_shared_instructions(instruction, shared_variables):
+    handler = SHARED_HANDLERS.get(instruction.opcode)
+    if handler is not None:
+        handler(instruction, shared_variables)
 
 
 def parse_def(byte_code, addr_map, obj_map, def_bcode_block_start_offsets, module):
@@ -406,11 +389,11 @@ def parse_def(byte_code, addr_map, obj_map, def_bcode_block_start_offsets, modul
     shared_variables = SHARED_VARIABLES()
     branch_shared_variables = BRANCH_SHARED_VARIABLES()
 
-    for i, (offset, content) in enumerate(byte_code.items()):
+    for i, (offset, instruction) in enumerate(byte_code.items()):
         if offset == '__name' or offset == '__addr':
             continue
 
-        if parse_branch_instructions(content, offset, branch_shared_variables, shared_variables, verification):
+        if parse_branch_instructions(instruction, offset, branch_shared_variables, shared_variables, verification):
             continue
 
         # 해석하지 않을 바이트코드 명령 (사용자 코드가 아닌 내부 처리 코드)
@@ -419,16 +402,16 @@ def parse_def(byte_code, addr_map, obj_map, def_bcode_block_start_offsets, modul
 
         # FIXME: 파라미터로 전달하는 called_objs는 set이 아니고 dict여야함.
         # 해결하지 않으면 함수 내에서 모듈을 import 하는 것을 처리할 수 없음
-        # if parse_import_instructions(content, called_objs, shared_variables, i):
+        # if parse_import_instructions(instruction, called_objs, shared_variables, i):
             # continue
 
-        if 'IMPORT_NAME' in content:
+        if instruction.opcode in IMPORT_NAME:
             # ctypes, libimport만 확인
             pass
         # 스택의 상위 두 항목을 사용하여 함수 객체를 만듦.
-        elif 'MAKE_FUNCTION' in content:
-            bcode_instructions.make_function(i - 2, content, shared_variables)
-        elif 'STORE_ATTR' in content:
+        elif instruction.opcode in MAKE_FUNCTION:
+            bcode_instructions.make_function(i - 2, instruction, shared_variables)
+        elif instruction.opcode in STORE_ATTR:
             # 객체의 속성에 할당되는 경우 이름 중복을 구분하기 위해 상위 객체정보를 함께 저장
             obj_addr = byte_code['__addr']
 
@@ -440,17 +423,10 @@ def parse_def(byte_code, addr_map, obj_map, def_bcode_block_start_offsets, modul
                             result] = shared_variables.LOAD[-1].replace('(', '').replace(')', '')
             bcode_instructions.pop(shared_variables)
             bcode_instructions.pop(shared_variables)
-        elif 'CALL_FUNCTION' in content:
-            if 'CALL_FUNCTION_KW' in content:
-                # keyword 까지 스택에 푸시되므로 해당 키워드를 건너뛰고 호출하는 함수가 있는 offset
-                func_offset = int(content.split(
-                    'CALL_FUNCTION_KW')[1].strip()) + 1
-            elif 'CALL_FUNCTION_EX' in content:
-                # args 까지 스택에 푸시되므로 해당 키워드를 건너뛰고 호출하는 함수가 있는 offset
-                func_offset = int(content.split(
-                    'CALL_FUNCTION_EX')[1].strip()) + 1
-            else:
-                func_offset = int(content.split('CALL_FUNCTION')[1].strip())
+        elif instruction.opcode in CALL_FUNCTION:
+            func_offset = instruction.arg
+            if instruction.opcode in CALL_FUNCTION_KW:
+                func_offset += 1
 
             # FIXME: 아래와 같은 경우 스택에는 np.ediff1d로 저장됨 때문에 np.np.ediff1d가 func 결과로 나오는 경우가 있음.
             # LOAD_METHOD의 경우 스택에 [ediff1d, np]로 저장됨. 일관성을 만들어주는게 좋을듯
@@ -473,21 +449,21 @@ def parse_def(byte_code, addr_map, obj_map, def_bcode_block_start_offsets, modul
 
             next_content = byte_code[shared_variables.keys_list[i - 2]]
 
-            if 'STORE_NAME' in next_content or 'STORE_FAST' in next_content:
-                result = (pattern.search(next_content).group(1))
+            if next_content.opcode in STORE_VARIABLE:
+                result = next_content.text
                 obj_map[result] = func
 
             bcode_instructions.call_function_stack(
                 func_offset, shared_variables)
-        elif 'CALL_METHOD' in content:
-            method = bcode_instructions.call_method(content, shared_variables)
+        elif instruction.opcode in CALL_METHOD:
+            method = bcode_instructions.call_method(instruction, shared_variables)
             called_objs.add(method)
             next_content = byte_code[shared_variables.keys_list[i - 2]]
-            if 'STORE_NAME' in next_content or 'STORE_FAST' in next_content:
-                result = (pattern.search(next_content).group(1))
+            if next_content.opcode in STORE_VARIABLE:
+                result = next_content.text
                 obj_map[result] = method
         else:
-            parse_shared_instructions(content, shared_variables)
+            parse_shared_instructions(instruction, shared_variables)
     return called_objs
 
 
@@ -528,40 +504,33 @@ def parse_main(byte_code, addr_map, obj_sets, obj_map, main_bcode_block_start_of
     shared_variables = SHARED_VARIABLES()
     branch_shared_variables = BRANCH_SHARED_VARIABLES()
 
-    for i, (offset, content) in enumerate(byte_code.items()):
+    for i, (offset, instruction) in enumerate(byte_code.items()):
         if offset == '__name' or offset == '__addr':
             continue
 
         if offset < shared_variables.pass_offset:
             continue
 
-        if parse_branch_instructions(content, offset, branch_shared_variables, shared_variables, verification):
+        if parse_branch_instructions(instruction, offset, branch_shared_variables, shared_variables, verification):
             continue
 
-        if parse_import_instructions(content, called_objs, shared_variables, i):
+        if parse_import_instructions(instruction, called_objs, shared_variables, i):
             continue
 
         # 스택의 상위 두 항목을 사용하여 함수 객체를 만듦.
-        elif 'MAKE_FUNCTION' in content:
-            bcode_instructions.make_function(i, content, shared_variables)
-        elif 'STORE_ATTR' in content:
+        elif instruction.opcode in MAKE_FUNCTION:
+            bcode_instructions.make_function(i, instruction, shared_variables)
+        elif instruction.opcode in STORE_ATTR:
             result = bcode_instructions.store_attr(i, shared_variables)
             if result != None:
                 obj_map[result] = shared_variables.LOAD[-1]
 
             bcode_instructions.pop(shared_variables)
             bcode_instructions.pop(shared_variables)
-        elif 'CALL_FUNCTION' in content:
-            if 'CALL_FUNCTION_KW' in content:
-                # keyword 까지 스택에 푸시되므로 해당 키워드를 건너뛰고 호출하는 함수가 있는 offset
-                func_offset = int(content.split(
-                    'CALL_FUNCTION_KW')[1].strip()) + 1
-            elif 'CALL_FUNCTION_EX' in content:
-                # args 까지 스택에 푸시되므로 해당 키워드를 건너뛰고 호출하는 함수가 있는 offset
-                func_offset = int(content.split(
-                    'CALL_FUNCTION_EX')[1].strip()) + 1
-            else:
-                func_offset = int(content.split('CALL_FUNCTION')[1].strip())
+        elif instruction.opcode in CALL_FUNCTION:
+            func_offset = instruction.arg
+            if instruction.opcode in CALL_FUNCTION_KW:
+                func_offset += 1
 
             func = bcode_instructions.call_function(
                 func_offset, shared_variables)
@@ -585,8 +554,8 @@ def parse_main(byte_code, addr_map, obj_sets, obj_map, main_bcode_block_start_of
                 func, called_objs, obj_sets, obj_map)
             # 함수 또는 메서드의 호출 반환이 객체인 경우 정보를 저장
             next_line = byte_code[shared_variables.keys_list[i + 1]]
-            if 'STORE_NAME' in next_line or 'STORE_FAST' in next_line:
-                result = (pattern.search(next_line).group(1))
+            if next_line.opcode in STORE_VARIABLE:
+                result = next_line.text
                 if category not in func and not category.startswith('__'):
                     func = category + '.' + func
                 obj_map[result] = func
@@ -617,9 +586,9 @@ def parse_main(byte_code, addr_map, obj_sets, obj_map, main_bcode_block_start_of
 
             bcode_instructions.call_function_stack(
                 func_offset, shared_variables)
-        elif 'CALL_METHOD' in content:
+        elif instruction.opcode in CALL_METHOD:
             cap_stack = shared_variables.LOAD.copy()
-            method = bcode_instructions.call_method(content, shared_variables)
+            method = bcode_instructions.call_method(instruction, shared_variables)
 
             if method == 'importlib.import_module' or method == 'ctypes.CDLL':
                 lazy_loading(byte_code, i, shared_variables.keys_list,
@@ -627,8 +596,8 @@ def parse_main(byte_code, addr_map, obj_sets, obj_map, main_bcode_block_start_of
 
             # 함수 또는 메서드의 호출 반환이 객체인 경우 정보를 저장
             next_line = byte_code[shared_variables.keys_list[i + 1]]
-            if 'STORE_NAME' in next_line or 'STORE_FAST' in next_line:
-                result = (pattern.search(next_line).group(1))
+            if next_line.opcode in STORE_VARIABLE:
+                result = next_line.text
                 obj_map[result] = method
 
             # 외부 모듈의 객체에서 호출하는 메서드
@@ -658,6 +627,6 @@ def parse_main(byte_code, addr_map, obj_sets, obj_map, main_bcode_block_start_of
                     called_objs[category] = {'__called': set()}
                 called_objs[category]['__called'].add(method.split('.')[-1])
         else:
-            parse_shared_instructions(content, shared_variables)
+            parse_shared_instructions(instruction, shared_variables)
 
     return called_objs, shared_variables.decorator_map
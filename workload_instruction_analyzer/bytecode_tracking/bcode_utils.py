@@ -1,7 +1,6 @@
 import dis
+import importlib.machinery
 import marshal
-import io
-from contextlib import redirect_stdout
 
 
 def read_pyc(path):
@@ -14,35 +13,78 @@ def read_pyc(path):
     return code_obj
 
 
-def preprocessing_bytecode(byte_code):
-    # 라인 번호를 추출하기 위한 함수
-    def parse_bytecode_line(bytecode_line):
-        parts = bytecode_line.strip().split()
-        line_number = 0
-
-        if not parts:
-            return None, None, line_number
-
-        # 141         176 LOAD_CONST               3 (1)
-        if parts[1].isdigit():
-            # >>  142 LOAD_CONST               2 (None)
-            if parts[0] != '>>':
-                line_number = parts[0]
-            offset = parts[1]
-            content = parts[2:]
-        # 126     >>  150 RERAISE                  0
-        elif parts[1] == '>>':
-            line_number = parts[0]
-            offset = parts[2]
-            content = parts[3:]
-        else:
-            offset = parts[0]
-            content = parts[1:]
+def is_source(path):
+    return path.endswith(tuple(importlib.machinery.SOURCE_SUFFIXES))
+
+
+def read_code(path):
+    '''
+    .pyc는 코드 객체를 읽고, .py는 .pyc를 기록하지 않고 메모리에서 컴파일.
+    컴파일할 수 없는 소스(ex. 다른 Python 버전용 파일)는 빈 모듈로 처리.
+    '''
+    if not is_source(path):
+        return read_pyc(path)
+
+    with open(path, 'rb') as f:
+        source = f.read()
+    try:
+        # import(SourceLoader)와 같이 bytes로 컴파일해 인코딩 선언을 따름
+        return compile(source, path, 'exec', dont_inherit=True)
+    except (SyntaxError, ValueError) as e:
+        print(f'warning: cannot compile {path}: {e}')
+        return compile('', path, 'exec', dont_inherit=True)
+
+
+class Instruction:
+    '''
+    dis.get_instructions의 레코드에서 파서가 사용하는 값만 담은 인스트럭션.
+    text는 dis 출력에서 괄호 안에 표시되는 argrepr (공백을 하나로 합치고 첫 번째 ')' 까지)로
+    스택에 푸시되는 이름, 상수 표현에 사용하며 argrepr이 없으면 None.
+    '''
+    __slots__ = ('opcode', 'opname', 'arg', 'argval', 'text')
+
+    def __init__(self, instruction):
+        self.opcode = instruction.opcode
+        self.opname = instruction.opname
+        self.arg = instruction.arg
+        self.argval = instruction.argval
+
+        argrepr = instruction.argrepr
+        if not argrepr:
+            self.text = None
+            return
+        argrepr = f'({argrepr})'
+        if ' ' in argrepr:
+            argrepr = ' '.join(argrepr.split())
+        self.text = argrepr[1:argrepr.index(')', 1)]
+
+    def __repr__(self):
+        return f'{self.opname} {self.arg} ({self.text})'
+
+
+def opcodes(*names):
+    '''
+    현재 인터프리터에 있는 opcode 이름의 opcode 집합. (버전마다 없는 opcode는 제외)
+    '''
+    return frozenset(dis.opmap[name] for name in names if name in dis.opmap)
+
 
-        return int(offset), ' '.join(content), int(line_number)
+SETUP_WITH = opcodes('SETUP_WITH', 'SETUP_ASYNC_WITH')
 
+
+def code_objects(code):
+    '''
+    co_consts를 재귀적으로 탐색해 정의된 코드 객체를 dis.dis 출력과 같은 순서(전위 순회)로 반환.
+    '''
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            yield const
+            yield from code_objects(const)
+
+
+def preprocessing_bytecode(byte_code):
     '''
-    바이트코드를 main과 def 파트로 구분해 각각 반환.
+    바이트코드를 main과 def 파트로 구분해 각각 {offset: Instruction} 으로 반환.
     '''
     dis_bytecode = {}
     dis_objects = []
@@ -50,75 +92,55 @@ def preprocessing_bytecode(byte_code):
 
     cleanup = set()  # 바이트코드 상에 추가되는 클린업 코드(유저가 작성하지 않음)
 
-    # StringIO 객체를 생성
-    f = io.StringIO()
-    # dis의 출력을 StringIO 객체로 리디렉션
-    with redirect_stdout(f):
-        dis.dis(byte_code)
-
-    # StringIO 객체에서 값을 얻고, 이를 줄 단위로 분할
-    dis_output = f.getvalue()
-    codes = dis_output.split('Disassembly of <code object')[
-        0].strip().split('\n')
-
-    objects = dis_output.split('Disassembly of <code object')[1:]
-    for i, obj in enumerate(objects):
-        objects[i] = obj.strip().split('\n')
-
     # 바이트코드의 main 부분
     main_bcode_block_start_offsets = []
-    for line in codes:
-        offset, content, line_number = parse_bytecode_line(line)
+    for instruction in dis.get_instructions(byte_code):
+        offset = instruction.offset
 
         # 소스코드 기준 새로운 라인
-        if line_number != 0:
-            bcode_block_number = line_number
+        if instruction.starts_line:
+            bcode_block_number = instruction.starts_line
             main_bcode_block_start_offsets.append(offset)
 
-        if not isinstance(offset, int):
-            continue
-
         # 유저가 작성하지 않은 코드를 트래킹에서 제외
         # With, Try 등의 클린업 코드
-        if 'SETUP_WITH' in content or 'SETUP_ASYNC_WITH' in content:
+        if instruction.opcode in SETUP_WITH:
             cleanup.add(bcode_block_number)
             bcode_block_number += 1
 
         if bcode_block_number in cleanup:
             continue
 
-        dis_bytecode[offset] = content
+        dis_bytecode[offset] = Instruction(instruction)
 
-    for obj in objects:
+    for code in code_objects(byte_code):
         dis_object = {}
-        first_line = obj[0].split()
+        # <code object NAME at 0x7f..., file "...", line N>
+        code_repr = repr(code).split()
 
-        dis_object['__name'] = first_line[0]
-        dis_object['__addr'] = first_line[2].replace(',', '')
-        obj.pop(0)
+        dis_object['__name'] = code_repr[2]
+        dis_object['__addr'] = code_repr[4].replace(',', '')
 
         def_bcode_block_start_offsets = []
-        for line in obj:
-            offset, content, line_number = parse_bytecode_line(line)
+        for instruction in dis.get_instructions(code):
+            offset = instruction.offset
+            line_number = instruction.starts_line
 
-            if line_number != 0:
+            if line_number:
                 bcode_block_number = line_number
                 def_bcode_block_start_offsets.append(offset)
-            # line_number가 0이면 새로운 라인이 아니라는 뜻
-            elif line_number == 0:
+            # 새로운 라인이 아니면 현재 블록의 라인
+            else:
                 line_number = bcode_block_number
 
-            if not isinstance(offset, int):
-                continue
-
-            if 'SETUP_WITH' in content or 'SETUP_ASYNC_WITH' in content:
+            if instruction.opcode in SETUP_WITH:
                 cleanup.add(bcode_block_number)
                 bcode_block_number += 1
 
             if line_number in cleanup:
                 continue
 
-            dis_object[offset] = content
+            dis_object[offset] = Instruction(instruction)
 
         dis_objects.append(dis_object)
         list_def_bcode_block_start_offsets.append(
@@ -1,27 +1,28 @@
+'''
+엔트리 스크립트에서 시작해 호출될 수 있는 Python 모듈의 함수를 추적하고 PyMethodDef로 C 함수 주소를 찾는 bytecode tracking.
+
+BTRACKING_WORKERS       모듈 파싱(create_call_map) 워커 프로세스 수 (기본값 1, 1이면 순차 파싱)
+'''
+
+import multiprocessing
+import os
 import sys
-import importlib
 import time
 
 import bcode_parser
 import bcode_utils
+import call_map_cache
 import func_mapping
+import module_index
+import module_resolver
+import phase_tracer
 
-# get python builtin modules
-from stdlib_list import stdlib_list
-
-LIBRARIES = stdlib_list("3.10")
+WORKERS = int(os.getenv('BTRACKING_WORKERS', '1'))
 
 
 def is_builtin_module(module_name):
-    global LIBRARIES
-
-    if '.' in module_name:
-        module_name = module_name.split('.')[0]
-
-    if module_name in LIBRARIES:
-        return True
-    else:
-        return False
+    # 표준 라이브러리 여부는 모듈 인덱스에서 최상위 모듈 이름으로 확인
+    return module_resolver.is_stdlib(module_name)
 
 # 너비탐색으로 진행.
 
@@ -90,6 +91,52 @@ def create_call_map(byte_code, module):
     return called_map, def_map, obj_map, decorator_map
 
 
+def _parse_module(task):
+    path, module = task
+    parse_start = time.process_time()
+    with module_resolver.recording() as queries:
+        call_map = create_call_map(bcode_utils.read_code(path), module)
+    return call_map, queries, time.process_time() - parse_start
+
+
+def load_call_maps(tasks, workers=WORKERS):
+    '''
+    (.pyc 또는 .py 경로, 모듈) 리스트의 call map을 같은 순서의 리스트로 반환.
+    캐시에 있으면 바이트코드를 읽거나 파싱하지 않으며, 캐시되지 않은 모듈이 여러 개이고 workers > 1 이면
+    워커 프로세스에서 파싱함. 모듈 파싱은 서로 독립적이므로 결과는 순차 파싱과 같음.
+    '''
+    cache = call_map_cache.get_cache()
+    keys = [None] * len(tasks)
+    call_maps = [None] * len(tasks)
+    if cache is not None:
+        for i, (path, module) in enumerate(tasks):
+            keys[i] = call_map_cache.cache_key(path, module)
+            call_maps[i] = cache.lookup(path, keys[i])
+
+    misses = [i for i, call_map in enumerate(call_maps) if call_map is None]
+    if workers > 1 and len(misses) > 1:
+        parse_start = time.time()
+        context = multiprocessing.get_context('fork')
+        with context.Pool(min(workers, len(misses))) as pool:
+            # 큰 모듈이 한 워커에 몰리지 않도록 하나씩 분배
+            results = pool.map(_parse_module, [tasks[i] for i in misses], chunksize=1)
+        wall_time = time.time() - parse_start
+
+        parse_time = sum(parse_time for _, _, parse_time in results)
+        print(f'btracking workers: {workers}, modules parsed: {len(misses)}, '
+              f'parse cpu time (sum over workers): {parse_time:.3f} sec, wall: {wall_time:.3f} sec, '
+              f'speedup: {parse_time / max(wall_time, 1e-9):.2f}x')
+    else:
+        results = [_parse_module(tasks[i]) for i in misses]
+
+    for i, (call_map, queries, _) in zip(misses, results):
+        call_maps[i] = call_map
+        if cache is not None:
+            cache.store(tasks[i][0], keys[i], call_map, queries)
+
+    return call_maps
+
+
 def module_tracking(pycaches, base_map, C_functions_with_decorators, called_func):
     # 모듈의 origin name을 확인해 alias를 찾는 함수
     def check_module_alias(module):
@@ -104,13 +151,9 @@ def module_tracking(pycaches, base_map, C_functions_with_decorators, called_func
 
     no_tracking = {'__builtin', '__not_pymodule',
                    '__virtual_pymodule', '__ModuleNotFoundError'}
-    for module, path in pycaches.items():
-        if path in no_tracking:
-            continue
-
-        byte_code = bcode_utils.read_pyc(path)
-        called_map, def_map, obj_map, decorator_map = create_call_map(
-            byte_code, module)
+    tasks = [(path, module) for module, path in pycaches.items() if path not in no_tracking]
+    for (path, module), call_map in zip(tasks, load_call_maps(tasks)):
+        called_map, def_map, obj_map, decorator_map = call_map
         key = module.split('.')[0]
         alias = check_module_alias(module)
         # 현재 모듈에서 트래킹할 함수 - 다른 모듈에서 호출된 현재 모듈의 함수
@@ -168,27 +211,9 @@ def search_module_path(called_map, pycaches):
             pycaches[__origin_name] = '__builtin'
             continue
 
-        try:
-            if __origin_name in sys.modules:
-                loaded_module = sys.modules[__origin_name]
-            else:
-                loaded_module = importlib.import_module(__origin_name)
-
-            module_path = loaded_module.__cached__
-            pycaches[__origin_name] = module_path
-        except AttributeError:
-            # 가상 모듈 구분
-            if (loaded_module.__spec__ is not None) and (not loaded_module.__spec__.origin):
-                pycaches[__origin_name] = '__virtual_pymodule'
-            else:
-                pycaches[__origin_name] = '__not_pymodule'
+        # 모듈 코드를 실행하지 않도록 import 하지 않고 .pyc 경로를 찾음
         # 런타임에 import되지 않는 모듈이 존재하며 해당 모듈은 시스템에 설치되지 않았을 수 있음.
-        except ModuleNotFoundError:
-            # ctypes로 로드되는 모듈의 경우 importlib로 import할 수 없음.
-            if __origin_name.endswith('.so'):
-                pycaches[__origin_name] = '__not_pymodule'
-            else:
-                pycaches[__origin_name] = '__ModuleNotFoundError'
+        pycaches[__origin_name] = module_resolver.pycache(__origin_name)
 
 
 def extract_c_func(modules_info, called_map):
@@ -230,57 +255,75 @@ def entry_tracking(pycaches, modules_info, SCRIPT_PATH):
 
 
 def main(SCRIPT_PATH):
-    addr_collect_start_time = time.time()
-
-    pycaches = {}
-    modules_info = {}
-    C_functions_with_decorators = {}
-    called_func = {}
-
-    called_map, pycaches, modules_info = entry_tracking(
-        pycaches, modules_info, SCRIPT_PATH)
-
-    new_called_map = module_tracking(
-        pycaches, called_map, C_functions_with_decorators, called_func)
-    while (True):
-        next_tracking = bcode_utils.find_unique_keys_values(
-            called_map, new_called_map)
-
-        # next_tracking[key][__called] 값이 called_map의 __called 값에 포함되는 항목을 next_tracking에서 제거
-        keys_to_remove = [
-            key for key in next_tracking
-            if key in called_map and called_map[key]['__called'].issuperset(next_tracking[key]['__called'])
-        ]
-        for key in keys_to_remove:
-            del next_tracking[key]
-
+    with phase_tracer.span('btracking', script=SCRIPT_PATH) as span:
         pycaches = {}
-        search_module_path(next_tracking, pycaches)
-        modules_info = pycaches | modules_info
+        modules_info = {}
+        C_functions_with_decorators = {}
+        called_func = {}
 
-        if next_tracking:
-            called_map = bcode_utils.merge_dictionaries(
-                called_map, new_called_map)
-            new_called_map = module_tracking(
-                pycaches, next_tracking, C_functions_with_decorators, called_func)
-        else:
-            break
-
-    not_pymodules = extract_c_func(modules_info, called_map)
+        cache = call_map_cache.get_cache()
+        if cache is not None:
+            hits, misses = cache.hits, cache.misses
 
-    C_functions1 = func_mapping.check_PyMethodDef(not_pymodules)
-    C_functions2 = func_mapping.check_PyMethodDef(C_functions_with_decorators)
-    C_functions = C_functions1 | C_functions2
+        # 이전 분석 이후 설치/삭제된 모듈을 반영 (mtime이 바뀐 디렉토리만 다시 읽음)
+        with phase_tracer.span('module_index'):
+            module_index.get_index().refresh(check_mtime=True)
 
-    # C_functions = C_functions1
+        with phase_tracer.span('entry_tracking'):
+            called_map, pycaches, modules_info = entry_tracking(
+                pycaches, modules_info, SCRIPT_PATH)
 
-    set_c_functions = set()
-
-    for _, addr in C_functions.items():
-        set_c_functions.add(addr)
-
-    addr_collect_end_time = time.time()
-    addr_collect_time = addr_collect_end_time - addr_collect_start_time
-    module_count = len(modules_info)
+        with phase_tracer.span('module_tracking'):
+            new_called_map = module_tracking(
+                pycaches, called_map, C_functions_with_decorators, called_func)
+            while (True):
+                next_tracking = bcode_utils.find_unique_keys_values(
+                    called_map, new_called_map)
+
+                # next_tracking[key][__called] 값이 called_map의 __called 값에 포함되는 항목을 next_tracking에서 제거
+                keys_to_remove = [
+                    key for key in next_tracking
+                    if key in called_map and called_map[key]['__called'].issuperset(next_tracking[key]['__called'])
+                ]
+                for key in keys_to_remove:
+                    del next_tracking[key]
+
+                pycaches = {}
+                search_module_path(next_tracking, pycaches)
+                modules_info = pycaches | modules_info
+
+                if next_tracking:
+                    called_map = bcode_utils.merge_dictionaries(
+                        called_map, new_called_map)
+                    new_called_map = module_tracking(
+                        pycaches, next_tracking, C_functions_with_decorators, called_func)
+                else:
+                    break
+
+        with phase_tracer.span('func_mapping'):
+            not_pymodules = extract_c_func(modules_info, called_map)
+
+            C_functions1 = func_mapping.check_PyMethodDef(not_pymodules)
+            C_functions2 = func_mapping.check_PyMethodDef(C_functions_with_decorators)
+            C_functions = C_functions1 | C_functions2
+
+            # C_functions = C_functions1
+
+        set_c_functions = set()
+
+        for _, addr in C_functions.items():
+            set_c_functions.add(addr)
+
+        module_count = len(modules_info)
+        phase_tracer.count('modules', module_count)
+
+        # 이번 분석에서의 call map 캐시 hit rate
+        if cache is not None:
+            hits, misses = cache.hits - hits, cache.misses - misses
+            phase_tracer.count(phase_tracer.CALL_MAP_HITS, hits)
+            phase_tracer.count(phase_tracer.CALL_MAP_MISSES, misses)
+            print(cache.summary(hits, misses))
+
+    addr_collect_time = span.wall
 
     return set_c_functions, addr_collect_time, module_count
@@ -1,27 +1,15 @@
 import sys
-import importlib
 import time
 import traceback
 
 import bcode_parser
 import bcode_utils
-
-# get python builtin modules
-from stdlib_list import stdlib_list
-
-LIBRARIES = stdlib_list("3.10")
+import module_resolver
 
 
 def is_builtin_module(module_name):
-    global LIBRARIES
-
-    if '.' in module_name:
-        module_name = module_name.split('.')[0]
-
-    if module_name in LIBRARIES:
-        return True
-    else:
-        return False
+    # 표준 라이브러리 여부는 모듈 인덱스에서 최상위 모듈 이름으로 확인
+    return module_resolver.is_stdlib(module_name)
 
 # 너비탐색으로 진행.
 
@@ -108,7 +96,7 @@ def module_tracking(pycaches, base_map, C_functions_with_decorators, called_func
         if path in no_tracking:
             continue
 
-        byte_code = bcode_utils.read_pyc(path)
+        byte_code = bcode_utils.read_code(path)
         called_map, def_map, obj_map, decorator_map = create_call_map(
             byte_code, module)
         key = module.split('.')[0]
@@ -168,27 +156,9 @@ def search_module_path(called_map, pycaches):
             pycaches[__origin_name] = '__builtin'
             continue
 
-        try:
-            if __origin_name in sys.modules:
-                loaded_module = sys.modules[__origin_name]
-            else:
-                loaded_module = importlib.import_module(__origin_name)
-
-            module_path = loaded_module.__cached__
-            pycaches[__origin_name] = module_path
-        except AttributeError:
-            # 가상 모듈 구분
-            if (loaded_module.__spec__ is not None) and (not loaded_module.__spec__.origin):
-                pycaches[__origin_name] = '__virtual_pymodule'
-            else:
-                pycaches[__origin_name] = '__not_pymodule'
+        # 모듈 코드를 실행하지 않도록 import 하지 않고 .pyc 경로를 찾음
         # 런타임에 import되지 않는 모듈이 존재하며 해당 모듈은 시스템에 설치되지 않았을 수 있음.
-        except ModuleNotFoundError:
-            # ctypes로 로드되는 모듈의 경우 importlib로 import할 수 없음.
-            if __origin_name.endswith('.so'):
-                pycaches[__origin_name] = '__not_pymodule'
-            else:
-                pycaches[__origin_name] = '__ModuleNotFoundError'
+        pycaches[__origin_name] = module_resolver.pycache(__origin_name)
 
 
 def extract_c_func(modules_info, called_map):
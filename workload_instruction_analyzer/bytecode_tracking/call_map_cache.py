@@ -0,0 +1,131 @@
+'''
+모듈(.pyc)별 create_call_map 결과(called_map, def_map, obj_map, decorator_map)를 디스크에 저장하는 캐시.
+numpy, pandas 등 site-packages 모듈은 같은 이미지에서 실행마다 바뀌지 않으므로 한 번 파싱한 모듈은 다시 파싱하지 않음.
+
+키는 인터프리터 버전, 모듈 이름, .pyc 헤더(magic number, flags, 소스 mtime/크기 또는 소스 해시)와 .pyc 크기.
+소스가 바뀌어 .pyc가 다시 생성되면 헤더가 바뀌므로 엔트리를 다시 만듦.
+.pyc가 없어 소스(.py)를 컴파일하는 모듈은 소스의 mtime과 크기를 사용.
+엔트리는 .pyc 경로마다 하나의 pickle 파일로 저장하며 사용한 엔트리는 직렬화된 상태로 프로세스 내에서 유지함.
+(analysis_daemon.py 와 같이 여러 번 분석하는 경우 파일을 다시 읽지 않음)
+조회할 때마다 역직렬화하므로 반환된 call map은 호출한 쪽에서 수정해도 됨.
+
+call map은 파싱 중 확인한 모듈 구분(bcode_parser.module_classification)을 포함하므로 파싱 중 조회한
+모듈 이름과 결과(module_resolver.recording)를 함께 저장하고, 조회할 때 그 이름의 결과가 달라졌으면
+(ex. 패키지 설치, 삭제) 엔트리를 다시 만듦. 워크로드마다 다른 스크립트 디렉토리는 해당 이름을 가리지 않는 한 영향이 없음.
+
+ANALYSIS_CACHE=0, ANALYSIS_CACHE_DIR 은 analysis_cache와 같이 사용
+'''
+
+import hashlib
+import os
+import pickle
+import sys
+
+import analysis_cache
+import bcode_utils
+import module_resolver
+
+CACHE_SUBDIR = 'call_maps'
+# 파서가 만드는 call map 또는 엔트리의 형식이 바뀌면 증가
+CACHE_VERSION = 2
+
+PYC_HEADER_SIZE = 16
+
+
+def cache_key(path, module):
+    '''
+    .pyc 또는 .py 파일의 캐시 키. 파일을 읽을 수 없으면 None.
+    '''
+    if bcode_utils.is_source(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (CACHE_VERSION, sys.version, module, stat.st_mtime_ns, stat.st_size)
+
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(PYC_HEADER_SIZE)
+            size = os.fstat(f.fileno()).st_size
+    except OSError:
+        return None
+
+    if len(header) != PYC_HEADER_SIZE:
+        return None
+    return (CACHE_VERSION, sys.version, module, header, size)
+
+
+class CallMapCache:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        # .pyc 경로 -> (키, {파싱 중 조회한 모듈 이름: 모듈 여부}, pickle된 call map)
+        self.entries = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    def _file(self, path):
+        return os.path.join(self.cache_dir, hashlib.sha1(path.encode()).hexdigest() + '.pickle')
+
+    def _load(self, path):
+        if path not in self.entries:
+            try:
+                with open(self._file(path), 'rb') as f:
+                    self.entries[path] = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+                return None
+        return self.entries[path]
+
+    def lookup(self, path, key):
+        '''
+        키가 일치하는 (called_map, def_map, obj_map, decorator_map)을 반환. 없으면 None.
+        '''
+        entry = self._load(path) if key is not None else None
+        if entry is None or entry[0] != key or not module_resolver.unchanged(entry[1]):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return pickle.loads(entry[2])
+
+    def store(self, path, key, call_map, queries):
+        '''
+        queries: call map을 만드는 동안 조회한 {모듈 이름: 모듈 여부} (module_resolver.recording)
+        '''
+        if key is None:
+            return
+
+        entry = (key, queries, pickle.dumps(call_map, protocol=pickle.HIGHEST_PROTOCOL))
+        self.entries[path] = entry
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_path = self._file(path)
+        tmp_path = f'{file_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, file_path)
+        self.stored += 1
+
+    def summary(self, hits=None, misses=None):
+        hits = self.hits if hits is None else hits
+        misses = self.misses if misses is None else misses
+        total = hits + misses
+        rate = hits / total * 100 if total else 0
+        return f'call map cache: hit {hits} / miss {misses} ({rate:.1f}%), stored {self.stored}'
+
+
+_cache = None
+
+
+def get_cache():
+    '''
+    캐시 디렉토리(ANALYSIS_CACHE_DIR)의 call map 캐시. ANALYSIS_CACHE=0 이면 None.
+    '''
+    global _cache
+
+    if not analysis_cache.cache_enabled():
+        return None
+
+    if _cache is None:
+        _cache = CallMapCache(os.path.join(analysis_cache.cache_dir(), CACHE_SUBDIR))
+    return _cache
@@ -1,30 +1,131 @@
-import gdb
+import os
 import subprocess
 import re
+import struct
 
 from infer_variable_type import infer_global_variable_type
 
+import symbol_index
+import process_memory
+import analysis_cache
+import phase_tracer
+
 offset_table = {}
-data_addr_table = {}
+symbols = None
+memory = None
+# GDB 없이 분석하는 경우(스냅샷, analyze_workload.py) 워크로드의 실행 파일. None이면 GDB가 attach한 프로세스를 분석
+exe = None
+
+
+def set_target(target_symbols, target_memory, target_snapshot=None, target_exe=None):
+    '''
+    분석 스크립트에서 만든 심볼 인덱스와 메모리를 사용하도록 설정.
+    스냅샷이나 실행 파일 경로를 넘기면 GDB 명령을 사용하지 않음.
+    '''
+    global symbols, memory, exe
+
+    symbols = target_symbols
+    memory = target_memory
+    exe = target_snapshot.exe if target_snapshot is not None else target_exe
+
+
+def gdb_execute(command):
+    # GDB 없이 분석하는 경우에도 import 할 수 있도록 사용할 때 import
+    import gdb
+
+    phase_tracer.count(phase_tracer.GDB_COMMANDS)
+    return gdb.execute(command, to_string=True)
+
 
+def get_symbol_index():
+    '''
+    attach된 프로세스의 심볼/섹션 인덱스. 처음 사용할 때 한 번만 생성.
+    '''
+    global symbols
 
-def get_data_addr():
-    result = gdb.execute('info files', to_string=True)
+    if symbols is None:
+        import gdb
 
-    # 정규 표현식으로 .data 섹션의 시작 주소 추출
-    pattern = re.compile(r'(0x[0-9a-f]+) - 0x[0-9a-f]+ is \.data in (.+)')
-    matches = pattern.findall(result)
+        symbols = symbol_index.SymbolIndex(gdb.selected_inferior().pid)
+    return symbols
 
-    # 시작 주소 추출
-    data_addr_table = {lib: int(addr, 16) for addr, lib in matches}
-    return data_addr_table
 
+def get_memory():
+    global memory
 
-data_addr_table = get_data_addr()
+    if memory is None:
+        memory = process_memory.GdbMemory()
+    return memory
+
+
+def read_pointer(addr):
+    return struct.unpack('<Q', get_memory().read(addr, 8))[0]
+
+
+def read_string(addr, limit=256):
+    '''
+    addr의 NULL로 끝나는 문자열. 영역의 끝에 걸치면 남은 부분을 한 바이트씩 읽음.
+    '''
+    target = get_memory()
+    data = b''
+    while len(data) < limit and b'\0' not in data:
+        try:
+            data += target.read(addr + len(data), 32)
+        except process_memory.MemoryReadError:
+            try:
+                data += target.read(addr + len(data), 1)
+            except process_memory.MemoryReadError:
+                # 첫 바이트부터 읽을 수 없다면 호출한 쪽에서 건너뜀
+                if not data:
+                    raise
+                break
+    return data.split(b'\0', 1)[0].decode('utf-8', errors='replace')
+
+
+def get_data_addr(lib):
+    # info sharedlibrary 의 경로는 심볼릭 링크일 수 있음
+    data_ranges = get_symbol_index().section_ranges('.data', os.path.realpath(lib))
+    if not data_ranges:
+        raise ValueError(f"Could not find .data section in {lib}")
+    return data_ranges[0][0]
+
+
+def get_func_addr(func, lib=None):
+    '''
+    심볼 인덱스에서 함수 주소(hex 문자열)를 찾음. 라이브러리에서 먼저 찾고 없다면 전역으로 탐색.
+    인덱스에 없는 경우에만 GDB의 info addr 로 조회하며 찾을 수 없으면 None.
+    '''
+    index = get_symbol_index()
+
+    addr = None
+    if lib is not None and os.path.realpath(lib) in index.bases:
+        addr = index.find_function(func, os.path.realpath(lib))
+    if addr is None:
+        # PyMethodDef의 함수는 대부분 static 이므로 local 심볼도 탐색
+        addr = index.find_symbol(func)
+    if addr is not None:
+        return hex(addr)
+    # GDB 없이 분석하는 경우 GDB에 로드된 프로세스가 없음
+    if exe is not None:
+        return None
+
+    import gdb
+
+    try:
+        result = gdb_execute(f'info addr {func}')
+    except gdb.error:
+        return None
+    match = re.search(r'0x[0-9a-fA-F]+', result)
+    if match is None:
+        return None
+    return match.group()
 
 
 def get_sharedlibrary():
-    result = gdb.execute("info sharedlibrary", to_string=True)
+    if exe is not None:
+        return [path for path in get_symbol_index().objects() if path != exe]
+
+    result = gdb_execute("info sharedlibrary")
 
     shared_libraries = []
     library_paths = re.findall(r'/[^\s]+', result)
@@ -70,7 +171,7 @@ def is_c(lib):
     return False
 
 
-def get_func_addr_from_cython(module, functions, C_functions):
+def get_func_addr_from_cython(module, functions, C_functions, lib=None):
     for func in functions:
         mangling = '__pyx_pw'
 
@@ -82,29 +183,20 @@ def get_func_addr_from_cython(module, functions, C_functions):
         while (True):
             sym = mangling + f'_{i}{func}'
 
-            try:
-                result = gdb.execute(f'info addr {sym}', to_string=True)
-                match = re.search(r'0x[0-9a-fA-F]+', result)
-                if match is not None:
-                    addr = match.group()
-                    C_functions[sym] = addr
-            except gdb.error:
+            addr = get_func_addr(sym, lib)
+            if addr is None:
                 break
+            C_functions[sym] = addr
 
             i += 1
 
 
-def get_func_addr_from_c(functions, C_functions):
+def get_func_addr_from_c(functions, C_functions, lib=None):
     for func in functions:
-        try:
-            result = gdb.execute(f'info addr {func}', to_string=True)
-            match = re.search(r'0x[0-9a-fA-F]+', result)
-            if match is not None:
-                addr = match.group()
-                C_functions[func] = addr
-        except gdb.error:
-            # 함수를 찾을 수 없는 경우 건너뜀
-            continue
+        addr = get_func_addr(func, lib)
+        # 함수를 찾을 수 없는 경우 건너뜀
+        if addr is not None:
+            C_functions[func] = addr
 
 
 def get_PyMethodDef(lib, func_mapping):
@@ -141,28 +233,23 @@ def get_PyMethodDef(lib, func_mapping):
 
         PyMethodDef_offset = PyMethodDef_elf_offset - data_ELF_VMA
 
-        start_addr = data_addr_table[lib] + PyMethodDef_offset
+        start_addr = get_data_addr(lib) + PyMethodDef_offset
         while True:
-            ml_name_ptr = gdb.execute(
-                f"x/a {hex(start_addr)}", to_string=True).split(':')[1].strip()
-            ml_name_ptr = ml_name_ptr.split(" ")[0].strip()
-            ml_name = gdb.execute(f"x/s {ml_name_ptr}", to_string=True)
-            ml_meth = gdb.execute(
-                f"x/a {hex(start_addr + 8)}", to_string=True).split(':')[1].split('<')[0].strip()
-
-            if ml_name_ptr == '0x0' and ml_meth == '0x0':
+            # GDB의 x/a, x/s 대신 메모리에서 PyMethodDef {ml_name, ml_meth, ...}를 직접 읽음
+            ml_name_ptr = read_pointer(start_addr)
+            ml_meth = read_pointer(start_addr + 8)
+
+            if ml_name_ptr == 0 and ml_meth == 0:
                 break
 
-            # 정규식 검색 결과가 None인지 확인
-            ml_name_match = re.search(r'\"([^\"]*)\"', ml_name)
-            if ml_name_match is None:
-                # 패턴이 매치되지 않으면 다음 항목으로 건너뜀
+            try:
+                ml_name = read_string(ml_name_ptr)
+            except process_memory.MemoryReadError:
+                # 이름을 읽을 수 없으면 다음 항목으로 건너뜀
                 start_addr += 32
                 continue
 
-            ml_name = ml_name_match.group(1)
-
-            func_mapping[ml_name] = ml_meth
+            func_mapping[ml_name] = hex(ml_meth)
             start_addr += 32
 
     # 디버깅 심볼이 있는지 확인
@@ -191,6 +278,47 @@ def get_PyMethodDef(lib, func_mapping):
         search_mapping(var, lib)
 
 
+def get_lib_range(lib):
+    '''
+    공유 라이브러리의 (load base, 매핑 끝 주소)를 반환.
+    '''
+    index = get_symbol_index()
+
+    # info sharedlibrary 의 경로는 심볼릭 링크일 수 있음
+    path = os.path.realpath(lib)
+    if path not in index.bases:
+        return None
+    return index.bases[path], max(end for _, end, mapping_path in index.mappings if mapping_path == path)
+
+
+def get_PyMethodDef_cached(lib, func_mapping):
+    '''
+    라이브러리의 PyMethodDef 매핑을 build-id 캐시에서 가져와 현재 load base로 rebase.
+    캐시에 없다면 get_PyMethodDef로 찾은 뒤 base 기준 오프셋으로 저장.
+    '''
+    cache = analysis_cache.get_cache()
+    lib_range = get_lib_range(lib)
+    if cache is None or lib_range is None:
+        get_PyMethodDef(lib, func_mapping)
+        return
+
+    base, end = lib_range
+    cached = cache.lookup(analysis_cache.METHODS, lib)
+    if cached is not None:
+        for ml_name, offset in cached.items():
+            func_mapping[ml_name] = hex(base + offset)
+        return
+
+    lib_mapping = {}
+    get_PyMethodDef(lib, lib_mapping)
+    func_mapping.update(lib_mapping)
+
+    offsets = {ml_name: int(ml_meth, 16) - base for ml_name, ml_meth in lib_mapping.items()}
+    # 다른 라이브러리를 가리키는 함수 포인터가 있다면 rebase 할 수 없으므로 캐시하지 않음
+    if all(0 <= offset < end - base for offset in offsets.values()):
+        cache.store(analysis_cache.METHODS, lib, 0, offsets)
+
+
 def check_PyMethodDef(not_pymodules):
     shared_libraries = get_sharedlibrary()
 
@@ -205,11 +333,11 @@ def check_PyMethodDef(not_pymodules):
         for lib in shared_libraries:
             if module in lib:
                 if is_cython(lib):
-                    get_func_addr_from_cython(module, functions, C_functions)
+                    get_func_addr_from_cython(module, functions, C_functions, lib)
                 elif is_c(lib):
-                    get_func_addr_from_c(functions, C_functions)
+                    get_func_addr_from_c(functions, C_functions, lib)
                 else:
-                    get_PyMethodDef(lib, func_mapping)
+                    get_PyMethodDef_cached(lib, func_mapping)
 
                     for func in functions:
                         if func in func_mapping:
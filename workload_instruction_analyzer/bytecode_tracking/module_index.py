@@ -0,0 +1,258 @@
+'''
+sys.path의 모든 디렉토리(스크립트 디렉토리, site-packages, 표준 라이브러리)를 한 번 탐색해 만든
+모듈 이름 -> (종류, 파일) 인덱스. import 시스템을 매번 탐색하지 않고 dict 조회로 모듈을 찾음.
+
+import와 같은 우선순위로 이름을 결정함.
+  - builtin 모듈, sys.path 순서. 먼저 발견된 일반 패키지/모듈을 사용
+  - 한 디렉토리 안에서는 __init__이 있는 패키지, 확장 모듈(.so), .py, .pyc 순서
+  - __init__이 없는 디렉토리는 다른 경로에서 모듈을 찾지 못한 경우 namespace 패키지 (모든 portion을 합침)
+zip 등 디렉토리가 아닌 sys.path 항목은 탐색하지 않음.
+
+디렉토리별 목록을 mtime과 함께 인터프리터/venv별 파일에 저장하며, 인덱스를 다시 만들 때는 mtime이 바뀐
+디렉토리의 목록만 다시 읽음. sys.path의 디렉토리가 바뀌거나 (ex. 스크립트 디렉토리 추가)
+btracking.main 이 분석을 시작할 때 (analysis_daemon.py 와 같이 여러 번 분석하는 경우) 다시 만듦.
+
+ANALYSIS_CACHE=0, ANALYSIS_CACHE_DIR 은 analysis_cache와 같이 사용 (ANALYSIS_CACHE=0 이면 저장하지 않음)
+'''
+
+import hashlib
+import importlib.machinery
+import os
+import pickle
+import sys
+import sysconfig
+import time
+
+import analysis_cache
+import phase_tracer
+
+CACHE_SUBDIR = 'module_index'
+
+# 모듈 종류
+BUILTIN = 'builtin'         # 인터프리터에 포함된 모듈 (builtin, frozen)
+EXTENSION = 'extension'     # C 확장 모듈 (.so)
+SOURCE = 'source'           # .py
+BYTECODE = 'bytecode'       # 소스 없이 .pyc만 있는 모듈
+NAMESPACE = 'namespace'     # __init__.py가 없는 namespace 패키지
+
+# 한 디렉토리 안에서 모듈 파일의 우선순위 (importlib의 FileFinder와 같은 순서)
+SUFFIXES = ([(suffix, EXTENSION) for suffix in importlib.machinery.EXTENSION_SUFFIXES] +
+            [(suffix, SOURCE) for suffix in importlib.machinery.SOURCE_SUFFIXES] +
+            [(suffix, BYTECODE) for suffix in importlib.machinery.BYTECODE_SUFFIXES])
+
+
+def stdlib_dirs():
+    paths = sysconfig.get_paths()
+    return {os.path.realpath(paths[name]) for name in ('stdlib', 'platstdlib')}
+
+
+def is_stdlib_dir(path, stdlib):
+    # 표준 라이브러리 디렉토리와 lib-dynload. site-packages 는 제외
+    path = os.path.realpath(path)
+    if 'site-packages' in path.split(os.sep) or 'dist-packages' in path.split(os.sep):
+        return False
+    return any(path == root or path.startswith(root + os.sep) for root in stdlib)
+
+
+class ModuleIndex:
+    def __init__(self, cache_path=None):
+        # 목록을 저장할 파일 (None이면 저장하지 않음)
+        self.cache_path = cache_path
+        # 디렉토리 -> (mtime_ns, [(이름, 디렉토리 여부)])
+        self.listings = {}
+        # 인덱스를 만든 sys.path와 그 중 탐색한 디렉토리
+        self.path = None
+        self.locations = None
+        # 모듈 이름 -> (종류, 파일). namespace, builtin 모듈의 파일은 None
+        self.modules = {}
+        # 표준 라이브러리 최상위 모듈 이름
+        self.stdlib = frozenset()
+
+        self.dirs_read = 0
+
+    def _listing(self, path, listings):
+        if path in listings:
+            return listings[path][1]
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        cached = self.listings.get(path)
+        if cached is None or cached[0] != mtime:
+            try:
+                with os.scandir(path) as it:
+                    entries = [(entry.name, entry.is_dir()) for entry in it]
+            except OSError:
+                return None
+            cached = (mtime, entries)
+            self.dirs_read += 1
+
+        listings[path] = cached
+        return cached[1]
+
+    @staticmethod
+    def _module_file(directory, files, name):
+        for suffix, kind in SUFFIXES:
+            if name + suffix in files:
+                return kind, os.path.join(directory, name + suffix)
+        return None
+
+    def _scan(self, prefix, locations, listings):
+        '''
+        locations 에서 찾을 수 있는 하위 모듈을 인덱스에 추가하고 하위 패키지를 재귀적으로 탐색.
+        {이름: 모듈을 찾은 location}을 반환.
+        '''
+        # 이름 -> ((종류, 파일), 하위 모듈 탐색 경로, location)
+        found = {}
+        # 이름 -> [(location, namespace portion 디렉토리)]
+        portions = {}
+        for location in locations:
+            entries = self._listing(location, listings)
+            if entries is None:
+                continue
+            files = {name for name, is_dir in entries if not is_dir}
+            dirs = {name for name, is_dir in entries if is_dir}
+
+            names = set(dirs)
+            for file_name in files:
+                for suffix, _ in SUFFIXES:
+                    if file_name.endswith(suffix):
+                        names.add(file_name[:-len(suffix)])
+                        break
+
+            for name in names:
+                if name in found or not name.isidentifier() or name in ('__pycache__', '__init__'):
+                    continue
+
+                package_dir = os.path.join(location, name)
+                sub_entries = self._listing(package_dir, listings) if name in dirs else None
+                if sub_entries is not None:
+                    sub_files = {sub_name for sub_name, is_dir in sub_entries if not is_dir}
+                    module = self._module_file(package_dir, sub_files, '__init__')
+                    if module is not None:
+                        found[name] = (module, [package_dir], location)
+                        continue
+
+                module = self._module_file(location, files, name)
+                if module is not None:
+                    found[name] = (module, None, location)
+                elif sub_entries is not None:
+                    portions.setdefault(name, []).append((location, package_dir))
+
+        for name, name_portions in portions.items():
+            if name not in found:
+                found[name] = ((NAMESPACE, None), [package_dir for _, package_dir in name_portions],
+                               name_portions[0][0])
+
+        for name, (module, search_locations, _) in found.items():
+            self.modules[prefix + name] = module
+            if search_locations is not None:
+                self._scan(prefix + name + '.', search_locations, listings)
+
+        return {name: location for name, (_, _, location) in found.items()}
+
+    def _locations(self):
+        locations = []
+        for entry in sys.path:
+            location = os.path.abspath(entry or os.getcwd())
+            if location not in locations and os.path.isdir(location):
+                locations.append(location)
+        return locations
+
+    def build(self, locations):
+        '''
+        locations(sys.path의 디렉토리)로 인덱스를 다시 만듦. mtime이 바뀌지 않은 디렉토리는 저장된 목록을 사용.
+        목록을 새로 읽거나 삭제한 디렉토리가 있으면 True.
+        '''
+        self.modules = {}
+        listings = {}
+        top_level = self._scan('', locations, listings)
+
+        # builtin 모듈은 sys.path보다 먼저 찾음
+        for name in sys.builtin_module_names:
+            self.modules[name] = (BUILTIN, None)
+
+        stdlib = stdlib_dirs()
+        stdlib_locations = {location for location in locations if is_stdlib_dir(location, stdlib)}
+        self.stdlib = frozenset(
+            {name for name, location in top_level.items() if location in stdlib_locations} |
+            set(sys.builtin_module_names) | set(getattr(sys, 'stdlib_module_names', ())))
+
+        # 더 이상 탐색되지 않는 디렉토리의 목록은 삭제
+        changed = self.dirs_read > 0 or listings.keys() != self.listings.keys()
+        self.listings = listings
+        return changed
+
+    def refresh(self, check_mtime=False):
+        '''
+        sys.path의 디렉토리가 인덱스를 만든 이후 바뀌었거나 check_mtime이면 인덱스를 다시 만듦.
+        디렉토리마다 mtime을 확인하며 목록은 mtime이 바뀐 디렉토리만 다시 읽음.
+        '''
+        if self.path == sys.path and not check_mtime:
+            return
+
+        # sys.path에 파일(ex. 스크립트 경로)이 추가된 경우 등은 다시 만들지 않음
+        locations = self._locations()
+        self.path = list(sys.path)
+        if locations == self.locations and not check_mtime:
+            return
+        self.locations = locations
+
+        started = time.time()
+        self.dirs_read = 0
+        if self.build(locations) and self.cache_path is not None:
+            self.save(self.cache_path)
+        phase_tracer.count(phase_tracer.MODULE_INDEX_DIRS_READ, self.dirs_read)
+        print(f'module index: {len(self.modules)} modules, {len(self.listings)} directories '
+              f'({self.dirs_read} read), {time.time() - started:.3f} sec')
+
+    def get(self, name):
+        '''
+        모듈의 (종류, 파일). 인덱스에 없으면 None.
+        '''
+        self.refresh()
+        return self.modules.get(name)
+
+    def is_stdlib(self, name):
+        self.refresh()
+        return name.split('.')[0] in self.stdlib
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.listings, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        index = cls(path)
+        try:
+            with open(path, 'rb') as f:
+                index.listings = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+        return index
+
+
+def cache_file():
+    # 인터프리터, venv마다 sys.path와 표준 라이브러리가 다르므로 따로 저장
+    key = f'{sys.executable}\0{sys.prefix}\0{sys.version}'
+    return os.path.join(analysis_cache.cache_dir(), CACHE_SUBDIR,
+                        hashlib.sha1(key.encode()).hexdigest() + '.pickle')
+
+
+_index = None
+
+
+def get_index():
+    '''
+    프로세스 내에서 공유하는 모듈 인덱스. 디렉토리 목록은 ANALYSIS_CACHE_DIR 에 저장.
+    '''
+    global _index
+
+    if _index is None:
+        _index = ModuleIndex.load(cache_file()) if analysis_cache.cache_enabled() else ModuleIndex()
+    return _index
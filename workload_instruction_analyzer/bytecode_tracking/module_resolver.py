@@ -0,0 +1,147 @@
+'''
+모듈 코드를 실행하지 않고 모듈 이름으로 모듈을 찾는 resolver.
+importlib.import_module, importlib.util.find_spec은 상위 패키지의 __init__을 실행하므로
+sys.path를 탐색해 만든 모듈 인덱스(module_index)에서 찾음.
+
+인덱스에 없는 이름은 이미 로드된 모듈(sys.modules)의 spec을 사용 (ex. os.path).
+import 시점에 __path__를 바꾸거나 sys.modules에 하위 모듈을 직접 추가하는 패키지(ex. six.moves)는 찾지 못할 수 있음.
+'''
+
+import importlib.machinery
+import importlib.util
+import os
+import sys
+from contextlib import contextmanager
+
+import module_index
+from module_index import BUILTIN, EXTENSION, SOURCE, BYTECODE, NAMESPACE
+
+
+def module_type(spec):
+    if spec.origin in ('built-in', 'frozen'):
+        return BUILTIN
+    if spec.origin is None or spec.origin == 'namespace':
+        return NAMESPACE
+    if isinstance(spec.loader, importlib.machinery.ExtensionFileLoader):
+        return EXTENSION
+    if isinstance(spec.loader, importlib.machinery.SourcelessFileLoader):
+        return BYTECODE
+    if spec.origin.endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES)):
+        return EXTENSION
+    return SOURCE
+
+
+def resolve(name):
+    '''
+    모듈의 (종류, 파일)을 반환. 모듈을 찾을 수 없으면 None.
+    '''
+    entry = module_index.get_index().get(name)
+    if entry is not None:
+        return entry
+
+    module = sys.modules.get(name)
+    spec = getattr(module, '__spec__', None)
+    if spec is None:
+        return None
+    category = module_type(spec)
+    return category, spec.origin if category not in (BUILTIN, NAMESPACE) else None
+
+
+# recording() 중 is_module로 조회한 {모듈 이름: 모듈 여부}
+_queries = None
+
+
+@contextmanager
+def recording():
+    '''
+    블록 안에서 is_module로 조회한 모듈 이름과 결과를 기록한 dict를 반환.
+    call map 캐시가 파싱 결과에 영향을 준 이름만 다시 확인하는 데 사용.
+    '''
+    global _queries
+
+    previous = _queries
+    _queries = {}
+    try:
+        yield _queries
+    finally:
+        _queries = previous
+
+
+def is_module(name):
+    found = resolve(name) is not None
+    if _queries is not None:
+        _queries[name] = found
+    return found
+
+
+def unchanged(queries):
+    '''
+    recording()으로 기록한 이름의 조회 결과가 모두 같으면 True.
+    '''
+    return all((resolve(name) is not None) == found for name, found in queries.items())
+
+
+def is_stdlib(name):
+    return module_index.get_index().is_stdlib(name)
+
+
+def pycache(name):
+    '''
+    bytecode tracking에서 사용하는 모듈의 .pyc 경로 또는 분류.
+      .pyc 경로               Python 모듈
+      .py 경로                .pyc가 없거나 소스와 맞지 않는 Python 모듈 (bcode_utils.read_code 에서 메모리로 컴파일)
+      __virtual_pymodule      namespace 패키지
+      __not_pymodule          builtin, C 확장 모듈, ctypes로 로드되는 공유 객체
+      __ModuleNotFoundError   시스템에 설치되지 않은 모듈
+    '''
+    entry = resolve(name)
+    if entry is None:
+        # ctypes로 로드되는 모듈의 경우 모듈로 찾을 수 없음.
+        if name.endswith('.so'):
+            return '__not_pymodule'
+        return '__ModuleNotFoundError'
+
+    category, path = entry
+    if category == NAMESPACE:
+        return '__virtual_pymodule'
+    if category == BYTECODE:
+        return path
+    if category != SOURCE:
+        return '__not_pymodule'
+
+    # import 하지 않으므로 .pyc가 아직 생성되지 않았거나 소스가 바뀐 이후 다시 생성되지 않았을 수 있음.
+    # 다른 패키지의 __pycache__에 기록하지 않도록 이 경우 소스 경로를 반환
+    try:
+        pyc_path = importlib.util.cache_from_source(path)
+    except NotImplementedError:
+        return path
+    return pyc_path if is_fresh_pyc(pyc_path, path) else path
+
+
+def is_fresh_pyc(pyc_path, source_path):
+    '''
+    import와 같이 .pyc 헤더(magic number, 소스 mtime/크기 또는 소스 해시)를 소스와 비교.
+    해시 기반 .pyc 중 소스를 확인하지 않는 .pyc (unchecked-hash)는 import와 같이 항상 사용.
+    '''
+    try:
+        with open(pyc_path, 'rb') as f:
+            header = f.read(16)
+        stat = os.stat(source_path)
+    except OSError:
+        return False
+
+    if len(header) != 16 or header[:4] != importlib.util.MAGIC_NUMBER:
+        return False
+
+    flags = int.from_bytes(header[4:8], 'little')
+    if flags & 0b1:
+        if not flags & 0b10:
+            return True
+        try:
+            with open(source_path, 'rb') as f:
+                return header[8:16] == importlib.util.source_hash(f.read())
+        except OSError:
+            return False
+
+    return (int.from_bytes(header[8:12], 'little') == int(stat.st_mtime) & 0xFFFFFFFF and
+            int.from_bytes(header[12:16], 'little') == stat.st_size & 0xFFFFFFFF)
@@ -0,0 +1,153 @@
+'''
+execution path tracking에서 분석한 함수들의 호출 그래프.
+함수마다 ISA set 비트마스크와 호출 간선(direct, PLT, GOT)을 저장하고
+루트에서 도달 가능한 함수들의 ISA set 합집합을 SCC 축약 그래프 위에서 계산함.
+'''
+
+# 노드 플래그
+FLAG_XTEST = 0x1
+FLAG_TSX = 0x2
+
+
+class CallGraph:
+    def __init__(self):
+        # ISA set 이름 <-> 비트 위치
+        self.isa_bits = {}
+        self.isa_names = []
+
+        # function -> ISA set 비트마스크
+        self.isa = {}
+        # function -> FLAG_*
+        self.flags = {}
+        # function -> 호출하는 함수 set
+        self.edges = {}
+
+        # 그래프가 바뀌면 다시 계산하는 SCC별 도달 가능 요약
+        self.component = None
+        self.closure = None
+
+    def isa_mask(self, isa_sets):
+        mask = 0
+        for isa_set in isa_sets:
+            if isa_set not in self.isa_bits:
+                self.isa_bits[isa_set] = len(self.isa_names)
+                self.isa_names.append(isa_set)
+            mask |= 1 << self.isa_bits[isa_set]
+        return mask
+
+    def isa_set_names(self, mask):
+        return [name for i, name in enumerate(self.isa_names) if mask >> i & 1]
+
+    def add_node(self, function, isa_sets, flags=0):
+        self.isa[function] = self.isa_mask(isa_sets)
+        self.flags[function] = flags
+        self.edges.setdefault(function, set())
+        self.component = None
+
+    def add_edge(self, caller, callee):
+        callees = self.edges.setdefault(caller, set())
+        if callee not in callees:
+            callees.add(callee)
+            self.component = None
+
+    def __contains__(self, function):
+        return function in self.isa
+
+    def __len__(self):
+        return len(self.isa)
+
+    def _condense(self):
+        '''
+        Tarjan 알고리즘(반복 구현)으로 SCC를 찾고, SCC가 완성되는 순서(역 위상 순서)대로
+        각 SCC에서 도달 가능한 (ISA 비트마스크, 플래그)를 계산.
+        '''
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        component = {}
+        closure = []
+        counter = 0
+
+        for root in self.edges:
+            if root in index:
+                continue
+
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.edges[root]))]
+
+            while work:
+                node, callees = work[-1]
+                descended = False
+                for callee in callees:
+                    if callee not in index:
+                        index[callee] = lowlink[callee] = counter
+                        counter += 1
+                        stack.append(callee)
+                        on_stack.add(callee)
+                        work.append((callee, iter(self.edges.get(callee, ()))))
+                        descended = True
+                        break
+                    if callee in on_stack:
+                        lowlink[node] = min(lowlink[node], index[callee])
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] != index[node]:
+                    continue
+
+                # node가 SCC의 루트. 하위 SCC는 이미 모두 계산되어 있음
+                members = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    members.append(member)
+                    if member == node:
+                        break
+
+                scc = len(closure)
+                isa = 0
+                flags = 0
+                for member in members:
+                    component[member] = scc
+                for member in members:
+                    isa |= self.isa.get(member, 0)
+                    flags |= self.flags.get(member, 0)
+                    for callee in self.edges.get(member, ()):
+                        callee_scc = component[callee]
+                        if callee_scc != scc:
+                            isa |= closure[callee_scc][0]
+                            flags |= closure[callee_scc][1]
+                closure.append((isa, flags))
+
+        self.component = component
+        self.closure = closure
+
+    def reachable(self, roots):
+        '''
+        roots에서 도달 가능한 함수들의 (ISA 비트마스크, 플래그) 합집합.
+        '''
+        if self.component is None:
+            self._condense()
+
+        isa = 0
+        flags = 0
+        for root in roots:
+            scc = self.component.get(root)
+            if scc is None:
+                continue
+            isa |= self.closure[scc][0]
+            flags |= self.closure[scc][1]
+        return isa, flags
+
+    def reachable_isa_sets(self, roots):
+        isa, _ = self.reachable(roots)
+        return self.isa_set_names(isa)
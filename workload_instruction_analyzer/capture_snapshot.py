@@ -0,0 +1,35 @@
+'''
+워크로드를 한 번만 잠깐 멈춰 스냅샷 파일을 만든 뒤 바로 재개.
+스냅샷 파일을 SNAPSHOT_FILE로 지정하면 full scan, execution path tracking, bytecode only execution path tracking을
+실행 중인 프로세스 없이 스냅샷으로 수행할 수 있음.
+
+WORKLOAD_PID            캡처할 프로세스
+SNAPSHOT_FILE           저장 경로 (기본값 log/workload.snapshot)
+'''
+
+import os
+import time
+
+import utils
+import process_memory
+import phase_tracer
+
+if __name__ == '__main__':
+    PID = int(os.getenv('WORKLOAD_PID', '0'))
+    SNAPSHOT_FILE = os.getenv('SNAPSHOT_FILE', utils.workload_snapshot_file)
+
+    start_time = time.time()
+    with phase_tracer.span('capture'):
+        snapshot = process_memory.capture_process(PID)
+    with phase_tracer.span('save'):
+        process_memory.save_snapshot(snapshot, SNAPSHOT_FILE)
+
+    region_size = sum(len(data) for _, data in snapshot.regions)
+    print(f'snapshot: {SNAPSHOT_FILE} ({os.path.getsize(SNAPSHOT_FILE) / 1024:.1f} KB)')
+    print(f'objects: {len(snapshot.bases)}, python modules: {len(snapshot.python_modules)}, '
+          f'regions: {len(snapshot.regions)} ({region_size / 1024:.1f} KB)')
+    print(f'LD_BIND_NOW: {snapshot.ld_bind_now}, glibc.elision.enable: {snapshot.glibc_rtm_enable}')
+    print(f"workload freeze time: {snapshot.freeze_time * 1000:.3f} ms")
+    print(f'consistent: {snapshot.consistent}')
+    print(f"total time: {time.time() - start_time:.6f} sec")
+    print(phase_tracer.finish())
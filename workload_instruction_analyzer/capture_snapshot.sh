@@ -0,0 +1,17 @@
+#!/bin/bash
+
+# Check if the first parameter is provided
+if [ -z "$1" ]; then
+    echo "Warning: A PID must be provided as a parameter."
+    exit 1
+fi
+
+export WORKLOAD_PID=$1
+
+# Optional: snapshot file path (default: log/workload.snapshot)
+if [ ! -z "$2" ]; then
+    export SNAPSHOT_FILE=$2
+fi
+
+# The workload is stopped only while its maps, GOT and anonymous executable regions are read
+python3 /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/capture_snapshot.py
@@ -0,0 +1,137 @@
+'''
+인코딩 바이트를 키로 하는 디코딩 결과(ISA set, iclass) 캐시.
+상대 분기와 rip 상대 메모리 피연산자의 displacement는 0으로 마스킹하여
+위치만 다른 같은 인스트럭션이 하나의 엔트리를 공유함.
+
+displacement 앞의 바이트(prefix, opcode, modrm, sib)가 같다면 XED는 같은 위치에서 같은 크기의
+displacement를 디코딩하므로, 엔트리에 기록된 displacement 위치로 마스킹한 키가 일치하면 같은 인스트럭션임.
+
+DECODE_CACHE_MAX_ENTRIES    최대 엔트리 수. 초과 시 가장 오래 사용되지 않은 엔트리부터 삭제
+'''
+
+import os
+import pickle
+from collections import OrderedDict
+
+import analysis_cache
+
+DEFAULT_MAX_ENTRIES = 1 << 20
+
+CACHE_FILE = 'decode_cache.pickle'
+
+
+class DecodeCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # 마스킹된 인코딩 -> (isa_set, iclass, disp_offset, disp_width)
+        self.entries = OrderedDict()
+        # 인스트럭션 길이 -> 해당 길이에서 관찰된 (disp_offset, disp_width)
+        self.positions = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def mask(raw, disp_offset, disp_width):
+        return raw[:disp_offset] + bytes(disp_width) + raw[disp_offset + disp_width:]
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def lookup(self, raw):
+        '''
+        인코딩의 (isa_set, iclass)를 반환. 캐시에 없으면 None.
+        '''
+        entry = self._get(raw)
+        if entry is None:
+            for disp_offset, disp_width in self.positions.get(len(raw), ()):
+                candidate = self._get(self.mask(raw, disp_offset, disp_width))
+                if candidate is not None and candidate[2:] == (disp_offset, disp_width):
+                    entry = candidate
+                    break
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def store(self, raw, isa_set, iclass, disp_offset=0, disp_width=0):
+        # displacement는 opcode 뒤에만 올 수 있으므로 오프셋이 0이라면 마스킹하지 않음
+        if disp_offset == 0:
+            disp_width = 0
+
+        if disp_width:
+            raw = self.mask(raw, disp_offset, disp_width)
+            self.positions.setdefault(len(raw), set()).add(
+                (disp_offset, disp_width))
+
+        self.entries[raw] = (isa_set, iclass, disp_offset, disp_width)
+        self.entries.move_to_end(raw)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self, path):
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(list(self.entries.items()), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, max_entries=DEFAULT_MAX_ENTRIES):
+        cache = cls(max_entries)
+        try:
+            with open(path, 'rb') as f:
+                entries = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return cache
+
+        for raw, (isa_set, iclass, disp_offset, disp_width) in entries:
+            cache.store(raw, isa_set, iclass, disp_offset, disp_width)
+        return cache
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        return (f'decode cache: hit {self.hits} / miss {self.misses} ({rate:.1f}%), '
+                f'entries {len(self.entries)}')
+
+
+_cache = None
+
+
+def get_cache():
+    '''
+    캐시 디렉토리(ANALYSIS_CACHE_DIR)에 저장된 디코딩 캐시를 로드. ANALYSIS_CACHE=0 이면 None.
+    '''
+    global _cache
+
+    if not analysis_cache.cache_enabled():
+        return None
+
+    if _cache is None:
+        max_entries = int(os.getenv('DECODE_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        _cache = DecodeCache.load(
+            os.path.join(analysis_cache.cache_dir(), CACHE_FILE), max_entries)
+    return _cache
+
+
+def close_cache():
+    '''
+    캐시를 저장하고 hit/miss 요약을 반환.
+    '''
+    global _cache
+
+    if _cache is None:
+        return None
+
+    os.makedirs(analysis_cache.cache_dir(), exist_ok=True)
+    _cache.save(os.path.join(analysis_cache.cache_dir(), CACHE_FILE))
+    summary = _cache.summary()
+    _cache = None
+    return summary
@@ -0,0 +1,265 @@
+import os
+
+from elftools.elf.elffile import ELFFile
+from elftools.elf.sections import SymbolTableSection
+from elftools.elf.relocation import RelocationSection
+from elftools.elf.dynamic import DynamicSection
+
+# 분리된 디버그 심볼 파일이 설치되는 경로 (ex. libc6-dbg, *-dbgsym)
+DEBUG_ROOT = '/usr/lib/debug'
+
+# 런타임에 값이 채워지는 섹션 (now binding 이후 실제 함수 주소가 기록됨)
+GOT_SECTIONS = ('.got', '.got.plt')
+# PLT 스텁 섹션 (plt_resolver, symbol_index, 스냅샷 캡처에서 같이 사용)
+PLT_SECTIONS = ('.plt', '.plt.sec', '.plt.got')
+
+# GOT 슬롯에 심볼 주소를 기록하는 재배치 (R_X86_64_GLOB_DAT, R_X86_64_JUMP_SLOT)
+GOT_RELOCATION_TYPES = (6, 7)
+
+# STT_LOOS는 pyelftools에서 STT_GNU_IFUNC를 나타냄
+FUNCTION_SYMBOL_TYPES = ('STT_FUNC', 'STT_LOOS')
+# 동적 링커가 다른 공유 객체의 참조를 해석할 때 사용하는 심볼 바인딩 (STB_LOOS: STB_GNU_UNIQUE)
+EXPORTED_SYMBOL_BINDS = ('STB_GLOBAL', 'STB_WEAK', 'STB_LOOS')
+
+# 파일별 ELF 파싱 결과. (kind, path) -> ((st_mtime_ns, st_size), data)
+# load base와 무관하므로 한 프로세스에서 여러 워크로드를 분석하는 경우(analysis_daemon.py) 같은 공유 객체를 다시 파싱하지 않음
+_parsed = {}
+
+
+def parse_cached(kind, path, parse):
+    '''
+    parse(path)의 결과를 파일의 mtime과 크기가 바뀌지 않는 동안 재사용. 파싱에 실패하면 예외를 그대로 전달.
+    '''
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _parsed.get((kind, path))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    data = parse(path)
+    _parsed[(kind, path)] = (key, data)
+    return data
+
+
+def _parse_elf(path, parse):
+    with open(path, 'rb') as f:
+        return parse(ELFFile(f))
+
+
+def read_proc_maps(pid):
+    '''
+    /proc/PID/maps 를 (start, end, perms, offset, path) 리스트로 반환.
+    '''
+    maps = []
+    with open(f'/proc/{pid}/maps', 'r') as f:
+        for line in f:
+            # ex) 7f1c2a028000-7f1c2a1bd000 r-xp 00028000 103:01 1234   /usr/lib/x86_64-linux-gnu/libc.so.6
+            parts = line.split(maxsplit=5)
+            start, end = (int(addr, 16) for addr in parts[0].split('-'))
+            path = parts[5].strip() if len(parts) > 5 else ''
+            if path.endswith(' (deleted)'):
+                path = path[:-len(' (deleted)')]
+
+            maps.append((start, end, parts[1], int(parts[2], 16), path))
+
+    return maps
+
+
+def get_load_bases(maps):
+    '''
+    파일 오프셋 0을 매핑한 영역과 ELF의 첫 PT_LOAD 세그먼트를 이용해 공유 객체별 load bias를 계산.
+    '''
+    first_mapping = {}
+    for start, _, _, offset, path in maps:
+        if not path.startswith('/') or offset != 0:
+            continue
+        if path not in first_mapping or start < first_mapping[path]:
+            first_mapping[path] = start
+
+    bases = {}
+    for path, start in first_mapping.items():
+        try:
+            vaddr = parse_cached('load_vaddr', path, lambda path: _parse_elf(path, get_first_load_vaddr))
+        except Exception:
+            # ELF가 아닌 파일 매핑 (ex. 데이터 파일, 폰트)
+            continue
+        bases[path] = start - (vaddr & ~0xfff)
+
+    return bases
+
+
+def get_first_load_vaddr(elffile):
+    return min(segment['p_vaddr'] for segment in elffile.iter_segments()
+               if segment['p_type'] == 'PT_LOAD')
+
+
+def get_build_id(elffile):
+    for section in elffile.iter_sections():
+        if section['sh_type'] != 'SHT_NOTE':
+            continue
+        for note in section.iter_notes():
+            if note['n_type'] == 'NT_GNU_BUILD_ID':
+                return note['n_desc']
+    return None
+
+
+def load_build_id(path):
+    return parse_cached('build_id', path, lambda path: _parse_elf(path, get_build_id))
+
+
+def find_debug_file(path, elffile):
+    '''
+    GDB와 같은 순서(build-id, .gnu_debuglink)로 분리된 디버그 심볼 파일을 탐색.
+    '''
+    candidates = []
+
+    build_id = get_build_id(elffile)
+    if build_id:
+        candidates.append(
+            f'{DEBUG_ROOT}/.build-id/{build_id[:2]}/{build_id[2:]}.debug')
+
+    debuglink = elffile.get_section_by_name('.gnu_debuglink')
+    if debuglink is not None:
+        name = debuglink.data().split(b'\0')[0].decode('utf-8')
+        dirname = os.path.dirname(os.path.realpath(path))
+        candidates.append(f'{dirname}/{name}')
+        candidates.append(f'{dirname}/.debug/{name}')
+        candidates.append(f'{DEBUG_ROOT}{dirname}/{name}')
+
+    for candidate in candidates:
+        if os.path.isfile(candidate) and os.path.realpath(candidate) != os.path.realpath(path):
+            return candidate
+    return None
+
+
+def get_sections(elffile):
+    '''
+    메모리에 로드되는 섹션을 (name, addr, size) 리스트로 반환. 주소는 ELF 상의 VMA.
+    '''
+    sections = []
+    for section in elffile.iter_sections():
+        # SHF_ALLOC
+        if not section['sh_flags'] & 0x2 or section['sh_size'] == 0:
+            continue
+        # SHF_TLS, SHT_NOBITS (.tbss) 는 스레드마다 할당되며 주소 범위가 다른 섹션과 겹침
+        if section['sh_flags'] & 0x400 and section['sh_type'] == 'SHT_NOBITS':
+            continue
+        sections.append((section.name, section['sh_addr'], section['sh_size']))
+
+    return sections
+
+
+def load_sections(path):
+    return parse_cached('sections', path, lambda path: _parse_elf(path, get_sections))
+
+
+def get_dynamic_names(elffile):
+    '''
+    .dynamic 섹션의 (DT_SONAME, DT_NEEDED 리스트). SONAME이 없으면 None.
+    '''
+    soname = None
+    needed = []
+    for section in elffile.iter_sections():
+        if not isinstance(section, DynamicSection):
+            continue
+        for tag in section.iter_tags():
+            if tag.entry.d_tag == 'DT_SONAME':
+                soname = tag.soname
+            elif tag.entry.d_tag == 'DT_NEEDED':
+                needed.append(tag.needed)
+    return soname, needed
+
+
+def load_dynamic_names(path):
+    return parse_cached('dynamic', path, lambda path: _parse_elf(path, get_dynamic_names))
+
+
+def get_got_relocations(elffile):
+    '''
+    .rela.plt, .rela.dyn 에서 GOT 슬롯에 채워질 심볼을 {슬롯 VMA: 심볼 이름} 으로 반환.
+    '''
+    slots = {}
+    for section in elffile.iter_sections():
+        if not isinstance(section, RelocationSection) or section['sh_link'] == 0:
+            continue
+
+        symtab = elffile.get_section(section['sh_link'])
+        for relocation in section.iter_relocations():
+            if relocation['r_info_type'] not in GOT_RELOCATION_TYPES or relocation['r_info_sym'] == 0:
+                continue
+            slots[relocation['r_offset']] = symtab.get_symbol(
+                relocation['r_info_sym']).name
+
+    return slots
+
+
+def _collect_function_symbols(elffile, functions):
+    for section in elffile.iter_sections():
+        if not isinstance(section, SymbolTableSection):
+            continue
+
+        for symbol in section.iter_symbols():
+            if symbol['st_info']['type'] not in FUNCTION_SYMBOL_TYPES:
+                continue
+            if symbol['st_shndx'] == 'SHN_UNDEF' or symbol['st_value'] == 0:
+                continue
+
+            value = symbol['st_value']
+            size, names = functions.get(value, (0, []))
+            if symbol.name not in names:
+                names.append(symbol.name)
+            functions[value] = (max(size, symbol['st_size']), names)
+
+
+def get_function_symbols(path):
+    '''
+    .symtab, .dynsym 및 분리된 디버그 파일의 함수 심볼을 수집.
+    반환값: 주소 순으로 정렬된 (addr, size, names) 리스트. 주소는 ELF 상의 VMA.
+    '''
+    functions = {}
+    with open(path, 'rb') as f:
+        elffile = ELFFile(f)
+        _collect_function_symbols(elffile, functions)
+        debug_file = find_debug_file(path, elffile)
+
+    if debug_file is not None:
+        with open(debug_file, 'rb') as f:
+            _collect_function_symbols(ELFFile(f), functions)
+
+    return sorted((addr, size, tuple(names))
+                  for addr, (size, names) in functions.items())
+
+
+def load_function_symbols(path):
+    return parse_cached('functions', path, get_function_symbols)
+
+
+def get_exported_functions(elffile):
+    '''
+    .dynsym 에 정의된 global, weak 함수 심볼의 {name: addr}. 주소는 ELF 상의 VMA.
+    같은 이름이 여러 버전으로 정의된 경우 기본 버전(name@@VERSION)을 사용.
+    '''
+    dynsym = elffile.get_section_by_name('.dynsym')
+    if not isinstance(dynsym, SymbolTableSection):
+        return {}
+    versym = elffile.get_section_by_name('.gnu.version')
+
+    exported = {}
+    for index, symbol in enumerate(dynsym.iter_symbols()):
+        if symbol['st_info']['type'] not in FUNCTION_SYMBOL_TYPES:
+            continue
+        if symbol['st_info']['bind'] not in EXPORTED_SYMBOL_BINDS:
+            continue
+        if symbol['st_shndx'] == 'SHN_UNDEF' or symbol['st_value'] == 0:
+            continue
+
+        # .gnu.version 의 인덱스에 0x8000 이 설정된 심볼은 기본 버전이 아님 (name@VERSION)
+        version = versym.get_symbol(index)['ndx'] if versym is not None else None
+        hidden = isinstance(version, int) and bool(version & 0x8000)
+        if symbol.name not in exported or not hidden:
+            exported[symbol.name] = symbol['st_value']
+    return exported
+
+
+def load_exported_functions(path):
+    return parse_cached('exported', path, lambda path: _parse_elf(path, get_exported_functions))
@@ -1,7 +1,7 @@
 #!/bin/bash
 
 if [ -z "$1" ]; then
-    echo "Warning: A PID must be provided as a parameter."
+    echo "Warning: A PID or a snapshot file must be provided as a parameter."
     exit 1
 fi
 
@@ -24,7 +24,12 @@ else
     fi
 fi
 
-export WORKLOAD_PID=$1
+# A snapshot file from capture_snapshot.sh is analyzed without attaching to the workload
+if [ -f "$1" ]; then
+    export SNAPSHOT_FILE=$1
+else
+    export WORKLOAD_PID=$1
+fi
 export LANGUAGE_TYPE=$2
 
 # xedlib
@@ -40,4 +45,8 @@ export PYTHONPATH=$PYTHONPATH:$(dirname "$3")
 export START_TIME=$(date +%s.%N)
 
 # Run GDB
-gdb -p $1 -x /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/gdb_script_exepath_tracking.py
+if [ ! -z "$SNAPSHOT_FILE" ]; then
+    gdb -batch -x /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/gdb_script_exepath_tracking.py
+else
+    gdb -p $1 -x /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/gdb_script_exepath_tracking.py
+fi
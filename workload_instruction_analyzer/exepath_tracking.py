@@ -0,0 +1,436 @@
+import time
+from collections import Counter
+
+import utils
+import xed_decoder
+import analysis_cache
+import call_graph
+import phase_tracer
+import symbol_index
+import plt_resolver
+from process_memory import MemoryReadError
+
+# glibc는 항상 TSX를 지원하도록 컴파일되지만 TSX는 애플리케이션을 실행하기 전에 환경 변수가 glibc.elision.enable=1로 설정된 경우에만 사용됨.
+# TSX를 사용하도록 환경변수가 설정되지 않았다면 glibc의 내부 함수에서 TSX를 사용하는 __GI___lll_lock_elision, __GI___lll_unlock_elision 를 트래킹에서 제외함.
+TSX_ENABLED_GLIBC_FUNCTIONS = [
+    '__GI___lll_lock_elision', '__GI___lll_unlock_elision']
+
+
+def format_address(address):
+    if isinstance(address, str):
+        address = int(address, 16)
+    return "0x{:016x}".format(address)
+
+
+class ExePathTracker:
+    '''
+    execution path tracking의 워크리스트를 처리.
+    memory는 read(addr, size)를 제공하는 객체(GdbMemory, SnapshotMemory)이며
+    GDB에 의존하지 않으므로 attach된 프로세스와 캡처된 스냅샷 모두에 사용할 수 있음.
+    '''
+
+    def __init__(self, memory, symbols, got_range,
+                 glibc_rtm_enable=False, cache=None):
+        self.memory = memory
+        self.symbols = symbols
+        self.got_range = got_range
+        self.glibc_rtm_enable = glibc_rtm_enable
+        # PLT 스텁, GOT 슬롯의 호출 대상 테이블
+        self.plt_resolver = plt_resolver.PltResolver(memory, symbols)
+        # 공유 객체별 함수 요약 캐시 (analysis_cache.AnalysisCache)
+        self.cache = cache
+
+        # 루트 함수 (삽입 순서를 유지하는 set 으로 사용)
+        self.roots = {}
+        self.tracking_functions = set()
+        self.list_tracking_functions = []
+        self.next_function = 0
+
+        self.graph = call_graph.CallGraph()
+        # ISA set -> 예시 인스트럭션 인코딩(hex), 어셈블리 문자열
+        self.isa_encodings = {}
+        self.isa_examples = {}
+        # ISA set -> 해당 ISA set의 인스트럭션이 있는 함수 수
+        self.isa_counts = Counter()
+
+        self.dis_time = 0
+
+        self.logging_functions = []
+        self.compile_indirect = []
+        self.runtime_indirect = []
+        self.call_regi = []
+        self.call_non_regi = []
+
+        # deadline에 도달했는지와 워커에 전달된 뒤 결과를 받지 못한 함수 (병렬 모드)
+        self.expired = False
+        self.untraced = []
+        # 공유 객체 -> 'traced' (함수 단위로 분석) / 'approximated' (.text 전체 ISA set으로 대체)
+        self.coverage = {}
+
+    def add_roots(self, addresses):
+        for address in addresses:
+            address = format_address(address)
+            self.roots[address] = None
+            if address not in self.tracking_functions:
+                self.tracking_functions.add(address)
+                self.list_tracking_functions.append(address)
+
+    def summarize(self, instructions, base):
+        '''
+        함수의 디코딩 결과를 캐시 가능한 요약으로 변환. 주소는 모두 base 기준 오프셋.
+        isa: ISA set별 첫 인스트럭션의 인코딩
+        edges: 트래킹할 호출 (종류, 목적지 오프셋)
+        indirect: 레지스터/메모리 간접 호출 (종류, 인스트럭션 오프셋)
+        '''
+        isa = {}
+        edges = []
+        indirect = []
+        xtest = False
+        tsx = False
+
+        for instruction in instructions:
+            iclass = instruction.iclass
+
+            if instruction.isa_set not in isa:
+                isa[instruction.isa_set] = instruction.raw.hex()
+
+            if instruction.category in xed_decoder.TRANSFER_CATEGORIES:
+                if instruction.branch_target is not None:
+                    target = instruction.branch_target
+                    if self.symbols.is_plt(target):
+                        edges.append(('plt', target - base))
+                    else:
+                        # 함수 내부로의 분기와 cold 함수는 제외
+                        target_names = self.symbols.function_at(target)
+                        if target_names and not any('.cold' in name for name in target_names):
+                            edges.append(('func', target - base))
+                elif instruction.mem_target is not None:
+                    if self.got_range and self.got_range[0] <= instruction.mem_target <= self.got_range[1]:
+                        edges.append(('got', instruction.mem_target - base))
+                # FIXME
+                else:
+                    kind = None
+                    if iclass.startswith('CALL') and instruction.flags & xed_decoder.RECORD_MEMOP:
+                        if instruction.flags & xed_decoder.RECORD_MEM_DISP:
+                            kind = 'compile'
+                        else:
+                            kind = 'runtime'
+                    indirect.append((kind, instruction.address - base))
+
+            if iclass == 'XTEST':
+                xtest = True
+            elif iclass in ['XBEGIN', 'XEND']:
+                tsx = True
+
+        return {'isa': isa, 'edges': edges, 'indirect': indirect, 'xtest': xtest, 'tsx': tsx}
+
+    def lookup_function(self, addr):
+        '''
+        함수의 범위와 공유 객체를 찾고 캐시를 조회.
+        반환값: (func_start, func_end, path, base, summary). 캐시에 없다면 summary는 None.
+        트래킹하지 않는 함수라면 None.
+        '''
+        func_range = self.symbols.function_range(int(addr, 16))
+        if func_range is None:
+            print(f'error: {addr}')
+            return None
+        func_start, func_end, func_names = func_range
+
+        self.logging_functions.append(func_names[0])
+
+        # tsx를 사용하는 glibc 내부 함수에 대해 처리
+        if not self.glibc_rtm_enable and any(name in TSX_ENABLED_GLIBC_FUNCTIONS for name in func_names):
+            return None
+
+        path, base = self.symbols.object_at(func_start)
+
+        summary = None
+        if self.cache is not None:
+            summary = self.cache.lookup(
+                analysis_cache.FUNCTION, path, func_start - base)
+
+        return func_start, func_end, path, base, summary
+
+    def decode_function(self, func_start, func_end, base):
+        try:
+            start_time = time.time()
+            # 함수 전체를 한 번의 메모리 읽기로 가져와 디코딩
+            code = self.memory.read(func_start, func_end - func_start)
+            instructions = xed_decoder.decode(code, func_start)
+            end_time = time.time()
+            self.dis_time += end_time - start_time
+            phase_tracer.count(phase_tracer.FUNCTIONS_DECODED)
+            phase_tracer.count(phase_tracer.DECODE_TIME, end_time - start_time)
+        except MemoryReadError:
+            print(f'error: {hex(func_start)}')
+            return None
+
+        return self.summarize(instructions, base)
+
+    def store_summary(self, path, func_start, base, summary):
+        if self.cache is not None:
+            self.cache.store(analysis_cache.FUNCTION,
+                             path, func_start - base, summary)
+
+    def dis_func(self, addr):
+        '''
+        함수의 요약과 요약의 오프셋 기준이 되는 load base를 반환.
+        캐시에 있는 함수는 메모리를 읽거나 디코딩하지 않음.
+        '''
+        function = self.lookup_function(addr)
+        if function is None:
+            return None
+        func_start, func_end, path, base, summary = function
+
+        if summary is None:
+            summary = self.decode_function(func_start, func_end, base)
+            if summary is None:
+                return None
+            self.store_summary(path, func_start, base, summary)
+
+        return summary, base
+
+    def address_calculation(self, is_func_call, target):
+        try:
+            if is_func_call == 'got':
+                address = self.plt_resolver.read_slot(target)
+            elif is_func_call == 'lea':
+                address = target
+                # lea로 할당된 주소가 .text 섹션이 아닌 경우
+                if not self.symbols.in_section(address, '.text'):
+                    return None
+            else:
+                address = target
+
+            # if address is not function start address
+            if is_func_call == 'plt':
+                address = self.plt_resolver.resolve(address)
+        except MemoryReadError:
+            return None
+
+        if address is None:
+            return None
+
+        return format_address(address)
+
+    def resolve_edges(self, summary, base):
+        '''
+        요약의 호출 간선을 (호출 대상 주소, 트래킹할 함수 주소 또는 None) 리스트로 변환.
+        '''
+        return [(base + offset, self.address_calculation(is_func_call, base + offset))
+                for is_func_call, offset in summary['edges']]
+
+    def add_result(self, function_address, summary, base, resolved):
+        '''
+        분석한 함수를 호출 그래프에 추가하고 새로 발견된 함수를 워크리스트에 추가.
+        '''
+        for isa_set, raw in summary['isa'].items():
+            self.isa_encodings.setdefault(isa_set, raw)
+        self.isa_counts.update(summary['isa'].keys())
+
+        flags = 0
+        if summary['xtest']:
+            flags |= call_graph.FLAG_XTEST
+        if summary['tsx']:
+            flags |= call_graph.FLAG_TSX
+        self.graph.add_node(function_address, summary['isa'], flags)
+        path, _ = self.symbols.object_at(int(function_address, 16))
+        self.coverage.setdefault(path, 'traced')
+
+        for kind, offset in summary['indirect']:
+            self.call_regi.append(base + offset)
+            if kind == 'compile':
+                self.compile_indirect.append(base + offset)
+            elif kind == 'runtime':
+                self.runtime_indirect.append(base + offset)
+
+        for target, dst_addr in resolved:
+            self.call_non_regi.append(target)
+
+            if dst_addr:
+                self.graph.add_edge(function_address, dst_addr)
+                if dst_addr not in self.tracking_functions:
+                    self.tracking_functions.add(dst_addr)
+                    self.list_tracking_functions.append(dst_addr)
+
+    def next_functions(self, deadline=None):
+        '''
+        아직 분석하지 않은 워크리스트의 함수를 순서대로(너비 우선) 반환. 순회 중에 추가된 함수도 포함.
+        deadline(time.time() 기준)에 도달하면 남은 함수를 두고 중단함.
+        '''
+        while self.next_function < len(self.list_tracking_functions):
+            if deadline is not None and time.time() >= deadline:
+                self.expired = True
+                return
+            function_address = self.list_tracking_functions[self.next_function]
+            self.next_function += 1
+            yield function_address
+
+    def run(self, deadline=None):
+        '''
+        워크리스트의 함수를 분석해 호출 그래프에 추가. 순회하는 중에도 새로 발견된 함수가 뒤에 추가되며
+        add_roots 이후 다시 호출하면 이미 요약된 함수는 건너뛰고 새 함수만 분석함.
+        deadline에 도달하면 남은 함수는 approximate()로 보수적으로 대체함.
+        '''
+        for function_address in self.next_functions(deadline):
+            result = self.dis_func(function_address)
+
+            if result is None:
+                continue
+            summary, base = result
+
+            # Calculate the target address in case of a transfer instruction
+            self.add_result(function_address, summary, base,
+                            self.resolve_edges(summary, base))
+
+        if self.expired:
+            self.approximate()
+
+    def untraced_functions(self):
+        return self.untraced + self.list_tracking_functions[self.next_function:]
+
+    def _scan_range(self, start, end, examples):
+        try:
+            code = self.memory.read(start, end - start)
+        except MemoryReadError:
+            print(f'error: {hex(start)}')
+            return
+        for isa_set, raw in xed_decoder.scan_isa_sets(code).items():
+            examples.setdefault(isa_set, raw.hex())
+
+    def scan_object(self, path):
+        '''
+        공유 객체의 .text 전체를 선형으로 디코딩한 ISA set.
+        isa: TSX를 사용하는 glibc 내부 함수를 제외한 ISA set, elision: 해당 함수들의 ISA set
+        '''
+        excluded = []
+        for name in TSX_ENABLED_GLIBC_FUNCTIONS:
+            start = self.symbols.find_function(name, path)
+            func_range = self.symbols.function_range(start) if start is not None else None
+            if func_range is not None:
+                excluded.append((func_range[0], func_range[1]))
+        excluded.sort()
+
+        isa = {}
+        elision = {}
+        for start, end, _ in self.symbols.section_ranges('.text', path):
+            for excluded_start, excluded_end in excluded:
+                if not start <= excluded_start < end:
+                    continue
+                self._scan_range(start, excluded_start, isa)
+                self._scan_range(excluded_start, min(excluded_end, end), elision)
+                start = min(excluded_end, end)
+            if start < end:
+                self._scan_range(start, end, isa)
+
+        return {'isa': isa, 'elision': elision}
+
+    def object_isa(self, path):
+        '''
+        공유 객체 전체의 (ISA set -> 인코딩, 플래그). 결과는 build-id 캐시에 저장.
+        '''
+        scan = None
+        if self.cache is not None:
+            scan = self.cache.lookup(analysis_cache.OBJECT_ISA, path)
+        if scan is None:
+            scan = self.scan_object(path)
+            if self.cache is not None:
+                self.cache.store(analysis_cache.OBJECT_ISA, path, 0, scan)
+
+        isa = dict(scan['isa'])
+        if self.glibc_rtm_enable:
+            for isa_set, raw in scan['elision'].items():
+                isa.setdefault(isa_set, raw)
+
+        # RTM ISA set은 XBEGIN, XEND, XTEST를 모두 포함하므로 보수적으로 두 플래그를 모두 설정
+        flags = 0
+        if 'RTM' in isa:
+            flags |= call_graph.FLAG_TSX | call_graph.FLAG_XTEST
+        return isa, flags
+
+    def approximate_object(self, path):
+        '''
+        공유 객체와 그 객체가 의존하는(DT_NEEDED) 공유 객체 전체의 ISA set을 나타내는 노드를 추가.
+        분석하지 못한 함수는 같은 객체의 코드나 PLT를 통해 의존하는 객체의 코드만 호출할 수 있음.
+        '''
+        node = f'object:{path}'
+        if node in self.graph:
+            return node
+
+        isa, flags = self.object_isa(path)
+        for isa_set, raw in isa.items():
+            self.isa_encodings.setdefault(isa_set, raw)
+        self.graph.add_node(node, isa.keys(), flags)
+        self.coverage[path] = 'approximated'
+
+        for dependency in self.symbols.dependencies(path):
+            self.graph.add_edge(node, self.approximate_object(dependency))
+        return node
+
+    def approximate(self):
+        '''
+        분석하지 못한 함수를 해당 공유 객체 전체의 ISA set으로 대체. (full scan과 같은 보수적인 결과)
+        '''
+        with phase_tracer.span('approximate'):
+            for function_address in self.untraced_functions():
+                path, _ = self.symbols.object_at(int(function_address, 16))
+                if path is None:
+                    continue
+                if function_address not in self.graph:
+                    self.graph.add_node(function_address, [])
+                self.graph.add_edge(function_address, self.approximate_object(path))
+
+    def coverage_summary(self):
+        approximated = sorted(path for path, status in self.coverage.items()
+                              if status == 'approximated')
+        traced = len(self.coverage) - len(approximated)
+        summary = f'traced objects: {traced}, approximated objects: {len(approximated)}'
+        if approximated:
+            summary += ' (' + ', '.join(approximated) + ')'
+        return summary
+
+    def isa_example(self, isa_set):
+        # SHORT는 ISA set별 첫 인스트럭션만 CSV에 기록되므로 ISA set마다 한 번만 어셈블리 문자열을 생성
+        if isa_set not in self.isa_examples:
+            self.isa_examples[isa_set] = xed_decoder.disassemble(
+                bytes.fromhex(self.isa_encodings[isa_set]))
+        return self.isa_examples[isa_set]
+
+    def aggregate(self, roots=None):
+        '''
+        루트에서 도달 가능한 함수들의 ISA set 합집합을 utils.IsaAggregator로 반환.
+        roots가 주어지면 추가된 루트 중 일부에서 도달 가능한 함수만 집계함. (ex. bytecode tracking 루트만)
+        '''
+        isa, _ = self.graph.reachable(self.roots if roots is None else roots)
+        aggregator = utils.IsaAggregator()
+        for isa_set in self.graph.isa_set_names(isa):
+            aggregator.add(isa_set, self.isa_example(isa_set), self.isa_counts[isa_set])
+        aggregator.objects = dict(self.coverage)
+        return aggregator
+
+    def tsx_flags(self, roots=None):
+        '''
+        루트에서 도달 가능한 함수들의 (is_tsx_run, xtest_enable).
+        '''
+        _, flags = self.graph.reachable(self.roots if roots is None else roots)
+        return bool(flags & call_graph.FLAG_TSX), bool(flags & call_graph.FLAG_XTEST)
+
+    @property
+    def xtest_enable(self):
+        return self.tsx_flags()[1]
+
+    @property
+    def is_tsx_run(self):
+        return self.tsx_flags()[0]
+
+
+def snapshot_tracker(snapshot, memory, cache=None):
+    '''
+    캡처된 스냅샷(process_memory.ProcessSnapshot)으로 GDB 없이 동작하는 tracker를 생성.
+    '''
+    symbols = symbol_index.SymbolIndex(
+        maps=snapshot.maps, bases=snapshot.bases)
+
+    return ExePathTracker(
+        memory, symbols, symbols.got_range(snapshot.exe),
+        glibc_rtm_enable=snapshot.glibc_rtm_enable, cache=cache)
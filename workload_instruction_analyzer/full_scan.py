@@ -0,0 +1,218 @@
+'''
+text-segment full scan의 선형 스윕. 메모리 소스(GdbMemory, SnapshotMemory, MappedFileMemory)와 무관하게 동작.
+
+FULL_SCAN_CHUNK_SIZE    한 번에 읽는 버퍼 크기 (bytes, 기본값 4MB)
+FULL_SCAN_SWEEP_WINDOW  capstone을 한 번 호출할 때 넘기는 크기 (bytes, 기본값 16KB)
+FULL_SCAN_PREFILTER=1   scan_prefilter로 후보 패턴이 있는 함수만 스윕하고 나머지는 기본 ISA로 간주
+'''
+
+import os
+import time
+
+import capstone
+import numpy as np
+
+import process_memory
+import analysis_cache
+import phase_tracer
+import scan_prefilter
+
+disassembler = capstone.Cs(capstone.CS_ARCH_X86, capstone.CS_MODE_64)
+SCAN_CHUNK_SIZE = int(os.getenv('FULL_SCAN_CHUNK_SIZE', str(4 * 1024 * 1024)))
+SWEEP_WINDOW = int(os.getenv('FULL_SCAN_SWEEP_WINDOW', str(16 * 1024)))
+MAX_INSTRUCTION_SIZE = 15
+PAGE_SIZE = 4096
+RDPKU = b'\x0f\x01\xee'
+PREFILTER = os.getenv('FULL_SCAN_PREFILTER', '0') == '1'
+ENDBR = {b'\xf3\x0f\x1e\xfa': 'endbr64', b'\xf3\x0f\x1e\xfb': 'endbr32'}
+
+
+def read_chunk(memory, addr, size):
+    '''
+    addr부터 최대 size 바이트를 읽음. 읽을 수 없는 페이지가 있으면 그 앞까지만 반환.
+    '''
+    try:
+        return memory.read(addr, size)
+    except process_memory.MemoryReadError:
+        pass
+
+    data = b''
+    while len(data) < size:
+        page_end = (addr + len(data)) // PAGE_SIZE * PAGE_SIZE + PAGE_SIZE
+        try:
+            data += memory.read(addr + len(data), min(page_end - addr, size) - len(data))
+        except process_memory.MemoryReadError:
+            break
+    return data
+
+
+def sweep(code, address, limit, seen, buffered_output):
+    '''
+    버퍼를 스트리밍 디코딩하고, 디코딩할 수 없는 바이트에서 다시 동기화.
+    limit 이후에서 시작하는 인스트럭션은 다음 버퍼에서 디코딩하며, 다음에 디코딩할 오프셋을 반환.
+    '''
+    # 쓰기 가능한 버퍼를 넘기면 capstone이 슬라이스를 복사하지 않음
+    view = memoryview(bytearray(code))
+    offset = 0
+    while offset < limit:
+        # cs_disasm은 넘긴 버퍼 전체를 한 번에 디코딩하므로 다시 동기화할 때 버퍼의 나머지를
+        # 반복해서 디코딩하지 않도록 SWEEP_WINDOW 단위로 넘김. 윈도우 끝에 걸친 인스트럭션은 다음 윈도우에서 디코딩
+        window_end = min(offset + SWEEP_WINDOW, len(code))
+        decode_limit = limit if window_end == len(code) else min(limit, window_end - MAX_INSTRUCTION_SIZE)
+        for addr, size, mnemonic, _ in disassembler.disasm_lite(view[offset:window_end], address + offset):
+            if addr - address >= decode_limit:
+                break
+
+            instruction = code[addr - address:addr - address + size]
+            if instruction not in seen:
+                buffered_output.append((addr, mnemonic, instruction.hex()))
+                seen.add(instruction)
+            offset = addr - address + size
+
+        if offset >= decode_limit:
+            continue
+        # capstone이 디코딩하지 못하는 rdpku는 직접 기록
+        if code.startswith(RDPKU, offset):
+            if RDPKU not in seen:
+                buffered_output.append((address + offset, 'rdpku', RDPKU.hex()))
+                seen.add(RDPKU)
+            offset += len(RDPKU)
+            continue
+        offset += 1
+
+    return offset
+
+
+def disas(memory, start_addr, end_addr, seen, buffered_output, read_end=None):
+    '''
+    [start_addr, end_addr)에서 시작하는 인스트럭션을 SCAN_CHUNK_SIZE 단위로 읽어 선형 스윕.
+    버퍼 경계에 걸친 인스트럭션은 다음 버퍼에서 디코딩하고, end_addr에 걸친 인스트럭션은 read_end까지 읽음.
+    end_addr 이후 처음 디코딩할 주소를 반환. (섹션을 나누어 스윕할 때 다음 청크와의 동기화에 사용)
+    '''
+    read_end = end_addr if read_end is None else read_end
+    current_addr = start_addr
+
+    while current_addr < end_addr:
+        # end_addr에 걸친 인스트럭션을 디코딩할 수 있을 만큼만 더 읽음
+        size = min(SCAN_CHUNK_SIZE, read_end - current_addr, end_addr + MAX_INSTRUCTION_SIZE - current_addr)
+        code = read_chunk(memory, current_addr, size)
+        if not code:
+            # 읽을 수 없는 페이지는 건너뜀
+            current_addr = current_addr // PAGE_SIZE * PAGE_SIZE + PAGE_SIZE
+            continue
+
+        final = current_addr + len(code) >= read_end
+        limit = len(code) if final else max(len(code) - MAX_INSTRUCTION_SIZE, 1)
+        limit = min(limit, end_addr - current_addr)
+        current_addr += sweep(code, current_addr, limit, seen, buffered_output)
+
+    return current_addr
+
+
+def report_throughput(name, size, scan_time):
+    phase_tracer.count(phase_tracer.BYTES_SCANNED, size)
+    print(f'{name}: {size / 1024 / 1024:.2f} MB, {scan_time:.3f} sec '
+          f'({size / 1024 / 1024 / max(scan_time, 1e-9):.1f} MB/s)')
+
+
+def find_candidates(memory, start_addr, end_addr, seen, buffered_output):
+    '''
+    섹션을 SCAN_CHUNK_SIZE 단위로 읽어 후보 패턴의 주소(np.uint64)를 반환.
+    ENDBR 인스트럭션은 디코딩하지 않고 buffered_output에 바로 기록.
+    '''
+    candidates = []
+    for addr in range(start_addr, end_addr, SCAN_CHUNK_SIZE):
+        size = min(SCAN_CHUNK_SIZE, end_addr - addr)
+        # 청크 경계에 걸친 패턴을 찾을 수 있도록 앞뒤로 더 읽음
+        head = min(scan_prefilter.LOOKBEHIND, addr - start_addr)
+        code = read_chunk(memory, addr - head, head + size + scan_prefilter.LOOKAHEAD)
+        offsets, endbrs = scan_prefilter.find_candidates(code)
+
+        offsets = offsets[(offsets >= head) & (offsets < head + size)]
+        candidates.append(offsets.astype(np.uint64) + np.uint64(addr - head))
+        for offset in endbrs[(endbrs >= head) & (endbrs < head + size)].tolist():
+            instruction = code[offset:offset + 4]
+            if instruction not in seen:
+                buffered_output.append((addr - head + offset, ENDBR[instruction], instruction.hex()))
+                seen.add(instruction)
+
+    return np.concatenate(candidates) if candidates else np.zeros(0, dtype=np.uint64)
+
+
+def prefilter_disas(memory, start_addr, end_addr, symbols, seen, buffered_output):
+    '''
+    후보 패턴을 포함하는 함수(심볼이 없으면 함수 사이의 구간)만 스윕. 디코딩한 바이트 수를 반환.
+    건너뛴 바이트가 있으면 기본 ISA의 대표 인코딩을 섹션 시작 주소로 buffered_output에 추가.
+    '''
+    path, _ = symbols.object_at(start_addr)
+    if path is None:
+        # 함수 심볼이 없는 익명 매핑은 전체를 스윕
+        disas(memory, start_addr, end_addr, seen, buffered_output)
+        return end_addr - start_addr
+
+    candidates = find_candidates(memory, start_addr, end_addr, seen, buffered_output)
+    starts, ends = symbols.function_ranges(path)
+    ranges = scan_prefilter.decode_ranges(starts, ends, start_addr, end_addr, candidates)
+    for range_start, range_end in ranges:
+        # 함수 끝에 걸친 인스트럭션은 섹션 끝까지 읽을 수 있음
+        disas(memory, range_start, range_end, seen, buffered_output, read_end=end_addr)
+
+    decoded = sum(range_end - range_start for range_start, range_end in ranges)
+    if decoded < end_addr - start_addr:
+        for instruction, mnemonic in scan_prefilter.BASELINE_ENCODINGS.items():
+            if instruction not in seen:
+                buffered_output.append((start_addr, mnemonic, instruction.hex()))
+                seen.add(instruction)
+    return decoded
+
+
+def report_prefilter(name, size, decoded):
+    phase_tracer.count(phase_tracer.BYTES_SKIPPED, size - decoded)
+    print(f'{name}: decoded {decoded / 1024 / 1024:.2f} MB, skipped {(size - decoded) / 1024 / 1024:.2f} MB '
+          f'({(size - decoded) / max(size, 1) * 100:.1f}% skipped)')
+
+
+def lookup_section(start_addr, symbols, cache, kind=analysis_cache.SCAN):
+    '''
+    build-id가 같은 공유 객체에서 캐시된 섹션의 스캔 결과를 현재 load base로 rebase 하여 반환. 없으면 None.
+    '''
+    path, base = symbols.object_at(start_addr)
+    if cache is None or path is None:
+        return None
+
+    cached = cache.lookup(kind, path, start_addr - base)
+    if cached is None:
+        return None
+    return [(base + addr, mnemonic, instruction_hex) for addr, mnemonic, instruction_hex in cached]
+
+
+def store_section(start_addr, section_output, symbols, cache, kind=analysis_cache.SCAN):
+    path, base = symbols.object_at(start_addr)
+    if cache is None or path is None:
+        return
+
+    cache.store(kind, path, start_addr - base,
+                [(addr - base, mnemonic, instruction_hex) for addr, mnemonic, instruction_hex in section_output])
+
+
+def scan_section(memory, start_addr, end_addr, name, symbols, cache, prefilter=PREFILTER):
+    '''
+    섹션에서 처음 등장하는 인코딩을 (address, mnemonic, hex) 리스트로 반환.
+    prefilter면 후보 패턴이 없는 함수의 인코딩은 포함되지 않으므로 캐시도 따로 저장.
+    '''
+    kind = analysis_cache.PREFILTER_SCAN if prefilter else analysis_cache.SCAN
+    cached = lookup_section(start_addr, symbols, cache, kind)
+    if cached is not None:
+        return cached
+
+    scan_start = time.time()
+    section_output = []
+    if prefilter:
+        decoded = prefilter_disas(memory, start_addr, end_addr, symbols, set(), section_output)
+        report_prefilter(name, end_addr - start_addr, decoded)
+    else:
+        disas(memory, start_addr, end_addr, set(), section_output)
+    report_throughput(name, end_addr - start_addr, time.time() - scan_start)
+
+    store_section(start_addr, section_output, symbols, cache, kind)
+    return section_output
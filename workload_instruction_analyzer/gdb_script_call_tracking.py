@@ -1,13 +1,18 @@
 import gdb
 from collections import OrderedDict
-import time
+from pathlib import Path
 
 import sys
 import io
 
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import phase_tracer
+
 check = False
 
 def step_instruction():
+    phase_tracer.count(phase_tracer.GDB_COMMANDS)
     try:
         gdb.execute("stepi", to_string=True)
     except gdb.error as e:
@@ -19,6 +24,7 @@ def is_register_call():
 
     transfer_instructions = set(('call', 'jmp', 'ja', 'jnbe', 'jae', 'jnb', 'jb', 'jnae', 'jbe', 'jna', 'jc', 'je', 'jz', 'jnc', 'jne', 'jnz', 
     'jnp', 'jpo', 'jp', 'jpe', 'jcxz', 'jecxz', 'jg', 'jnle', 'jge', 'jnl', 'jl', 'jnge', 'jle', 'jng', 'jno', 'jns', 'jo', 'js'))
+    phase_tracer.count(phase_tracer.GDB_COMMANDS)
     try:
         result = gdb.execute("x/i $pc", to_string=True)
     except gdb.error as e:
@@ -52,6 +58,7 @@ def tracking():
     gdb.execute(f"continue")
 
     while(True):
+        phase_tracer.count(phase_tracer.GDB_COMMANDS)
         try:
             disas_result = gdb.execute(f"disas", to_string=True)
             lines = disas_result.split('\n')
@@ -85,12 +92,10 @@ def tracking():
     print(len(registers))
 
 if __name__ == '__main__':
-    start_time = time.time()
     gdb.execute("set pagination off")
 
-    tracking()
-
-    end_time = time.time()
-    total_time = end_time - start_time
+    with phase_tracer.span('call_tracking') as span:
+        tracking()
 
-    print(f'time: {total_time}')
\ No newline at end of file
+    print(f'time: {span.wall}')
+    print(phase_tracer.finish())
\ No newline at end of file
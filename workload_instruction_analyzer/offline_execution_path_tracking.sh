@@ -0,0 +1,30 @@
+#!/bin/bash
+
+# Check if the first parameter is provided
+if [ -z "$1" ]; then
+    echo "Warning: A PID or a snapshot file must be provided as a parameter."
+    exit 1
+fi
+
+# A snapshot file from capture_snapshot.sh can be analyzed without the workload
+if [ -f "$1" ]; then
+    export SNAPSHOT_FILE=$1
+else
+    export WORKLOAD_PID=$1
+fi
+
+# Optional: number of worker processes (functions are partitioned by shared object)
+if [ ! -z "$2" ]; then
+    export EPT_WORKERS=$2
+fi
+
+# Optional: time budget in seconds (untraced objects are approximated by their whole .text ISA set)
+if [ ! -z "$3" ]; then
+    export EPT_DEADLINE=$3
+fi
+
+# xedlib
+export LD_LIBRARY_PATH=/home/ubuntu/xed/obj:$LD_LIBRARY_PATH
+
+# Run without GDB (the workload is only stopped while its maps and GOT are captured)
+python3 /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/offline_exepath_tracking.py
@@ -0,0 +1,106 @@
+'''
+프로세스를 잠깐 멈춰 maps, GOT, 환경 변수만 캡처한 뒤 GDB 없이 디스크의 ELF 파일로 execution path tracking을 수행.
+워크로드는 캡처 직후 재개되므로 분석 시간 동안 멈추지 않음.
+
+SNAPSHOT_FILE           capture_snapshot.py 로 저장한 스냅샷 파일. 설정되면 프로세스에 접근하지 않고 스냅샷으로 분석
+EPT_DEADLINE            분석 시간 제한 (sec, 스크립트 시작 기준). 초과하면 남은 함수의 공유 객체는
+                        .text 전체의 ISA set으로 근사하며 결과에 근사된 공유 객체를 표시함
+'''
+
+import os
+import time
+
+import process_memory
+import exepath_tracking
+import parallel_exepath_tracking
+import analysis_cache
+import phase_tracer
+
+
+def tracking(snapshot, workers=1, source='snapshot', deadline=None):
+    cache = analysis_cache.get_cache()
+    if workers > 1:
+        parallel = parallel_exepath_tracking.ParallelExePathTracker(
+            snapshot, workers, source, cache)
+        tracker, memory = parallel.tracker, None
+    else:
+        memory = parallel_exepath_tracking.create_memory(snapshot, source)
+        tracker = exepath_tracking.snapshot_tracker(snapshot, memory, cache)
+
+    # search the starting point of tracking
+    start_addr = tracker.symbols.find_function('main', snapshot.exe)
+    if start_addr is None:
+        # 이전 실행의 CSV가 이번 결과로 사용되지 않도록 결과를 기록하지 않고 종료
+        if memory is not None:
+            memory.close()
+        raise LookupError(f'main not found in {snapshot.exe}')
+
+    tracker.add_roots([start_addr])
+    if workers > 1:
+        parallel.run(deadline)
+    else:
+        try:
+            tracker.run(deadline)
+        finally:
+            memory.close()
+
+    tracker.aggregate().write(tracker.is_tsx_run, tracker.xtest_enable)
+    return tracker
+
+
+if __name__ == '__main__':
+    start_time = time.time()
+
+    # 쉘 스크립트에서 전달된 workload PID 가져오기
+    PID = int(os.getenv('WORKLOAD_PID', '0'))
+    # 1보다 크면 공유 객체 단위로 나눈 워커 프로세스에서 병렬로 분석
+    WORKERS = int(os.getenv('EPT_WORKERS', '1'))
+    MEMORY_SOURCE = os.getenv('EPT_MEMORY', 'snapshot')
+    DEADLINE = float(os.getenv('EPT_DEADLINE', '0'))
+    SNAPSHOT_FILE = os.getenv('SNAPSHOT_FILE')
+
+    with phase_tracer.span('capture') as capture_span:
+        if SNAPSHOT_FILE:
+            snapshot = process_memory.load_snapshot(SNAPSHOT_FILE)
+            # 실행 중인 프로세스가 없으므로 /proc/PID/mem 은 사용할 수 없음
+            MEMORY_SOURCE = 'snapshot'
+            for path in snapshot.stale_objects():
+                print(f'warning: {path} has changed since the snapshot was captured')
+            if not snapshot.consistent:
+                print(f'warning: {SNAPSHOT_FILE} was captured while the workload was not fully stopped')
+        else:
+            snapshot = process_memory.capture_process(PID)
+    capture_time = capture_span.wall
+
+    with phase_tracer.span('exepath_tracking', workers=WORKERS, source=MEMORY_SOURCE) as analysis_span:
+        tracker = tracking(snapshot, WORKERS, MEMORY_SOURCE,
+                           start_time + DEADLINE if DEADLINE > 0 else None)
+    analysis_time = analysis_span.wall
+
+    end_time = time.time()
+    total_time = end_time - start_time
+    tracking_time = analysis_time - tracker.dis_time
+
+    print(f'tracked function count: {len(tracker.tracking_functions)}')
+    print(f"workload freeze time: {snapshot.freeze_time:.6f} sec")
+    print(f"capture time: {capture_time:.6f} sec")
+    if WORKERS > 1:
+        # 워커의 디코딩 시간은 병렬로 진행되므로 합계와 실제 분석 시간을 따로 출력
+        print(f"workers: {WORKERS} ({MEMORY_SOURCE})")
+        print(f"disassemble time (sum over workers): {tracker.dis_time:.6f} sec")
+        print(f"exe path tracking time (wall): {analysis_time:.6f} sec")
+    else:
+        print(f"disassemble time: {tracker.dis_time:.6f} sec")
+        print(f"exe path tracking time: {tracking_time:.6f} sec")
+    print(f"total time: {total_time:.6f} sec")
+    print(tracker.coverage_summary())
+
+    print(f'compile_indirect: {len(tracker.compile_indirect)}')
+    print(f'runtime_indirect: {len(tracker.runtime_indirect)}')
+    print(f'call_regi: {len(tracker.call_regi)}')
+    print(f"call_non_regi: {len(tracker.call_non_regi)}")
+
+    cache_summary = analysis_cache.close_cache()
+    if cache_summary:
+        print(cache_summary)
+    print(phase_tracer.finish())
@@ -0,0 +1,176 @@
+'''
+공유 객체 단위로 나눈 프로세스 풀에서 함수 디코딩과 호출 대상 계산을 병렬로 수행하는 execution path tracking.
+각 워커는 배정된 공유 객체의 함수만 디코딩하므로 심볼 테이블도 해당 객체의 것만 로드함.
+다른 공유 객체로의 호출은 중앙 워크리스트를 거쳐 그 객체를 담당하는 워커로 전달됨.
+'''
+
+import multiprocessing
+import queue
+import time
+
+import process_memory
+import exepath_tracking
+
+# 워커에 한 번에 전달하는 함수 수
+BATCH_SIZE = 64
+
+# 코드를 읽는 위치
+# snapshot: 캡처된 GOT와 디스크의 ELF 파일, proc: /proc/PID/mem
+MEMORY_SOURCES = ('snapshot', 'proc')
+
+
+def create_memory(snapshot, source):
+    if source == 'proc':
+        return process_memory.ProcMemory(snapshot.pid)
+    return process_memory.SnapshotMemory(snapshot)
+
+
+def _worker(snapshot, source, tasks, results):
+    memory = create_memory(snapshot, source)
+    tracker = exepath_tracking.snapshot_tracker(snapshot, memory)
+
+    try:
+        while True:
+            batch = tasks.get()
+            if batch is None:
+                break
+
+            analyzed = []
+            for function_address, func_start, func_end, path, base in batch:
+                summary = tracker.decode_function(func_start, func_end, base)
+                resolved = None
+                if summary is not None:
+                    resolved = tracker.resolve_edges(summary, base)
+                analyzed.append(
+                    (function_address, func_start, path, base, summary, resolved))
+
+            results.put((analyzed, tracker.dis_time))
+            tracker.dis_time = 0
+    finally:
+        memory.close()
+
+
+class ParallelExePathTracker:
+    '''
+    워크리스트, 캐시, 호출 그래프는 중앙의 ExePathTracker가 관리하고
+    캐시에 없는 함수의 디코딩과 호출 대상 계산만 워커에서 수행.
+    '''
+
+    def __init__(self, snapshot, workers, source='snapshot', cache=None):
+        self.snapshot = snapshot
+        self.workers = workers
+        self.source = source
+
+        self.memory = create_memory(snapshot, source)
+        self.tracker = exepath_tracking.snapshot_tracker(
+            snapshot, self.memory, cache)
+        self.assignment = self.partition()
+
+    def partition(self):
+        '''
+        .text 크기가 큰 공유 객체부터 가장 적게 배정된 워커에 배정.
+        '''
+        sizes = {}
+        for start, end, path in self.tracker.symbols.section_ranges('.text'):
+            sizes[path] = sizes.get(path, 0) + end - start
+
+        loads = [0] * self.workers
+        assignment = {}
+        for path, size in sorted(sizes.items(), key=lambda item: -item[1]):
+            worker = loads.index(min(loads))
+            assignment[path] = worker
+            loads[worker] += size
+        return assignment
+
+    def _wait_result(self, results, processes, deadline=None):
+        '''
+        워커의 결과를 기다림. deadline에 도달하면 None.
+        '''
+        while True:
+            timeout = 1
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.time())
+                if timeout <= 0:
+                    return None
+            try:
+                return results.get(timeout=timeout)
+            except queue.Empty:
+                if not all(process.is_alive() for process in processes):
+                    raise RuntimeError('exepath tracking worker exited unexpectedly')
+
+    def run(self, deadline=None):
+        tracker = self.tracker
+
+        context = multiprocessing.get_context('fork')
+        tasks = [context.Queue() for _ in range(self.workers)]
+        results = context.Queue()
+        processes = [context.Process(target=_worker, args=(self.snapshot, self.source, tasks[i], results),
+                                     daemon=True)
+                     for i in range(self.workers)]
+        for process in processes:
+            process.start()
+
+        in_flight = 0
+        # 워커에 전달했지만 아직 결과를 받지 못한 함수
+        dispatched = {}
+        try:
+            while True:
+                batches = {}
+                for function_address in tracker.next_functions(deadline):
+                    function = tracker.lookup_function(function_address)
+                    if function is None:
+                        continue
+                    func_start, func_end, path, base, summary = function
+
+                    # 캐시된 함수는 중앙에서 바로 처리
+                    if summary is not None:
+                        tracker.add_result(function_address, summary, base,
+                                           tracker.resolve_edges(summary, base))
+                        continue
+
+                    worker = self.assignment.get(path, hash(path) % self.workers)
+                    batches.setdefault(worker, []).append(
+                        (function_address, func_start, func_end, path, base))
+                    dispatched[function_address] = None
+
+                for worker, batch in batches.items():
+                    for i in range(0, len(batch), BATCH_SIZE):
+                        tasks[worker].put(batch[i:i + BATCH_SIZE])
+                        in_flight += 1
+
+                if in_flight == 0 or tracker.expired:
+                    break
+
+                result = self._wait_result(results, processes, deadline)
+                if result is None:
+                    tracker.expired = True
+                    break
+                analyzed, dis_time = result
+                in_flight -= 1
+                # 워커별 디코딩 시간의 합
+                tracker.dis_time += dis_time
+
+                for function_address, func_start, path, base, summary, resolved in analyzed:
+                    dispatched.pop(function_address, None)
+                    if summary is None:
+                        continue
+                    tracker.store_summary(path, func_start, base, summary)
+                    tracker.add_result(function_address, summary, base, resolved)
+
+            if tracker.expired:
+                # 결과를 받지 못한 함수도 근사 대상에 포함하고 분석 중인 워커는 기다리지 않음
+                tracker.untraced.extend(dispatched)
+                for process in processes:
+                    process.terminate()
+                # 종료된 워커가 읽지 않은 작업 때문에 종료 시 큐의 flush를 기다리지 않도록 함
+                for task in tasks:
+                    task.cancel_join_thread()
+                tracker.approximate()
+        finally:
+            for task in tasks:
+                task.put(None)
+            for process in processes:
+                process.join()
+            self.memory.close()
+
+        return tracker
@@ -0,0 +1,164 @@
+'''
+.text 섹션을 청크로 나누어 워커 프로세스에서 스윕하는 병렬 full scan.
+워커는 GDB나 프로세스에 접근하지 않고 파일 매핑(MappedFileMemory)에서 읽으며,
+결과는 섹션별로 청크 순서대로 합쳐 순차 스캔과 같은 결과를 만듦.
+
+FULL_SCAN_WORKERS       워커 프로세스 수 (기본값 1, 1이면 순차 스캔)
+FULL_SCAN_TASK_SIZE     워커에 전달하는 청크 크기 (bytes, 기본값 1MB)
+FULL_SCAN_SPEEDUP       워커 수 리스트 (ex. 2,4,8). 설정되면 스캔 후 같은 섹션을 순차 스윕(wall(1))과 워커 수별 병렬 스윕
+                        (wall(N))으로 다시 측정해 wall(1)/wall(N)을 출력
+'''
+
+import multiprocessing
+import os
+import time
+
+import process_memory
+import full_scan
+import phase_tracer
+
+TASK_SIZE = int(os.getenv('FULL_SCAN_TASK_SIZE', str(1024 * 1024)))
+SPEEDUP_WORKERS = [int(workers) for workers in os.getenv('FULL_SCAN_SPEEDUP', '').split(',') if workers.strip()]
+# 청크의 앞부분을 이전 청크와 겹쳐 디코딩해 인스트럭션 경계를 맞춤
+OVERLAP = 256
+
+_memory = None
+
+
+def _init_worker(maps):
+    global _memory
+
+    _memory = process_memory.MappedFileMemory(maps)
+
+
+def _scan_chunk(task):
+    '''
+    청크 [start, end)에서 시작하는 인스트럭션을 스윕.
+    섹션의 첫 청크가 아니면 start 이전 OVERLAP 바이트부터 디코딩해 찾은 start 이후의 첫 경계에서 시작.
+    '''
+    section, index, start, end, section_start, section_end = task
+    # 워커 수가 CPU 수보다 많아도 처리량이 부풀려지지 않도록 CPU time으로 측정
+    scan_start = time.process_time()
+
+    begin = start
+    if start != section_start:
+        begin = full_scan.disas(_memory, max(section_start, start - OVERLAP), start, set(), [],
+                                read_end=section_end)
+
+    output = []
+    boundary = full_scan.disas(_memory, begin, end, set(), output, read_end=section_end)
+    return section, (index, end, begin, boundary, output), time.process_time() - scan_start
+
+
+def split_section(section, start, end):
+    return [(section, index, chunk_start, min(chunk_start + TASK_SIZE, end), start, end)
+            for index, chunk_start in enumerate(range(start, end, TASK_SIZE))]
+
+
+def merge_chunks(memory, chunks, section_start, section_end):
+    '''
+    (index, end, begin, boundary, output) 청크 결과를 순서대로 합침.
+    이전 청크가 끝난 경계와 청크의 시작 경계가 다르면 (겹친 구간에서 동기화 실패) 해당 청크를 이전 경계부터 다시 스윕.
+    반환값은 (섹션의 스캔 결과, 다시 스윕한 청크 수).
+    '''
+    seen = set()
+    section_output = []
+    resyncs = 0
+    expected = section_start
+    for _, chunk_end, begin, boundary, output in sorted(chunks, key=lambda chunk: chunk[0]):
+        if begin != expected:
+            resyncs += 1
+            output = []
+            boundary = full_scan.disas(memory, expected, chunk_end, set(), output, read_end=section_end)
+        expected = boundary
+
+        for addr, mnemonic, instruction_hex in output:
+            if instruction_hex not in seen:
+                section_output.append((addr, mnemonic, instruction_hex))
+                seen.add(instruction_hex)
+
+    return section_output, resyncs
+
+
+def _sweep_wall_time(maps, tasks, workers):
+    '''
+    tasks의 섹션을 스윕하는 wall time. workers가 1이면 청크로 나누지 않고 현재 프로세스에서 섹션 단위로 순차 스윕.
+    '''
+    scan_start = time.time()
+    if workers == 1:
+        memory = process_memory.MappedFileMemory(maps)
+        for section_start, section_end in sorted({(task[4], task[5]) for task in tasks}):
+            full_scan.disas(memory, section_start, section_end, set(), [])
+        memory.close()
+    else:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(workers, initializer=_init_worker, initargs=(maps,)) as pool:
+            for _ in pool.imap_unordered(_scan_chunk, tasks):
+                pass
+    return time.time() - scan_start
+
+
+def report_speedup(maps, tasks, worker_counts):
+    '''
+    워커 수별 wall time을 측정해 순차 스윕 대비 speedup (wall(1)/wall(N))을 출력.
+    '''
+    wall_times = {workers: _sweep_wall_time(maps, tasks, workers)
+                  for workers in sorted(set(worker_counts) | {1})}
+    for workers, wall_time in wall_times.items():
+        print(f'full scan speedup: workers {workers}, wall {wall_time:.3f} sec, '
+              f'speedup {wall_times[1] / max(wall_time, 1e-9):.2f}x')
+
+
+def scan_sections(memory, maps, sections, symbols, cache, workers):
+    '''
+    섹션별 스캔 결과 리스트를 sections 순서로 반환.
+    캐시된 섹션과 파일 매핑이 아닌 섹션은 현재 프로세스에서 순차로 스캔.
+    '''
+    file_memory = process_memory.MappedFileMemory(maps)
+    outputs = [None] * len(sections)
+
+    tasks = []
+    for section, (start_addr, end_addr, name) in enumerate(sections):
+        cached = full_scan.lookup_section(start_addr, symbols, cache)
+        if cached is not None:
+            outputs[section] = cached
+        elif not file_memory.is_mapped(start_addr, end_addr - start_addr):
+            outputs[section] = full_scan.scan_section(memory, start_addr, end_addr, name, symbols, cache)
+        else:
+            tasks.extend(split_section(section, start_addr, end_addr))
+    file_memory.close()
+
+    # 큰 섹션의 청크부터 분배해 마지막에 큰 섹션만 남지 않도록 함
+    tasks.sort(key=lambda task: task[4] - task[5])
+
+    scan_start = time.time()
+    # section -> [(index, end, begin, boundary, output)]
+    chunks = {}
+    scan_times = {}
+    if tasks:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(workers, initializer=_init_worker, initargs=(maps,)) as pool:
+            for section, chunk, scan_time in pool.imap_unordered(_scan_chunk, tasks):
+                chunks.setdefault(section, []).append(chunk)
+                scan_times[section] = scan_times.get(section, 0) + scan_time
+    wall_time = time.time() - scan_start
+
+    total_resyncs = 0
+    for section, section_chunks in chunks.items():
+        start_addr, end_addr, name = sections[section]
+        outputs[section], resyncs = merge_chunks(memory, section_chunks, start_addr, end_addr)
+        total_resyncs += resyncs
+
+        # 섹션의 처리량은 워커들이 스윕에 사용한 CPU time의 합 기준
+        full_scan.report_throughput(name, end_addr - start_addr, scan_times[section])
+        full_scan.store_section(start_addr, outputs[section], symbols, cache)
+
+    scan_time = sum(scan_times.values())
+    phase_tracer.count(phase_tracer.RESYNCS, total_resyncs)
+    print(f'full scan workers: {workers}, chunks: {len(tasks)}, resyncs: {total_resyncs}')
+    # 동시에 스윕한 평균 워커 수 (병렬 효율). 순차 스캔 대비 speedup은 FULL_SCAN_SPEEDUP으로 측정
+    print(f'sweep cpu time (sum over workers): {scan_time:.3f} sec, wall: {wall_time:.3f} sec, '
+          f'cpu/wall: {scan_time / max(wall_time, 1e-9):.2f}x')
+    if SPEEDUP_WORKERS and tasks:
+        report_speedup(maps, tasks, SPEEDUP_WORKERS)
+    return outputs
@@ -0,0 +1,234 @@
+'''
+분석 단계(span)별 wall time, CPU time, peak RSS와 카운터를 기록하는 tracer.
+span은 중첩할 수 있으며 카운터는 가장 안쪽의 span에 기록됨.
+전역 타이머 변수와 psutil 폴링 스레드 대신 모든 분석 스크립트에서 사용.
+
+PHASE_TRACE             Chrome trace(JSON) 저장 경로. chrome://tracing, Perfetto에서 열 수 있음
+
+카운터 이름
+functions_decoded       디코딩한 함수 수
+decode_time             함수를 읽고 디코딩하는 데 걸린 시간 (sec)
+xed_calls               XED 디코딩 호출 수 (decode_buffer)
+instructions_decoded    XED로 디코딩한 인스트럭션 수
+gdb_commands            GDB 명령/메모리 읽기 수
+bytes_scanned           full scan에서 스윕한 .text 바이트 수
+resyncs                 병렬 full scan에서 청크 경계가 맞지 않아 다시 스윕한 청크 수
+bytes_skipped           full scan prefilter가 후보 패턴이 없어 디코딩하지 않은 .text 바이트 수
+cache_hits, cache_misses
+call_map_hits           bytecode tracking에서 call map 캐시로 파싱을 생략한 모듈 수
+call_map_misses         bytecode tracking에서 .pyc를 파싱한 모듈 수
+module_index_dirs_read  모듈 인덱스를 만들면서 목록을 새로 읽은 디렉토리 수 (mtime이 바뀌었거나 저장되지 않은 디렉토리)
+'''
+
+import json
+import os
+import resource
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+FUNCTIONS_DECODED = 'functions_decoded'
+DECODE_TIME = 'decode_time'
+XED_CALLS = 'xed_calls'
+INSTRUCTIONS_DECODED = 'instructions_decoded'
+GDB_COMMANDS = 'gdb_commands'
+BYTES_SCANNED = 'bytes_scanned'
+RESYNCS = 'resyncs'
+BYTES_SKIPPED = 'bytes_skipped'
+CACHE_HITS = 'cache_hits'
+CACHE_MISSES = 'cache_misses'
+CALL_MAP_HITS = 'call_map_hits'
+CALL_MAP_MISSES = 'call_map_misses'
+MODULE_INDEX_DIRS_READ = 'module_index_dirs_read'
+
+
+def read_peak_rss():
+    '''
+    프로세스의 peak RSS (bytes). /proc/self/status 의 VmHWM, 없으면 getrusage.
+    '''
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def read_rss():
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return 0
+
+
+def reset_peak_rss():
+    '''
+    VmHWM을 현재 RSS로 초기화 (Linux 4.0 이상). 실패하면 False.
+    '''
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class Span:
+    def __init__(self, name, parent, args):
+        self.name = name
+        self.parent = parent
+        self.args = args
+        self.counters = Counter()
+
+        self.start = time.time()
+        self.cpu_start = time.process_time()
+        self.rss_start = read_rss()
+        self.end = None
+        self.cpu_end = None
+        # 하위 span의 peak을 포함한 peak RSS
+        self.peak_rss = self.rss_start
+
+    @property
+    def wall(self):
+        return (self.end if self.end is not None else time.time()) - self.start
+
+    @property
+    def cpu(self):
+        return (self.cpu_end if self.cpu_end is not None else time.process_time()) - self.cpu_start
+
+    @property
+    def peak_rss_delta(self):
+        '''
+        span 동안 추가로 사용된 최대 메모리 (bytes).
+        '''
+        return max(self.peak_rss - self.rss_start, 0)
+
+
+class PhaseTracer:
+    def __init__(self):
+        self.origin = time.time()
+        self.spans = []
+        self.stack = []
+        self.totals = Counter()
+        # VmHWM을 초기화할 수 없다면 프로세스 전체의 peak을 사용
+        self.resettable = None
+
+    def _sample_peak(self):
+        if self.stack:
+            current = self.stack[-1]
+            current.peak_rss = max(current.peak_rss, read_peak_rss())
+
+    @contextmanager
+    def span(self, name, **args):
+        # 하위 span을 시작하기 전까지의 peak을 현재 span에 반영한 뒤 초기화
+        self._sample_peak()
+        if self.resettable is None or self.resettable:
+            self.resettable = reset_peak_rss()
+
+        span = Span(name, self.stack[-1] if self.stack else None, args)
+        self.spans.append(span)
+        self.stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = time.time()
+            span.cpu_end = time.process_time()
+            span.peak_rss = max(span.peak_rss, read_peak_rss())
+            self.stack.pop()
+            if span.parent is not None:
+                span.parent.peak_rss = max(span.parent.peak_rss, span.peak_rss)
+
+    def count(self, name, value=1):
+        if self.stack:
+            self.stack[-1].counters[name] += value
+        self.totals[name] += value
+
+    def time(self, name):
+        '''
+        이름이 name인 span들의 wall time 합계.
+        '''
+        return sum(span.wall for span in self.spans if span.name == name)
+
+    def find(self, name):
+        for span in self.spans:
+            if span.name == name:
+                return span
+        return None
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        tid = threading.get_ident()
+
+        events = []
+        for span in self.spans:
+            args = dict(span.args)
+            args['cpu_sec'] = round(span.cpu, 6)
+            args['peak_rss_mb'] = round(span.peak_rss / 1024 / 1024, 2)
+            args['peak_rss_delta_mb'] = round(span.peak_rss_delta / 1024 / 1024, 2)
+            args.update(span.counters)
+            events.append({'name': span.name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                           'ts': (span.start - self.origin) * 1e6, 'dur': span.wall * 1e6,
+                           'args': args})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+    def summary(self):
+        '''
+        최상위 span별 시간과 전체 카운터를 한 줄로 요약.
+        '''
+        roots = [span for span in self.spans if span.parent is None]
+        phases = ' | '.join(
+            f'{span.name} {span.wall:.3f}s (cpu {span.cpu:.3f}s, +{span.peak_rss_delta / 1024 / 1024:.1f}MB)'
+            for span in roots)
+        counters = ', '.join(f'{name}={value:g}' for name, value in sorted(self.totals.items()))
+        # VmHWM이 초기화되었다면 이전 span의 peak도 함께 비교
+        peak = max([read_peak_rss()] + [span.peak_rss for span in roots])
+        return f'phases: {phases or "none"} | peak rss {peak / 1024 / 1024:.1f}MB | {counters or "no counters"}'
+
+
+_tracer = None
+
+
+def get_tracer():
+    global _tracer
+
+    if _tracer is None:
+        _tracer = PhaseTracer()
+    return _tracer
+
+
+def reset():
+    '''
+    새 tracer로 교체하고 이전 tracer를 반환. (한 프로세스에서 여러 분석을 수행하는 analysis_daemon.py 에서 요청마다 사용)
+    '''
+    global _tracer
+
+    tracer = get_tracer()
+    _tracer = PhaseTracer()
+    return tracer
+
+
+def span(name, **args):
+    return get_tracer().span(name, **args)
+
+
+def count(name, value=1):
+    get_tracer().count(name, value)
+
+
+def finish():
+    '''
+    PHASE_TRACE가 설정되어 있으면 Chrome trace를 저장하고 요약을 반환.
+    '''
+    tracer = get_tracer()
+    trace_path = os.getenv('PHASE_TRACE')
+    if trace_path:
+        tracer.export_chrome_trace(trace_path)
+    return tracer.summary()
@@ -0,0 +1,113 @@
+'''
+PLT 스텁 주소 -> 실제 호출 대상 주소 테이블.
+공유 객체마다 한 번만 PLT 섹션을 디코딩하고 .rela.plt/.rela.dyn 과 GOT 내용을 읽어 테이블을 만들며
+이후 PLT 호출은 딕셔너리 조회로 처리함.
+'''
+
+from elftools.elf.elffile import ELFFile
+
+import elf_utils
+import xed_decoder
+from process_memory import MemoryReadError
+
+
+class PltResolver:
+    def __init__(self, memory, symbols):
+        self.memory = memory
+        self.symbols = symbols
+
+        # 스텁 주소 -> 호출 대상 주소 (찾을 수 없으면 None)
+        self.stubs = {}
+        # 테이블을 만든 공유 객체
+        self.loaded = set()
+        # (GOT 섹션 시작, 끝) -> 섹션 전체 내용
+        self.got_data = {}
+
+    def _read_got_section(self, slot):
+        for start, end, _ in self._got_sections(slot):
+            if start <= slot and slot + 8 <= end:
+                if (start, end) not in self.got_data:
+                    # GOT 섹션은 한 번의 읽기로 가져옴
+                    try:
+                        self.got_data[(start, end)] = self.memory.read(start, end - start)
+                    except MemoryReadError:
+                        self.got_data[(start, end)] = None
+                return start, self.got_data[(start, end)]
+        return None, None
+
+    def _got_sections(self, slot):
+        path, _ = self.symbols.object_at(slot)
+        if path is None:
+            return []
+        return [section for name in elf_utils.GOT_SECTIONS
+                for section in self.symbols.section_ranges(name, path)]
+
+    def read_slot(self, slot):
+        '''
+        GOT 슬롯의 값을 반환. GOT 섹션이 아니라면 메모리에서 직접 읽음.
+        '''
+        start, data = self._read_got_section(slot)
+        if data is None:
+            return int.from_bytes(self.memory.read(slot, 8), 'little')
+        return int.from_bytes(data[slot - start:slot - start + 8], 'little')
+
+    def _find_stubs(self, path):
+        '''
+        PLT 섹션을 디코딩해 {스텁 시작 주소: GOT 슬롯 주소}를 반환.
+        '''
+        stubs = {}
+        for name in elf_utils.PLT_SECTIONS:
+            for start, end, _ in self.symbols.section_ranges(name, path):
+                try:
+                    code = self.memory.read(start, end - start)
+                except MemoryReadError:
+                    continue
+
+                previous = None
+                for instruction in xed_decoder.decode(code, start):
+                    # jmp [rip+GOT] 앞의 endbr64 (IBT)는 스텁에 포함됨
+                    if instruction.iclass.startswith('JMP') and instruction.mem_target is not None:
+                        stub = instruction.address
+                        if previous is not None and previous.iclass == 'ENDBR64' \
+                                and previous.address + previous.length == instruction.address:
+                            stub = previous.address
+                        stubs[stub] = instruction.mem_target
+                    previous = instruction
+        return stubs
+
+    def _load(self, path):
+        self.loaded.add(path)
+
+        base = self.symbols.bases[path]
+        try:
+            with open(path, 'rb') as f:
+                relocations = elf_utils.get_got_relocations(ELFFile(f))
+        except Exception:
+            relocations = {}
+
+        plt_ranges = [(start, end) for name in elf_utils.PLT_SECTIONS
+                      for start, end, _ in self.symbols.section_ranges(name, path)]
+
+        for stub, slot in self._find_stubs(path).items():
+            try:
+                target = self.read_slot(slot)
+            except MemoryReadError:
+                target = 0
+
+            # lazy binding에서 아직 해석되지 않은 슬롯은 PLT를 가리키므로 재배치의 심볼 이름으로 탐색
+            if target == 0 or any(start <= target < end for start, end in plt_ranges):
+                name = relocations.get(slot - base)
+                target = self.symbols.find_global(name) if name else None
+
+            self.stubs[stub] = target
+
+    def resolve(self, stub_addr):
+        '''
+        PLT 스텁의 실제 호출 대상 주소. 찾을 수 없으면 None.
+        '''
+        if stub_addr not in self.stubs:
+            path, _ = self.symbols.object_at(stub_addr)
+            if path is None or path in self.loaded:
+                return None
+            self._load(path)
+        return self.stubs.get(stub_addr)
@@ -0,0 +1,442 @@
+import bisect
+import ctypes
+import gzip
+import os
+import pickle
+import re
+import signal
+import time
+from contextlib import contextmanager
+
+import elf_utils
+import phase_tracer
+
+# 재배치가 적용되는 데이터 섹션. Python 확장 모듈의 PyMethodDef 테이블이 위치함
+RELOCATED_DATA_SECTIONS = ('.data.rel.ro', '.data')
+
+# 스냅샷 파일에 기록하는 환경 변수 (분석에 필요한 플래그만 저장)
+SNAPSHOT_ENVIRON = ('LD_BIND_NOW', 'GLIBC_TUNABLES')
+SNAPSHOT_VERSION = 1
+
+PTRACE_ATTACH = 16
+PTRACE_DETACH = 17
+# waitpid에서 스레드(clone)도 기다림
+WAIT_ALL = 0x40000000
+
+# SIGSTOP 이후 모든 스레드가 멈출 때까지 기다리는 시간과 /proc/PID/task 확인 간격 (sec)
+STOP_TIMEOUT = 1.0
+STOP_POLL_INTERVAL = 0.005
+
+# Python 확장 모듈 파일 이름 (ex. _multiarray_umath.cpython-310-x86_64-linux-gnu.so, _ctypes.abi3.so)
+PYTHON_EXTENSION = re.compile(r'^([A-Za-z_]\w*)\.(cpython-[^.]+|abi3)\.so$')
+# 확장 모듈의 패키지 경로가 시작되는 디렉터리
+PYTHON_PATH_DIRS = ('site-packages', 'dist-packages', 'lib-dynload')
+
+
+class MemoryReadError(Exception):
+    pass
+
+
+class GdbMemory:
+    '''
+    GDB가 attach한 프로세스의 메모리를 읽음.
+    '''
+
+    def read(self, addr, size):
+        import gdb
+
+        phase_tracer.count(phase_tracer.GDB_COMMANDS)
+        try:
+            return bytes(gdb.selected_inferior().read_memory(addr, size))
+        except gdb.MemoryError as e:
+            raise MemoryReadError(hex(addr)) from e
+
+
+class ProcMemory:
+    '''
+    /proc/PID/mem 에서 실행 중인 프로세스의 메모리를 직접 읽음. (ptrace attach 권한 필요)
+    '''
+
+    def __init__(self, pid):
+        self.fd = os.open(f'/proc/{pid}/mem', os.O_RDONLY)
+
+    def read(self, addr, size):
+        try:
+            data = os.pread(self.fd, size, addr)
+        except OSError as e:
+            raise MemoryReadError(hex(addr)) from e
+        if len(data) != size:
+            raise MemoryReadError(hex(addr))
+        return data
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ProcessSnapshot:
+    '''
+    프로세스에서 정적으로 얻을 수 없는 정보만 담은 스냅샷.
+    maps, load base, build-id, 실행 파일 경로, 환경 변수 플래그, Python 확장 모듈 테이블과
+    GOT/PLT, 익명 실행 영역, 확장 모듈의 재배치된 데이터 섹션의 내용.
+    consistent가 False이면 캡처하는 동안 멈추지 않은 스레드가 있어 GOT 등이 캡처 중에 바뀌었을 수 있음.
+    '''
+
+    # consistent 필드가 없는 이전 스냅샷 파일
+    consistent = True
+
+    def __init__(self, pid, exe, maps, bases, regions, environ, freeze_time,
+                 build_ids=None, python_modules=None, cmdline=None, cwd=None, consistent=True):
+        self.pid = pid
+        self.exe = exe
+        self.maps = maps
+        self.bases = bases
+        # 주소 순으로 정렬된 (start, bytes)
+        self.regions = sorted(regions)
+        self.environ = environ
+        self.freeze_time = freeze_time
+        # path -> build-id (hex 문자열, 없으면 None)
+        self.build_ids = build_ids or {}
+        # 모듈 이름 -> 확장 모듈 경로 (ex. numpy.core._multiarray_umath)
+        self.python_modules = python_modules or {}
+        self.cmdline = cmdline or []
+        self.cwd = cwd
+        self.consistent = consistent
+
+    @property
+    def glibc_rtm_enable(self):
+        return 'glibc.elision.enable=1' in self.environ
+
+    @property
+    def ld_bind_now(self):
+        return re.search(r'^LD_BIND_NOW=.+$', self.environ, re.MULTILINE) is not None
+
+    def stale_objects(self):
+        '''
+        캡처 이후 디스크의 파일이 바뀌어 build-id가 다른 공유 객체 리스트.
+        '''
+        stale = []
+        for path, build_id in self.build_ids.items():
+            if _read_build_id(path) != build_id:
+                stale.append(path)
+        return stale
+
+
+class MappedFileMemory:
+    '''
+    파일 매핑 영역을 디스크의 ELF 파일에서 읽음. (.text 등 로드 이후 바뀌지 않는 영역)
+    프로세스에 접근하지 않으므로 워커 프로세스에서도 사용할 수 있음.
+    '''
+
+    def __init__(self, maps):
+        self.mappings = sorted((start, end, offset, path)
+                               for start, end, _, offset, path in maps if path.startswith('/'))
+        self.mapping_starts = [start for start, _, _, _ in self.mappings]
+
+        self.files = {}
+
+    def _find_mapping(self, addr, size):
+        idx = bisect.bisect_right(self.mapping_starts, addr) - 1
+        if idx < 0:
+            return None
+
+        start, end, offset, path = self.mappings[idx]
+        if not start <= addr or addr + size > end:
+            return None
+        return self.mappings[idx]
+
+    def is_mapped(self, addr, size):
+        return self._find_mapping(addr, size) is not None
+
+    def _read_file(self, addr, size):
+        mapping = self._find_mapping(addr, size)
+        if mapping is None:
+            raise MemoryReadError(hex(addr))
+
+        start, _, offset, path = mapping
+        if path not in self.files:
+            self.files[path] = os.open(path, os.O_RDONLY)
+
+        data = os.pread(self.files[path], size, offset + addr - start)
+        if len(data) != size:
+            raise MemoryReadError(hex(addr))
+        return data
+
+    def read(self, addr, size):
+        return self._read_file(addr, size)
+
+    def close(self):
+        for fd in self.files.values():
+            os.close(fd)
+        self.files.clear()
+
+
+class SnapshotMemory(MappedFileMemory):
+    '''
+    스냅샷에 캡처된 영역은 캡처된 내용을, 나머지 파일 매핑 영역은 디스크의 ELF 파일을 읽음.
+    '''
+
+    def __init__(self, snapshot):
+        super().__init__(snapshot.maps)
+        self.regions = snapshot.regions
+        self.region_starts = [start for start, _ in self.regions]
+
+    def _read_region(self, addr, size):
+        idx = bisect.bisect_right(self.region_starts, addr) - 1
+        if idx < 0:
+            return None
+
+        start, data = self.regions[idx]
+        if addr + size > start + len(data):
+            return None
+        return data[addr - start:addr - start + size]
+
+    def read(self, addr, size):
+        data = self._read_region(addr, size)
+        if data is not None:
+            return data
+        return self._read_file(addr, size)
+
+
+def _read_build_id(path):
+    try:
+        return elf_utils.load_build_id(path)
+    except Exception:
+        return None
+
+
+def get_section_ranges(bases, names):
+    '''
+    공유 객체별로 이름이 names에 속하는 섹션을 (start, size) 리스트로 반환.
+    '''
+    ranges = []
+    for path, base in bases.items():
+        try:
+            sections = elf_utils.load_sections(path)
+        except Exception:
+            continue
+
+        for name, addr, size in sections:
+            if name in names:
+                ranges.append((base + addr, size))
+
+    return ranges
+
+
+def get_got_ranges(bases):
+    '''
+    공유 객체별 GOT 섹션을 (start, size) 리스트로 반환.
+    '''
+    return get_section_ranges(bases, elf_utils.GOT_SECTIONS)
+
+
+def get_python_modules(bases):
+    '''
+    로드된 Python 확장 모듈의 {모듈 이름: 경로}.
+    이름은 site-packages, lib-dynload 등의 디렉터리 이후 경로로 만듦. (순수 Python 모듈은 maps에 나타나지 않음)
+    '''
+    modules = {}
+    for path in bases:
+        match = PYTHON_EXTENSION.match(os.path.basename(path))
+        if match is None:
+            continue
+
+        directories = os.path.dirname(path).split('/')
+        for idx in range(len(directories) - 1, -1, -1):
+            if directories[idx] in PYTHON_PATH_DIRS:
+                package = directories[idx + 1:]
+                break
+        else:
+            package = []
+        modules['.'.join(package + [match.group(1)])] = path
+
+    return modules
+
+
+def _read_environ_flags(pid):
+    with open(f'/proc/{pid}/environ', 'rb') as file:
+        environ = file.read().decode('utf-8', errors='replace').split('\0')
+    return '\n'.join(line for line in environ if line.split('=', 1)[0] in SNAPSHOT_ENVIRON)
+
+
+def _read_regions(mem, ranges):
+    regions = []
+    for start, size in ranges:
+        try:
+            data = os.pread(mem, size, start)
+        except OSError:
+            continue
+        if data:
+            regions.append((start, data))
+    return regions
+
+
+def _anonymous_executable_ranges(maps):
+    # JIT 코드 등 파일에 없는 실행 영역. [vsyscall]은 /proc/PID/mem 으로 읽을 수 없음
+    return [(start, end - start) for start, end, perms, _, path in maps
+            if 'x' in perms and not path.startswith('/') and path != '[vsyscall]']
+
+
+def _process_state(pid):
+    with open(f'/proc/{pid}/stat', 'r') as f:
+        # pid (comm) state ... comm에 공백이 있을 수 있으므로 마지막 ')' 이후를 파싱
+        return f.read().rsplit(')', 1)[1].split()[0]
+
+
+def _wait_stopped(pid, timeout=STOP_TIMEOUT):
+    '''
+    모든 스레드가 멈출 때까지 기다림. timeout 이내에 멈추지 않으면 False.
+    '''
+    deadline = time.time() + timeout
+    while True:
+        tids = os.listdir(f'/proc/{pid}/task')
+        if all(_process_state(f'{pid}/task/{tid}') in ('T', 't') for tid in tids):
+            return True
+        if time.time() >= deadline:
+            return False
+        time.sleep(STOP_POLL_INTERVAL)
+
+
+def glibc_rtm_enabled(pid):
+    return 'glibc.elision.enable=1' in _read_environ_flags(pid)
+
+
+_libc = None
+
+
+def _ptrace(request, tid):
+    global _libc
+
+    if _libc is None:
+        _libc = ctypes.CDLL(None, use_errno=True)
+        _libc.ptrace.argtypes = [ctypes.c_long, ctypes.c_long, ctypes.c_void_p, ctypes.c_void_p]
+        _libc.ptrace.restype = ctypes.c_long
+
+    if _libc.ptrace(request, tid, None, None) == -1:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+@contextmanager
+def attach_process(pid):
+    '''
+    GDB의 attach와 같이 ptrace로 프로세스의 모든 스레드에 attach 하여 분석하는 동안 멈춤.
+    SIGSTOP과 달리 분석 스크립트가 비정상 종료해도 커널이 detach 하므로 워크로드가 멈춘 채로 남지 않음.
+    '''
+    tried = set()
+    attached = []
+    try:
+        # attach 하는 동안 새로 생성된 스레드가 없을 때까지 반복
+        while True:
+            tids = [int(tid) for tid in os.listdir(f'/proc/{pid}/task') if int(tid) not in tried]
+            if not tids:
+                break
+            for tid in tids:
+                tried.add(tid)
+                try:
+                    _ptrace(PTRACE_ATTACH, tid)
+                except ProcessLookupError:
+                    # 이미 종료된 스레드
+                    continue
+                attached.append(tid)
+                os.waitpid(tid, WAIT_ALL)
+        yield
+    finally:
+        for tid in attached:
+            try:
+                _ptrace(PTRACE_DETACH, tid)
+            except OSError:
+                pass
+
+
+@contextmanager
+def stop_process(pid):
+    '''
+    ptrace 권한이 없는 경우 SIGSTOP으로 분석하는 동안 프로세스를 멈춤. (이미 멈춘 프로세스는 재개하지 않음)
+    '''
+    already_stopped = _process_state(pid) in ('T', 't')
+    if not already_stopped:
+        os.kill(pid, signal.SIGSTOP)
+    try:
+        if not _wait_stopped(pid):
+            print(f'warning: process {pid} did not stop within {STOP_TIMEOUT} sec, '
+                  f'memory may change during analysis')
+        yield
+    finally:
+        if not already_stopped:
+            os.kill(pid, signal.SIGCONT)
+
+
+def capture_process(pid):
+    '''
+    프로세스를 잠깐 멈추고 maps, GOT 영역, 익명 실행 영역만 읽은 뒤 바로 재개함.
+    ELF 파싱, 환경 변수와 변하지 않는 영역(PLT, 재배치가 끝난 확장 모듈 데이터)은 멈추기 전후에 읽어
+    정지 시간을 최소화하고, 정지 시간은 freeze_time 으로 기록.
+    '''
+    maps = elf_utils.read_proc_maps(pid)
+    bases = elf_utils.get_load_bases(maps)
+    got_ranges = get_got_ranges(bases)
+    exe = os.readlink(f'/proc/{pid}/exe')
+    environ = _read_environ_flags(pid)
+
+    already_stopped = _process_state(pid) in ('T', 't')
+
+    mem = os.open(f'/proc/{pid}/mem', os.O_RDONLY)
+    try:
+        freeze_start = time.time()
+        if not already_stopped:
+            os.kill(pid, signal.SIGSTOP)
+        try:
+            consistent = _wait_stopped(pid)
+            if not consistent:
+                print(f'warning: process {pid} did not stop within {STOP_TIMEOUT} sec, '
+                      f'snapshot may not be consistent')
+
+            # 분석 준비 중 새로 로드된 공유 객체 반영
+            maps = elf_utils.read_proc_maps(pid)
+            new_objects = [mapping for mapping in maps
+                           if mapping[4].startswith('/') and mapping[4] not in bases]
+            if new_objects:
+                new_bases = elf_utils.get_load_bases(new_objects)
+                bases.update(new_bases)
+                got_ranges += get_got_ranges(new_bases)
+
+            regions = _read_regions(mem, got_ranges + _anonymous_executable_ranges(maps))
+        finally:
+            if not already_stopped:
+                os.kill(pid, signal.SIGCONT)
+        freeze_time = time.time() - freeze_start
+
+        # 로드 이후 바뀌지 않는 영역은 재개한 뒤에 읽음
+        python_modules = get_python_modules(bases)
+        module_bases = {path: bases[path] for path in python_modules.values()}
+        regions += _read_regions(mem, get_section_ranges(bases, elf_utils.PLT_SECTIONS) +
+                                 get_section_ranges(module_bases, RELOCATED_DATA_SECTIONS))
+    finally:
+        os.close(mem)
+
+    build_ids = {path: _read_build_id(path) for path in bases}
+    with open(f'/proc/{pid}/cmdline', 'rb') as f:
+        cmdline = [arg.decode('utf-8', errors='replace') for arg in f.read().split(b'\0') if arg]
+    cwd = os.readlink(f'/proc/{pid}/cwd')
+
+    return ProcessSnapshot(pid, exe, maps, bases, regions, environ, freeze_time,
+                           build_ids, python_modules, cmdline, cwd, consistent)
+
+
+def save_snapshot(snapshot, path):
+    '''
+    스냅샷을 gzip으로 압축한 pickle 파일로 저장.
+    '''
+    with gzip.open(path, 'wb', compresslevel=1) as f:
+        pickle.dump((SNAPSHOT_VERSION, vars(snapshot)), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_snapshot(path):
+    with gzip.open(path, 'rb') as f:
+        version, fields = pickle.load(f)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f'unsupported snapshot version {version}: {path}')
+
+    snapshot = ProcessSnapshot.__new__(ProcessSnapshot)
+    snapshot.__dict__.update(fields)
+    return snapshot
@@ -0,0 +1,138 @@
+'''
+full scan 전에 .text 버퍼에서 CPU 기능을 구분할 수 있는 인스트럭션이 있을 수 있는 위치를 NumPy로 찾음.
+후보 바이트 패턴이 없는 함수는 x86-64 기본 ISA(I86, LONGMODE, X87, MMX, SSE, SSE2, CMOV 등)만 사용하므로
+XED/capstone으로 디코딩하지 않음. 인스트럭션 경계를 모르는 상태에서 바이트 단위로 찾으므로
+ModRM, 변위, 즉시값에 같은 바이트가 있으면 후보가 되지만(false positive) 후보를 놓치지는 않음.
+REX2(D5, APX)는 capstone이 디코딩하지 않아 full scan 결과에도 나타나지 않으므로 후보로 보지 않음.
+
+후보 패턴
+VEX         C4 (map 1-3, 5-7), C5 (뒤의 opcode가 VEX map 1에서 유효한 경우)
+EVEX        62 (map 1-7, P0와 P1의 고정 비트)
+XOP         8F (map 8-10)
+0F escape   0F 38, 0F 3A, 0F 01, 0F AE, 0F C7 등 기본 ISA가 아닌 opcode
+            (0F 12, 16, 2B, BC, BD 는 F2/F3 prefix가 있는 경우만)
+기타        9E, 9F (LAHF/SAHF), C6 F8, C7 F8 (XABORT, XBEGIN)
+
+F3 0F 1E FA/FB (ENDBR64/32)는 거의 모든 함수의 시작에 있으므로 후보로 보지 않고 인코딩만 따로 기록.
+디코딩하지 않은 바이트가 있는 섹션은 기본 ISA의 대표 인코딩(BASELINE_ENCODINGS)을 결과에 추가해
+건너뛴 함수에만 있는 기본 ISA set도 plain scan과 같이 CSV에 기록되도록 함.
+'''
+
+import numpy as np
+
+# 후보가 없는 함수에 있을 수 있는 기본 ISA set별 대표 인코딩 (XED ISA set)
+BASELINE_ENCODINGS = {
+    b'\x89\xc8': 'mov',               # I86
+    b'\x6a\x00': 'push',              # I186
+    b'\x0f\xb6\xc1': 'movzx',          # I386
+    b'\x0f\xc8': 'bswap',             # I486REAL
+    b'\x0f\xb1\xc8': 'cmpxchg',        # I486
+    b'\x48\x63\xc1': 'movsxd',         # LONGMODE
+    b'\x0f\x44\xc1': 'cmove',          # CMOV
+    b'\xda\xc1': 'fcmovb',            # FCMOV
+    b'\xd9\xc0': 'fld',               # X87
+    b'\x0f\x6f\xc1': 'movq',           # PENTIUMMMX
+    b'\x0f\x28\xc1': 'movaps',         # SSE
+    b'\x66\x0f\x28\xc1': 'movapd',      # SSE2
+}
+
+# 청크 경계에 걸친 패턴을 찾기 위해 앞뒤로 더 읽는 바이트 수
+LOOKBEHIND = 3
+LOOKAHEAD = 4
+
+
+def _table(values):
+    table = np.zeros(256, dtype=bool)
+    table[list(values)] = True
+    return table
+
+
+SINGLE_BYTE = _table([0x9E, 0x9F])
+VEX3_MAP = _table([1, 2, 3, 5, 6, 7])
+VEX_MAP1 = _table([*range(0x10, 0x18), *range(0x28, 0x30), *range(0x41, 0x4C), *range(0x50, 0x80),
+                   *range(0x90, 0x94), 0x98, 0x99, 0xAE, 0xC2, 0xC4, 0xC5, 0xC6, *range(0xD0, 0x100)])
+EVEX_MAP = _table(range(1, 8))
+XOP_MAP = _table([8, 9, 10])
+REPEAT_PREFIX = _table([0xF2, 0xF3])
+REX_PREFIX = _table(range(0x40, 0x50))
+
+# 0F 다음 바이트 중 x86-64 기본 ISA만 사용하는 opcode
+BASELINE_0F = _table([
+    0x05, 0x0B, 0x1F,
+    *range(0x40, 0x50), *range(0x80, 0xA0),
+    0xA0, 0xA1, 0xA3, 0xA4, 0xA5, 0xA8, 0xA9, 0xAB, 0xAC, 0xAD, 0xAF,
+    0xB0, 0xB1, 0xB3, 0xB6, 0xB7, 0xBA, 0xBB, 0xBE, 0xBF, 0xC0, 0xC1, *range(0xC8, 0xD0),
+    # SSE, SSE2, MMX
+    0x10, 0x11, 0x13, 0x14, 0x15, 0x17, 0x28, 0x29, 0x2A, 0x2C, 0x2D, 0x2E, 0x2F,
+    *range(0x50, 0x78), 0x7E, 0x7F, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, *range(0xD1, 0xF0), *range(0xF1, 0x100),
+])
+# F2/F3 prefix가 있으면 기본 ISA가 아닌 opcode (MOVSLDUP, MOVDDUP, MOVNTSD, TZCNT, LZCNT)
+PREFIXED_0F = _table([0x12, 0x16, 0x2B, 0xBC, 0xBD])
+FEATURE_0F = ~BASELINE_0F | PREFIXED_0F
+
+
+def find_candidates(code):
+    '''
+    버퍼에서 후보 패턴이 시작하는 오프셋과 ENDBR 인스트럭션의 오프셋을 반환.
+    '''
+    a = np.frombuffer(code, dtype=np.uint8)
+    n = len(a)
+    padded = np.concatenate([np.zeros(2, dtype=np.uint8), a, np.zeros(LOOKAHEAD, dtype=np.uint8)])
+    p2, p1 = padded[:n], padded[1:n + 1]
+    b0, b1, b2 = padded[2:n + 2], padded[3:n + 3], padded[4:n + 4]
+
+    mask = SINGLE_BYTE[b0]
+    mask |= (b0 == 0xC4) & VEX3_MAP[b1 & 0x1F]
+    mask |= (b0 == 0xC5) & VEX_MAP1[b2]
+    mask |= (b0 == 0x62) & EVEX_MAP[b1 & 0x07] & ((b1 & 0x08) == 0) & ((b2 & 0x04) != 0)
+    mask |= (b0 == 0x8F) & XOP_MAP[b1 & 0x1F]
+    mask |= ((b0 == 0xC6) | (b0 == 0xC7)) & (b1 == 0xF8)
+
+    escape = b0 == 0x0F
+    prefixed = REPEAT_PREFIX[p1] | (REX_PREFIX[p1] & REPEAT_PREFIX[p2])
+    endbr = escape & (b1 == 0x1E) & (p1 == 0xF3) & ((b2 == 0xFA) | (b2 == 0xFB))
+    feature = np.where(PREFIXED_0F[b1], prefixed, FEATURE_0F[b1])
+    mask |= escape & feature & ~endbr
+
+    # ENDBR은 F3 prefix 위치를 인스트럭션의 시작으로 기록
+    return np.flatnonzero(mask), np.flatnonzero(endbr) - 1
+
+
+def decode_ranges(starts, ends, section_start, section_end, addrs):
+    '''
+    후보 주소(addrs)를 포함하는 함수 범위를 합쳐 디코딩할 [(start, end)]로 반환.
+    함수 심볼이 없는 위치는 앞 함수의 끝과 다음 함수의 시작 사이 전체를 디코딩함.
+    starts, ends는 주소 순으로 정렬된 공유 객체의 함수 범위 (np.uint64).
+    '''
+    if len(addrs) == 0:
+        return []
+
+    inside = (starts >= section_start) & (starts < section_end)
+    starts, ends = starts[inside], np.minimum(ends[inside], np.uint64(section_end))
+    addrs = np.asarray(addrs, dtype=np.uint64)
+
+    idx = np.searchsorted(starts, addrs, side='right') - 1
+    # 겹치는 함수가 있을 수 있으므로 앞쪽 함수들의 끝 중 최댓값 기준
+    max_ends = np.maximum.accumulate(ends) if len(ends) else ends
+    # 최댓값을 가진 (후보를 포함하는) 함수의 인덱스
+    owners = np.maximum.accumulate(np.where(ends == max_ends, np.arange(len(ends)), 0)) if len(ends) else ends
+    covered_end = np.where(idx >= 0, max_ends[np.maximum(idx, 0)] if len(ends) else 0, section_start)
+    in_function = (idx >= 0) & (addrs < covered_end)
+
+    ranges = set()
+    for i in np.unique(owners[idx[in_function]]).tolist():
+        ranges.add((int(starts[i]), int(ends[i])))
+    # 함수가 아닌 위치는 앞 함수의 끝(없으면 섹션 시작)부터 다음 함수의 시작(없으면 섹션 끝)까지
+    for i in np.unique(idx[~in_function]).tolist():
+        gap_start = int(max_ends[i]) if i >= 0 else section_start
+        gap_end = int(starts[i + 1]) if i + 1 < len(starts) else section_end
+        ranges.add((gap_start, gap_end))
+
+    # 겹치거나 이어지는 범위를 합침
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
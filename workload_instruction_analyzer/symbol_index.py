@@ -0,0 +1,268 @@
+import bisect
+import os
+
+import numpy as np
+
+import elf_utils
+
+
+class SymbolIndex:
+    '''
+    /proc/PID/maps 와 각 공유 객체의 ELF 섹션 헤더, 심볼 테이블(.symtab, .dynsym)을 이용해
+    주소 -> (공유 객체, 섹션, 함수 시작 주소, 심볼), 심볼 -> 주소를 GDB 질의 없이 찾음.
+    섹션은 생성(attach) 시 모든 공유 객체를 하나의 정렬된 배열로 만들고
+    함수 심볼은 공유 객체가 처음 조회될 때 객체별 정렬된 배열로 로드함.
+    maps, bases를 직접 넘기면 (ex. 캡처된 스냅샷) 프로세스에 접근하지 않음.
+    '''
+
+    def __init__(self, pid=None, maps=None, bases=None):
+        if maps is None:
+            maps = elf_utils.read_proc_maps(pid)
+        if bases is None:
+            bases = elf_utils.get_load_bases(maps)
+        self.bases = bases
+
+        self.mappings = sorted((start, end, path) for start, end, _, _, path in maps
+                               if path in self.bases)
+        self.mapping_starts = [start for start, _, _ in self.mappings]
+
+        # path -> [(name, start, end)]
+        self.sections = {}
+        # path -> (starts, ends, names). starts, ends는 np.uint64 배열
+        self.functions = {}
+        # path -> {name: start}
+        self.names = {}
+        # path -> {name: start}. .dynsym 에 정의된 global, weak 함수
+        self.exported = {}
+        # path -> (DT_SONAME, DT_NEEDED 리스트)
+        self.dynamic = {}
+
+        self._build_section_index()
+
+    def _build_section_index(self):
+        '''
+        모든 공유 객체의 섹션을 시작 주소 순으로 정렬해 한 번의 searchsorted로 찾을 수 있도록 함.
+        '''
+        sections = sorted((start, end, name, path)
+                          for path in self.objects()
+                          for name, start, end in self._load_sections(path))
+
+        self.section_starts = np.array([section[0] for section in sections], dtype=np.uint64)
+        self.section_ends = np.array([section[1] for section in sections], dtype=np.uint64)
+        self.section_names = [section[2] for section in sections]
+        self.section_paths = [section[3] for section in sections]
+
+    def _find_object(self, addr):
+        idx = bisect.bisect_right(self.mapping_starts, addr) - 1
+        if idx < 0:
+            return None
+
+        start, end, path = self.mappings[idx]
+        if not start <= addr < end:
+            return None
+        return path
+
+    def _find_section(self, addr):
+        idx = int(np.searchsorted(self.section_starts, np.uint64(addr), side='right')) - 1
+        if idx < 0 or not addr < self.section_ends[idx]:
+            return None
+        return idx
+
+    def _load_sections(self, path):
+        if path in self.sections:
+            return self.sections[path]
+
+        base = self.bases[path]
+        try:
+            sections = elf_utils.load_sections(path)
+        except Exception:
+            sections = []
+
+        self.sections[path] = [(name, base + addr, base + addr + size)
+                               for name, addr, size in sections]
+        return self.sections[path]
+
+    def _load_functions(self, path):
+        if path in self.functions:
+            return self.functions[path]
+
+        base = self.bases[path]
+        try:
+            symbols = elf_utils.load_function_symbols(path)
+        except Exception:
+            symbols = []
+
+        starts = np.array([addr for addr, _, _ in symbols], dtype=np.uint64) + np.uint64(base)
+        sizes = np.array([size for _, size, _ in symbols], dtype=np.uint64)
+        names = [symbol_names for _, _, symbol_names in symbols]
+
+        # 크기 정보가 없는 심볼은 GDB와 같이 다음 심볼 또는 섹션의 끝까지를 범위로 봄
+        ends = np.where(sizes != 0, starts + sizes, np.append(starts[1:], starts[-1:]))
+        if len(starts) and sizes[-1] == 0:
+            idx = self._find_section(int(starts[-1]))
+            if idx is not None:
+                ends[-1] = self.section_ends[idx]
+
+        self.functions[path] = (starts, ends, names)
+        return self.functions[path]
+
+    def _load_dynamic(self, path):
+        if path not in self.dynamic:
+            try:
+                self.dynamic[path] = elf_utils.load_dynamic_names(path)
+            except Exception:
+                self.dynamic[path] = (None, [])
+        return self.dynamic[path]
+
+    def dependencies(self, path):
+        '''
+        공유 객체가 DT_NEEDED 로 의존하는 공유 객체 중 로드된 객체의 경로 리스트.
+        maps의 경로는 심볼릭 링크가 풀려 있으므로 SONAME, 파일 이름 순으로 찾음.
+        '''
+        loaded = {}
+        for object_path in self.objects():
+            soname, _ = self._load_dynamic(object_path)
+            loaded.setdefault(os.path.basename(object_path), object_path)
+            if soname is not None:
+                loaded[soname] = object_path
+
+        _, needed = self._load_dynamic(path)
+        return [loaded[name] for name in needed if name in loaded]
+
+    def objects(self):
+        return list(self.bases.keys())
+
+    def object_at(self, addr):
+        '''
+        addr이 속한 공유 객체의 (path, load base)를 반환.
+        '''
+        path = self._find_object(addr)
+        if path is None:
+            return None, None
+        return path, self.bases[path]
+
+    def function_ranges(self, path):
+        '''
+        공유 객체의 함수 (starts, ends)를 시작 주소 순으로 반환. (np.uint64 배열)
+        '''
+        starts, ends, _ = self._load_functions(path)
+        return starts, ends
+
+    def function_range(self, addr):
+        '''
+        addr을 포함하는 함수의 (start, end, names)를 반환. 함수를 찾을 수 없으면 None.
+        '''
+        path = self._find_object(addr)
+        if path is None:
+            return None
+
+        starts, ends, names = self._load_functions(path)
+        idx = int(np.searchsorted(starts, np.uint64(addr), side='right')) - 1
+        if idx < 0 or not addr < ends[idx]:
+            return None
+
+        return int(starts[idx]), int(ends[idx]), names[idx]
+
+    def function_at(self, addr):
+        '''
+        addr이 함수의 시작 주소라면 함수 이름 목록을 반환.
+        '''
+        path = self._find_object(addr)
+        if path is None:
+            return None
+
+        starts, _, names = self._load_functions(path)
+        idx = int(np.searchsorted(starts, np.uint64(addr), side='left'))
+        if idx < len(starts) and starts[idx] == addr:
+            return names[idx]
+        return None
+
+    def lookup(self, addr):
+        '''
+        addr을 (공유 객체, 섹션 이름, 함수 시작 주소, 함수 이름 목록)으로 변환. 찾을 수 없는 항목은 None.
+        '''
+        path = self._find_object(addr)
+        section = self.section_name(addr)
+        function = self.function_range(addr)
+        if function is None:
+            return path, section, None, None
+        return path, section, function[0], function[2]
+
+    def find_function(self, name, path):
+        '''
+        공유 객체(path)에서 이름이 name인 함수의 시작 주소를 반환.
+        '''
+        if path not in self.names:
+            starts, _, names = self._load_functions(path)
+            index = {}
+            for start, symbol_names in zip(starts.tolist(), names):
+                for symbol_name in symbol_names:
+                    index.setdefault(symbol_name, start)
+            self.names[path] = index
+
+        return self.names[path].get(name)
+
+    def _load_exported(self, path):
+        if path not in self.exported:
+            try:
+                exported = elf_utils.load_exported_functions(path)
+            except Exception:
+                exported = {}
+            base = self.bases[path]
+            self.exported[path] = {symbol_name: base + addr for symbol_name, addr in exported.items()}
+        return self.exported[path]
+
+    def find_global(self, name):
+        '''
+        동적 링커의 심볼 탐색과 같이 실행 파일부터 로드된 공유 객체 순서로 .dynsym 에 정의된
+        global, weak 함수 중 이름이 name인 함수를 찾음. (다른 객체의 static 함수는 사용하지 않음)
+        '''
+        for path in self.objects():
+            address = self._load_exported(path).get(name)
+            if address is not None:
+                return address
+        return None
+
+    def find_symbol(self, name):
+        '''
+        로드된 모든 공유 객체의 .symtab, .dynsym 에서 이름이 name인 함수를 찾음. (local 심볼 포함)
+        '''
+        for path in self.objects():
+            address = self.find_function(name, path)
+            if address is not None:
+                return address
+        return None
+
+    def section_name(self, addr):
+        idx = self._find_section(addr)
+        if idx is None:
+            return None
+        return self.section_names[idx]
+
+    def in_section(self, addr, name):
+        return self.section_name(addr) == name
+
+    def section_ranges(self, name, path=None):
+        '''
+        이름이 name인 섹션의 (start, end, path) 리스트. path가 없으면 모든 공유 객체를 대상으로 함.
+        '''
+        paths = [path] if path is not None else self.objects()
+
+        ranges = []
+        for object_path in paths:
+            for section_name, start, end in self._load_sections(object_path):
+                if section_name == name:
+                    ranges.append((start, end, object_path))
+        return ranges
+
+    def got_range(self, exe):
+        '''
+        GDB의 info files와 같이 실행 파일의 첫 .got 섹션만 got 호출 판단에 사용. [start, end], 없으면 [].
+        '''
+        got_ranges = self.section_ranges('.got', exe)
+        if not got_ranges:
+            return []
+        return [got_ranges[0][0], got_ranges[0][1]]
+
+    def is_plt(self, addr):
+        return self.section_name(addr) in elf_utils.PLT_SECTIONS
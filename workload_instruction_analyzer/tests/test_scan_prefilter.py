@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scan_prefilter
+
+
+# (이름, 인코딩, 후보 여부)
+CANDIDATE_CASES = [
+    ('vzeroupper (VEX2)', 'c5f877', True),
+    ('vbroadcastss (VEX3)', 'c4e27918c0', True),
+    ('vmovaps zmm (EVEX)', '62f17c4828c1', True),
+    ('pshufb (0F 38)', '660f3800c1', True),
+    ('palignr (0F 3A)', '660f3a0fc108', True),
+    ('lahf', '9f', True),
+    ('sahf', '9e', True),
+    ('xbegin', 'c7f800000000', True),
+    ('xabort', 'c6f801', True),
+    ('tzcnt (F3 0F BC)', 'f30fbcc1', True),
+    ('lzcnt (F3 REX 0F BD)', 'f3480fbdc1', True),
+    ('mov', '89c8', False),
+    ('mov imm', '48c7c001000000', False),
+    ('cmove', '0f44c1', False),
+    ('bsf (0F BC)', '0fbcc1', False),
+    ('movaps', '0f28c1', False),
+    ('nop', '0f1f4000', False),
+    ('endbr64', 'f30f1efa', False),
+    ('endbr32', 'f30f1efb', False),
+]
+
+
+@pytest.mark.parametrize('name, encoding, candidate', CANDIDATE_CASES, ids=[case[0] for case in CANDIDATE_CASES])
+def test_find_candidates(name, encoding, candidate):
+    offsets, _ = scan_prefilter.find_candidates(bytes.fromhex(encoding))
+    assert (len(offsets) > 0) == candidate
+
+
+def test_find_candidates_reports_endbr_start():
+    offsets, endbrs = scan_prefilter.find_candidates(bytes.fromhex('89c8f30f1efa'))
+    assert len(offsets) == 0
+    assert endbrs.tolist() == [2]
+
+
+def test_baseline_encodings_are_not_candidates():
+    for encoding in scan_prefilter.BASELINE_ENCODINGS:
+        assert len(scan_prefilter.find_candidates(encoding)[0]) == 0
+
+
+def ranges(starts, ends, addrs, section=(0, 1000)):
+    return scan_prefilter.decode_ranges(np.array(starts, dtype=np.uint64), np.array(ends, dtype=np.uint64),
+                                        section[0], section[1], addrs)
+
+
+def test_candidate_in_enclosing_function_after_nested_symbol():
+    # 250은 [100, 300) 안에 있지만 마지막으로 시작한 함수는 [150, 200)
+    assert ranges([100, 150], [300, 200], [250]) == [(100, 300)]
+
+
+def test_candidate_in_overlapping_functions():
+    assert ranges([100, 150, 180], [300, 200, 220], [210, 260]) == [(100, 300)]
+
+
+def test_candidate_in_last_function_and_gap():
+    assert ranges([100, 150], [120, 200], [160, 130]) == [(120, 200)]
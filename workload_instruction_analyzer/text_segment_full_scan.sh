@@ -2,14 +2,23 @@
 
 # Check if the first parameter is provided
 if [ -z "$1" ]; then
-    echo "Warning: A PID must be provided as a parameter."
+    echo "Warning: A PID or a snapshot file must be provided as a parameter."
     exit 1
 fi
 
-export WORKLOAD_PID=$1
+# A snapshot file from capture_snapshot.sh is scanned without attaching to the workload
+if [ -f "$1" ]; then
+    export SNAPSHOT_FILE=$1
+else
+    export WORKLOAD_PID=$1
+fi
 
 # xedlib
 export LD_LIBRARY_PATH=/home/ubuntu/xed/obj:$LD_LIBRARY_PATH
 
 # Run GDB
-gdb -p $1 -x /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/gdb_script_full_scan.py
+if [ ! -z "$SNAPSHOT_FILE" ]; then
+    gdb -batch -x /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/gdb_script_full_scan.py
+else
+    gdb -p $1 -x /home/ubuntu/LiveMigrate-Detector/workload_instruction_analyzer/gdb_script_full_scan.py
+fi
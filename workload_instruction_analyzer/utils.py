@@ -1,27 +1,108 @@
-import pandas as pd
+import csv
+import io
+import json
+import os
+from collections import Counter
 
 from pathlib import Path
 
 rootdir = str(Path(__file__).resolve().parent)
 
 workload_isa_file = f'{rootdir}/log/isa_set.csv'
+# ISA_SET_JSON=1 이면 CSV와 함께 ISA set별 인스트럭션 수, TSX 플래그, 공유 객체별 분석 여부를 JSON으로 기록
+# (deadline으로 근사된 공유 객체가 있으면 항상 기록)
+workload_isa_json_file = f'{rootdir}/log/isa_set.json'
+# capture_snapshot.py 가 기본으로 저장하는 스냅샷 파일
+workload_snapshot_file = f'{rootdir}/log/workload.snapshot'
+# analysis_daemon.py 가 요청을 받는 Unix socket
+analysis_socket_file = f'{rootdir}/log/analysis.sock'
+
+
+class IsaAggregator:
+    '''
+    ISA set별 첫 예시 인스트럭션(SHORT)과 등장 횟수만 유지하며 인스트럭션을 집계.
+    인스트럭션마다 dict를 만들지 않으므로 메모리 사용량이 인스트럭션 수와 무관함.
+    '''
+
+    def __init__(self):
+        # ISA set -> SHORT (삽입 순서 = 처음 발견된 순서)
+        self.examples = {}
+        self.counts = Counter()
+        # 공유 객체 -> 'traced' / 'approximated' (execution path tracking)
+        self.objects = {}
+
+    def add(self, isa_set, example='', count=1):
+        '''
+        example은 ISA set이 처음 추가될 때만 사용됨. callable을 넘기면 그때 한 번만 호출.
+        '''
+        if isa_set not in self.examples:
+            self.examples[isa_set] = example() if callable(example) else example
+        self.counts[isa_set] += count
+
+    def __contains__(self, isa_set):
+        return isa_set in self.examples
+
+    def __len__(self):
+        return len(self.examples)
+
+    def rows(self, is_tsx_run=None, xtest_enable=None):
+        '''
+        CSV에 기록할 (ISA_SET, SHORT) 리스트.
+        TSX 정보가 주어지면 TSX를 실행하지 않는 경우 RTM ISA set을 제외하고 XTEST 사용 여부를 추가.
+        '''
+        rows = list(self.examples.items())
+
+        if is_tsx_run is not None and xtest_enable is not None:
+            if not is_tsx_run:
+                rows = [(isa_set, short) for isa_set, short in rows if 'RTM' not in isa_set]
+            if xtest_enable:
+                rows.append(('XTEST', ''))
+
+        return rows
+
+    def csv_text(self, is_tsx_run=None, xtest_enable=None):
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(['ISA_SET', 'SHORT'])
+        writer.writerows(self.rows(is_tsx_run, xtest_enable))
+        return output.getvalue()
+
+    def json_data(self, is_tsx_run=None, xtest_enable=None):
+        isa_sets = [{'ISA_SET': isa_set, 'SHORT': short, 'COUNT': self.counts[isa_set]}
+                    for isa_set, short in self.rows(is_tsx_run, xtest_enable)]
+        return {'is_tsx_run': is_tsx_run, 'xtest_enable': xtest_enable,
+                'isa_sets': isa_sets, 'objects': self.objects}
+
+    def write_csv(self, is_tsx_run=None, xtest_enable=None, path=workload_isa_file):
+        with open(path, 'w', newline='') as f:
+            f.write(self.csv_text(is_tsx_run, xtest_enable))
+
+    def write_json(self, is_tsx_run=None, xtest_enable=None, path=workload_isa_json_file):
+        with open(path, 'w') as f:
+            json.dump(self.json_data(is_tsx_run, xtest_enable), f, indent=2)
+
+    def write(self, is_tsx_run=None, xtest_enable=None, method=None):
+        '''
+        method가 주어지면 분석 방법별 파일(log/isa_set.<method>.csv)에 기록. (한 번의 attach로 여러 방법을 실행하는 경우)
+        '''
+        csv_path, json_path = result_files(method)
+        self.write_csv(is_tsx_run, xtest_enable, csv_path)
+        if os.getenv('ISA_SET_JSON', '0') == '1' or 'approximated' in self.objects.values():
+            self.write_json(is_tsx_run, xtest_enable, json_path)
+
+
+def result_files(method=None):
+    if method is None:
+        return workload_isa_file, workload_isa_json_file
+    return f'{rootdir}/log/isa_set.{method}.csv', f'{rootdir}/log/isa_set.{method}.json'
+
 
 def create_csv(workload_data_list, is_tsx_run=None, xtest_enable=None):
-    if len(workload_data_list) == 0:
-        with open(workload_isa_file, 'w') as f:
-            f.write('ISA_SET,SHORT\n')
-        return
-    
-    # Convert workload_data_list to DataFrame and save as csv
-    workload_df = pd.DataFrame(workload_data_list)
-    workload_df = workload_df.drop_duplicates(subset='ISA_SET')
-
-    if is_tsx_run != None and xtest_enable != None:
-        if not is_tsx_run:
-            workload_df = workload_df[~workload_df['ISA_SET'].str.contains('RTM')]
-
-        workload_df = workload_df[['ISA_SET', 'SHORT']]
-        if xtest_enable:
-            workload_df.loc[len(workload_df)] = ['XTEST', '']
-
-    workload_df.to_csv(workload_isa_file, index=False)
\ No newline at end of file
+    '''
+    {'ISA_SET', 'SHORT'} dict 리스트를 집계해 CSV로 기록. (리스트를 만드는 기존 스크립트용)
+    '''
+    aggregator = IsaAggregator()
+    for instruction_data in workload_data_list:
+        aggregator.add(instruction_data['ISA_SET'], instruction_data['SHORT'])
+
+    aggregator.write(is_tsx_run, xtest_enable)
@@ -0,0 +1,203 @@
+'''
+text-segment full scan, execution path tracking, bytecode (only) execution path tracking의 실행 함수.
+메모리 소스(GdbMemory, ProcMemory, SnapshotMemory)와 심볼 인덱스만 사용하므로
+GDB 스크립트, GDB 없이 실행하는 analyze_workload.py, analysis_daemon.py 에서 함께 사용.
+'''
+
+import os
+import sys
+import time
+
+import utils
+import xed_decoder
+import full_scan
+import parallel_full_scan
+import exepath_tracking
+import decode_cache
+import phase_tracer
+
+disas_file = f'{utils.rootdir}/log/disas.txt'
+
+
+def get_text_sections(symbols, exe):
+    # GDB의 info files와 같이 실행 파일은 ".text", 공유 객체는 ".text in path" 로 표시
+    sections = []
+    for start, end, path in symbols.section_ranges('.text'):
+        name = '.text' if path == exe else f'.text in {path}'
+        sections.append((start, end, name))
+
+    return sections
+
+
+def scan_sections(memory, maps, sections, symbols, cache, workers):
+    '''
+    섹션별 스캔 결과를 sections 순서로 하나씩 반환. 순차 스캔은 섹션을 스캔하는 대로 반환함.
+    prefilter(FULL_SCAN_PREFILTER=1)는 디코딩할 함수 범위가 섹션마다 달라 순차로 스캔.
+    '''
+    if workers > 1 and not full_scan.PREFILTER:
+        yield from parallel_full_scan.scan_sections(memory, maps, sections, symbols, cache, workers)
+        return
+
+    for start_addr, end_addr, name in sections:
+        with phase_tracer.span('scan_section', section=name):
+            section_output = full_scan.scan_section(memory, start_addr, end_addr, name, symbols, cache)
+        yield section_output
+
+
+def preprocessing(instructions, aggregator):
+    '''
+    새로 발견된 인코딩을 한 번의 호출로 분류해 집계. (이전 실행에서 디코딩한 인코딩은 캐시에서 조회)
+    '''
+    encodings = [bytes.fromhex(instruction_hex) for _, _, instruction_hex in instructions]
+    results = xed_decoder.classify_encodings(encodings, decode_cache.get_cache())
+
+    # SHORT는 ISA set별 첫 인스트럭션만 CSV에 기록되므로 처음 발견된 ISA set만 어셈블리 문자열을 생성
+    for encoding, result in zip(encodings, results):
+        if result is None:
+            aggregator.add("Error", "Error")
+        else:
+            aggregator.add(result[0], lambda: xed_decoder.disassemble(encoding))
+
+
+def text_segment_full_scan(memory, maps, symbols, exe, cache=None, workers=1):
+    '''
+    모든 .text 섹션을 스캔해 (utils.IsaAggregator, 고유 인코딩 수)를 반환.
+    스캔 결과는 인코딩 단위로 중복을 제거한 뒤 바로 분류해 집계하며
+    FULL_SCAN_DISAS_DUMP=1 인 경우에만 디버깅용으로 log/disas.txt 에 기록.
+    '''
+    sections = get_text_sections(symbols, exe)
+    disas_dump = open(disas_file, 'w') if os.getenv('FULL_SCAN_DISAS_DUMP', '0') == '1' else None
+
+    seen = set()
+    aggregator = utils.IsaAggregator()
+    with phase_tracer.span('full_scan', workers=workers, prefilter=full_scan.PREFILTER):
+        for section_output in scan_sections(memory, maps, sections, symbols, cache, workers):
+            instructions = []
+            for addr, mnemonic, instruction_hex in section_output:
+                if instruction_hex not in seen:
+                    instructions.append((addr, mnemonic, instruction_hex))
+                    seen.add(instruction_hex)
+
+            if disas_dump is not None:
+                disas_dump.writelines(f"{hex(addr)}: {mnemonic} {instruction_hex}\n"
+                                      for addr, mnemonic, instruction_hex in instructions)
+
+            with phase_tracer.span('preprocessing'):
+                preprocessing(instructions, aggregator)
+
+    if disas_dump is not None:
+        disas_dump.close()
+    return aggregator, len(seen)
+
+
+def bytecode_tracking(memory, symbols, exe, script_path):
+    '''
+    python 워크로드의 bytecode tracking으로 (실행될 수 있는 C 함수 주소, 탐색한 모듈 수)를 반환.
+    sys.path는 분석이 끝나면 복원하므로 analysis_daemon.py 에서 이전 워크로드의 스크립트 디렉토리가 남지 않음.
+    '''
+    saved_path = list(sys.path)
+    # 쉘 스크립트에서 PYTHONPATH에 추가하는 경로
+    bytecode_dir = f'{utils.rootdir}/bytecode_tracking'
+    if bytecode_dir not in sys.path:
+        sys.path.append(bytecode_dir)
+    script_dir = os.path.dirname(os.path.abspath(script_path))
+    if script_dir not in sys.path:
+        sys.path.append(script_dir)
+
+    try:
+        import btracking
+        import func_mapping
+
+        # bytecode tracking의 PyMethodDef 탐색도 같은 심볼 인덱스와 메모리를 사용
+        func_mapping.set_target(symbols, memory, target_exe=exe)
+        try:
+            tracking_functions, _, module_count = btracking.main(script_path)
+        finally:
+            func_mapping.set_target(None, None)
+    finally:
+        sys.path[:] = saved_path
+    return tracking_functions, module_count
+
+
+def create_tracker(memory, symbols, exe, glibc_rtm_enable=False, cache=None):
+    return exepath_tracking.ExePathTracker(
+        memory, symbols, symbols.got_range(exe),
+        glibc_rtm_enable=glibc_rtm_enable, cache=cache)
+
+
+def main_address(symbols, exe):
+    start_addr = symbols.find_function('main', exe)
+    if start_addr is None:
+        raise LookupError(f'main not found in {exe}')
+    return start_addr
+
+
+def execution_path_tracking(memory, symbols, exe, language='c', script_path=None, glibc_rtm_enable=False,
+                            cache=None, deadline=None, main_root=True):
+    '''
+    GDB 없이 execution path tracking을 수행하고 (ExePathTracker, 탐색한 모듈 수)를 반환.
+    language가 python이면 bytecode tracking으로 찾은 C 함수를 루트에 추가하며
+    main_root=False 이면 main을 루트로 추가하지 않음 (bytecode only execution path tracking).
+    '''
+    tracker = create_tracker(memory, symbols, exe, glibc_rtm_enable, cache)
+
+    module_count = 0
+    if language == 'python':
+        tracking_functions, module_count = bytecode_tracking(memory, symbols, exe, script_path)
+        tracker.add_roots(tracking_functions)
+
+    with phase_tracer.span('exepath_tracking'):
+        if main_root:
+            tracker.add_roots([main_address(symbols, exe)])
+
+        tracker.run(deadline)
+
+    return tracker, module_count
+
+
+def combined_analysis(memory, maps, symbols, exe, language='c', script_path=None, glibc_rtm_enable=False,
+                      cache=None, workers=1, deadline=None):
+    '''
+    한 번의 attach로 experiment/1-collect-info.sh 가 수집하는 결과를 함께 계산.
+      text_segment_full_scan    .text 섹션 전체
+      native                    main에서 시작하는 execution path tracking
+      bytecode                  main과 bytecode tracking으로 찾은 함수에서 시작하는 execution path tracking (python)
+      bytecode_only_ept         bytecode tracking으로 찾은 함수에서만 시작하는 execution path tracking (python)
+    세 execution path tracking은 하나의 호출 그래프를 공유함. main에서 분석한 뒤 bytecode tracking의 루트를 추가해
+    새로 발견된 함수만 분석하고, 결과는 루트 집합별로 도달 가능한 ISA set을 집계.
+    반환값은 ({method: (utils.IsaAggregator, is_tsx_run, xtest_enable)}, {단계: sec}, 탐색한 모듈 수).
+    '''
+    results = {}
+    timings = {}
+
+    started = time.time()
+    aggregator, _ = text_segment_full_scan(memory, maps, symbols, exe, cache, workers)
+    results['text_segment_full_scan'] = (aggregator, None, None)
+    timings['text_segment_full_scan'] = time.time() - started
+
+    started = time.time()
+    tracker = create_tracker(memory, symbols, exe, glibc_rtm_enable, cache)
+    main_roots = [exepath_tracking.format_address(main_address(symbols, exe))]
+    with phase_tracer.span('exepath_tracking', roots='main'):
+        tracker.add_roots(main_roots)
+        tracker.run(deadline)
+    results['native'] = (tracker.aggregate(main_roots), *tracker.tsx_flags(main_roots))
+    timings['native'] = time.time() - started
+
+    module_count = 0
+    if language == 'python':
+        started = time.time()
+        tracking_functions, module_count = bytecode_tracking(memory, symbols, exe, script_path)
+        timings['btracking'] = time.time() - started
+
+        # main에서 이미 분석한 함수는 다시 분석하지 않음
+        started = time.time()
+        bytecode_roots = [exepath_tracking.format_address(address) for address in tracking_functions]
+        with phase_tracer.span('exepath_tracking', roots='bytecode'):
+            tracker.add_roots(bytecode_roots)
+            tracker.run(deadline)
+        results['bytecode'] = (tracker.aggregate(), *tracker.tsx_flags())
+        results['bytecode_only_ept'] = (tracker.aggregate(bytecode_roots), *tracker.tsx_flags(bytecode_roots))
+        timings['bytecode'] = time.time() - started
+
+    return results, timings, module_count
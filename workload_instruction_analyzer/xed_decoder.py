@@ -0,0 +1,229 @@
+import ctypes
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+import phase_tracer
+
+rootdir = str(Path(__file__).resolve().parent)
+
+# xed wrapper 라이브러리 로드
+libxedwrapper = ctypes.CDLL(f'{rootdir}/xedlib/libxedwrapper.so')
+if not hasattr(libxedwrapper, 'decode_buffer'):
+    raise ImportError(f'{rootdir}/xedlib/libxedwrapper.so was built before the batched decode API, '
+                      f'rebuild it (see xedlib/build.txt)')
+
+# xed_decoding.c 의 XED_RECORD_* 플래그
+RECORD_BRANCH = 0x1
+RECORD_MEMOP = 0x2
+RECORD_RIP_REL = 0x4
+RECORD_MEM_DISP = 0x8
+
+# x86-64 인스트럭션의 최대 길이
+MAX_INSTRUCTION_BYTES = 15
+
+# decode_buffer 한 번의 호출로 채울 수 있는 최대 레코드 수
+RECORD_BATCH = 1 << 16
+
+DISASSEMBLY_BUFLEN = 200
+
+
+class XedResult(ctypes.Structure):
+    _fields_ = [("isa_set", ctypes.c_char_p),
+                ("disassembly", ctypes.c_char_p)]
+
+
+class XedDecodeRecord(ctypes.Structure):
+    _fields_ = [("offset", ctypes.c_ulonglong),
+                ("length", ctypes.c_uint),
+                ("isa_set", ctypes.c_int),
+                ("iclass", ctypes.c_int),
+                ("category", ctypes.c_int),
+                ("flags", ctypes.c_uint),
+                ("branch_target", ctypes.c_ulonglong),
+                ("mem_target", ctypes.c_ulonglong),
+                ("disp_offset", ctypes.c_uint),
+                ("disp_width", ctypes.c_uint)]
+
+
+RECORD_DTYPE = np.dtype(XedDecodeRecord)
+
+
+# 함수 프로토타입 정의
+libxedwrapper.print_isa_set.argtypes = [ctypes.c_char_p]
+libxedwrapper.print_isa_set.restype = XedResult
+
+libxedwrapper.decode_instruction.argtypes = [
+    ctypes.c_void_p, ctypes.c_uint, ctypes.c_ulonglong, ctypes.POINTER(XedDecodeRecord)]
+libxedwrapper.decode_instruction.restype = ctypes.c_int
+
+libxedwrapper.decode_buffer.argtypes = [
+    ctypes.c_void_p, ctypes.c_size_t, ctypes.c_size_t, ctypes.c_ulonglong, ctypes.c_size_t,
+    ctypes.POINTER(XedDecodeRecord), ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t)]
+libxedwrapper.decode_buffer.restype = ctypes.c_size_t
+
+libxedwrapper.format_instruction.argtypes = [
+    ctypes.c_void_p, ctypes.c_uint, ctypes.c_char_p, ctypes.c_int]
+libxedwrapper.format_instruction.restype = ctypes.c_int
+
+for _name_func in (libxedwrapper.isa_set_name, libxedwrapper.iclass_name, libxedwrapper.category_name):
+    _name_func.argtypes = [ctypes.c_int]
+    _name_func.restype = ctypes.c_char_p
+
+# address, length, raw(bytes), iclass, category, isa_set 은 항상 채워지며
+# branch_target 은 상대 분기, mem_target 은 rip 상대 메모리 피연산자가 있을 때만 값을 가짐.
+Instruction = namedtuple('Instruction', [
+    'address', 'length', 'raw', 'iclass', 'category', 'isa_set', 'branch_target', 'mem_target', 'flags'])
+
+TRANSFER_CATEGORIES = {'CALL', 'COND_BR', 'UNCOND_BR'}
+
+
+@lru_cache(maxsize=None)
+def isa_set_name(isa_set):
+    return libxedwrapper.isa_set_name(isa_set).decode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def iclass_name(iclass):
+    return libxedwrapper.iclass_name(iclass).decode('utf-8')
+
+
+@lru_cache(maxsize=None)
+def category_name(category):
+    return libxedwrapper.category_name(category).decode('utf-8')
+
+
+def _as_buffer(code):
+    '''
+    ctypes로 넘길 버퍼를 복사 없이 준비. bytes는 내부 버퍼를 그대로 전달하고
+    bytearray, mmap 등 쓰기 가능한 버퍼는 from_buffer로 참조함.
+    그 외(ex. gdb.Membuf, memoryview)는 bytes로 한 번만 복사.
+    '''
+    if isinstance(code, bytes):
+        return code, code
+    try:
+        return (ctypes.c_char * len(code)).from_buffer(code), code
+    except TypeError:
+        code = bytes(code)
+        return code, code
+
+
+def iter_records(code, base_addr, stride=0):
+    '''
+    버퍼 전체를 decode_buffer 로 디코딩하며 (records, count) 묶음을 반환.
+    레코드 배열은 다음 묶음에서 재사용되므로 반환 즉시 소비해야 함.
+    '''
+    buffer, _ = _as_buffer(code)
+    length = len(code)
+
+    batch = min(RECORD_BATCH, max(length // (stride or 1), 1))
+    records = (XedDecodeRecord * batch)()
+    next_offset = ctypes.c_size_t(0)
+
+    offset = 0
+    while offset < length:
+        count = libxedwrapper.decode_buffer(
+            buffer, length, offset, base_addr, stride, records, batch, ctypes.byref(next_offset))
+        phase_tracer.count(phase_tracer.XED_CALLS)
+        phase_tracer.count(phase_tracer.INSTRUCTIONS_DECODED, count)
+        if count:
+            yield records, count
+        offset = next_offset.value
+
+
+def _make_instruction(record, base_addr, code):
+    offset = record.offset
+    return Instruction(
+        address=base_addr + offset,
+        length=record.length,
+        raw=bytes(code[offset:offset + record.length]),
+        iclass=iclass_name(record.iclass),
+        category=category_name(record.category),
+        isa_set=isa_set_name(record.isa_set),
+        branch_target=record.branch_target if record.flags & RECORD_BRANCH else None,
+        mem_target=record.mem_target if record.flags & RECORD_RIP_REL else None,
+        flags=record.flags)
+
+
+def decode(code, base_addr):
+    '''
+    메모리에서 한 번에 읽어온 바이트 배열(code)을 base_addr 부터 선형으로 디코딩.
+    디코딩할 수 없는 바이트는 GDB의 (bad) 처리와 같이 1바이트씩 건너뜀.
+    '''
+    _, code = _as_buffer(code)
+
+    instructions = []
+    for records, count in iter_records(code, base_addr):
+        for i in range(count):
+            instructions.append(_make_instruction(records[i], base_addr, code))
+
+    return instructions
+
+
+def scan_isa_sets(code):
+    '''
+    버퍼 전체를 선형으로 디코딩해 ISA set별 첫 인스트럭션의 인코딩을 반환.
+    인스트럭션마다 Instruction을 만들지 않고 레코드 배열을 NumPy로 집계함.
+    '''
+    _, code = _as_buffer(code)
+
+    examples = {}
+    for records, count in iter_records(code, 0):
+        array = np.frombuffer(records, dtype=RECORD_DTYPE, count=count)
+        isa_sets, first = np.unique(array['isa_set'], return_index=True)
+        for isa_set, i in zip(isa_sets.tolist(), first.tolist()):
+            name = isa_set_name(isa_set)
+            if name not in examples:
+                offset = int(array['offset'][i])
+                examples[name] = bytes(code[offset:offset + int(array['length'][i])])
+
+    return examples
+
+
+def classify_encodings(encodings, cache=None):
+    '''
+    서로 다른 인코딩 목록을 15바이트 슬롯에 채워 한 번의 호출로 디코딩.
+    cache(decode_cache.DecodeCache)가 주어지면 캐시에 없는 인코딩만 디코딩.
+    반환값: 인코딩별 (isa_set, iclass) 리스트. 디코딩에 실패한 인코딩은 None.
+    '''
+    results = [None] * len(encodings)
+
+    misses = []
+    for i, encoding in enumerate(encodings):
+        if cache is not None:
+            results[i] = cache.lookup(encoding)
+        if results[i] is None:
+            misses.append(i)
+
+    slots = bytearray(len(misses) * MAX_INSTRUCTION_BYTES)
+    for slot, i in enumerate(misses):
+        start = slot * MAX_INSTRUCTION_BYTES
+        slots[start:start + len(encodings[i])] = encodings[i]
+
+    slot = 0
+    for records, count in iter_records(slots, 0, stride=MAX_INSTRUCTION_BYTES):
+        for j in range(count):
+            record = records[j]
+            i = misses[slot]
+            slot += 1
+            if record.length == 0:
+                continue
+
+            results[i] = (isa_set_name(record.isa_set), iclass_name(record.iclass))
+            if cache is not None:
+                cache.store(encodings[i][:record.length], *results[i],
+                            record.disp_offset, record.disp_width)
+
+    return results
+
+
+def disassemble(raw):
+    '''
+    CSV에 기록할 인스트럭션의 어셈블리 문자열(SHORT)을 생성.
+    '''
+    buf = ctypes.create_string_buffer(DISASSEMBLY_BUFLEN)
+    if not libxedwrapper.format_instruction(raw, len(raw), buf, DISASSEMBLY_BUFLEN):
+        return "Error"
+    return buf.value.decode('utf-8')
@@ -1,90 +1,242 @@
 #include <stdio.h>
 #include <string.h>
 #include <stdlib.h>
+#include <pthread.h>
 #include "xed-interface.h"
 
 typedef struct {
-    char* isa_set;
-    char* disassembly;
+    const char* isa_set;
+    const char* disassembly;
 } xed_result;
 
-void hex_string_to_byte_array(const char* hex_str, unsigned char* byte_array, int byte_array_max) {
-    int hex_str_len = strlen(hex_str);
-    int i = 0, j = 0;
+// 구조화된 디코딩 결과 (Python의 ctypes.Structure와 레이아웃이 같아야 함)
+typedef struct {
+    unsigned long long offset;         // 버퍼 시작으로부터의 오프셋
+    unsigned int length;
+    int isa_set;
+    int iclass;
+    int category;
+    unsigned int flags;
+    unsigned long long branch_target;  // 상대 분기의 절대 목적지 주소
+    unsigned long long mem_target;     // rip 상대 메모리 피연산자의 절대 주소
+    unsigned int disp_offset;          // 위치에 따라 달라지는 displacement(상대 분기, rip 상대)의 인스트럭션 내 오프셋
+    unsigned int disp_width;           // 해당 displacement의 바이트 수 (없으면 0)
+} xed_decode_record;
+
+#define XED_RECORD_BRANCH      0x1  // 상대 분기 (branch_target 유효)
+#define XED_RECORD_MEMOP       0x2  // 메모리 피연산자 존재
+#define XED_RECORD_RIP_REL     0x4  // rip 상대 메모리 피연산자 (mem_target 유효)
+#define XED_RECORD_MEM_DISP    0x8  // 메모리 피연산자에 displacement 존재
+
+#define XBUFLEN 200
+
+static pthread_once_t tables_once = PTHREAD_ONCE_INIT;
+
+static void init_tables(void) {
+    xed_tables_init();
+}
+
+// xed 테이블은 프로세스당 한 번만 초기화
+static void ensure_tables(void) {
+    pthread_once(&tables_once, init_tables);
+}
+
+static int hex_value(char c) {
+    if (c >= '0' && c <= '9') return c - '0';
+    if (c >= 'a' && c <= 'f') return c - 'a' + 10;
+    if (c >= 'A' && c <= 'F') return c - 'A' + 10;
+    return 0;
+}
+
+int hex_string_to_byte_array(const char* hex_str, unsigned char* byte_array, int byte_array_max) {
+    int j = 0;
 
-    // 문자열을 바이트로 변환
-    while (i < hex_str_len && j < byte_array_max) {
-        sscanf(&hex_str[i], "%2hhx", &byte_array[j]);
-        i += 2;  // 2개의 16진수 문자가 한 바이트
-        j++;
+    // 문자열을 바이트로 변환 (2개의 16진수 문자가 한 바이트)
+    while (hex_str[0] && hex_str[1] && j < byte_array_max) {
+        byte_array[j++] = (hex_value(hex_str[0]) << 4) | hex_value(hex_str[1]);
+        hex_str += 2;
     }
+
+    return j;
 }
 
-char* disassemble(xed_decoded_inst_t* xedd) {
-    xed_bool_t ok;
+static int format_decoded(xed_decoded_inst_t* xedd, char* buf, int buflen) {
     xed_print_info_t pi;
-    #define XBUFLEN 200
-    char* buf = malloc(XBUFLEN);  // 동적 메모리 할당
-
-    if (!buf) return NULL;  // 메모리 할당 실패 시 NULL 반환
 
     xed_init_print_info(&pi);
     pi.p = xedd;
-    pi.blen = XBUFLEN;
+    pi.blen = buflen;
     pi.buf = buf;
     pi.buf[0] = 0; // 초기화
 
-    ok = xed_format_generic(&pi);
-    if (!ok) {
-        free(buf); // 실패 시 메모리 해제
-        return NULL;
-    }
-
-    return buf; // 성공 시 문자열 반환
+    return xed_format_generic(&pi);
 }
 
-
-xed_result print_isa_set(const char* byte_sequence) {
-    xed_decoded_inst_t xedd;
-    xed_error_enum_t xed_error;
+static xed_error_enum_t decode_at(xed_decoded_inst_t* xedd, const unsigned char* bytes, unsigned int len) {
     xed_state_t state;
 
-    // xed 초기화
-    xed_tables_init();
-
     // 디코딩할 바이트코드의 상태 설정
     xed_state_zero(&state);
     state.mmode = XED_MACHINE_MODE_LONG_64;
 
-    // 16진수 문자열을 바이트 배열로 변환
-    int byte_sequence_len = strlen(byte_sequence) / 2;
-    unsigned char* bytes = (unsigned char*)malloc(byte_sequence_len);
-    
+    if (len > XED_MAX_INSTRUCTION_BYTES)
+        len = XED_MAX_INSTRUCTION_BYTES;
+
+    xed_decoded_inst_zero_set_mode(xedd, &state);
+    return xed_decode(xedd, bytes, len);
+}
+
+xed_result print_isa_set(const char* byte_sequence) {
+    // 결과 문자열은 다음 호출 전까지만 유효함 (호출 측에서 즉시 복사)
+    static __thread char disassembly[XBUFLEN];
+    unsigned char bytes[XED_MAX_INSTRUCTION_BYTES];
+    xed_decoded_inst_t xedd;
+
     xed_result result;
     result.isa_set = NULL;
     result.disassembly = NULL;
 
-    if (!bytes) {
+    ensure_tables();
+
+    int byte_sequence_len = hex_string_to_byte_array(byte_sequence, bytes, XED_MAX_INSTRUCTION_BYTES);
+
+    // 인스트럭션 디코딩
+    if (decode_at(&xedd, bytes, byte_sequence_len) != XED_ERROR_NONE) {
         return result; // 반환 객체의 멤버는 NULL로 설정됨
     }
 
-    hex_string_to_byte_array(byte_sequence, bytes, byte_sequence_len);
+    // ISA set 조회 (xed의 정적 문자열이므로 복사하지 않음)
+    result.isa_set = xed_isa_set_enum_t2str(xed_decoded_inst_get_isa_set(&xedd));
+    if (format_decoded(&xedd, disassembly, XBUFLEN))
+        result.disassembly = disassembly;
 
-    // 인스트럭션 디코딩
-    xed_decoded_inst_zero_set_mode(&xedd, &state);
-    xed_error = xed_decode(&xedd, bytes, byte_sequence_len);
-    free(bytes);
+    return result;
+}
 
-    if (xed_error != XED_ERROR_NONE) {
-        return result; // 반환 객체의 멤버는 NULL로 설정됨
+static void fill_record(xed_decoded_inst_t* xedd, unsigned long long offset, unsigned long long address, xed_decode_record* out) {
+    unsigned int length = xed_decoded_inst_get_length(xedd);
+
+    out->offset = offset;
+    out->length = length;
+    out->isa_set = xed_decoded_inst_get_isa_set(xedd);
+    out->iclass = xed_decoded_inst_get_iclass(xedd);
+    out->category = xed_decoded_inst_get_category(xedd);
+    out->flags = 0;
+    out->branch_target = 0;
+    out->mem_target = 0;
+    out->disp_offset = 0;
+    out->disp_width = 0;
+
+    unsigned int branch_width = xed_decoded_inst_get_branch_displacement_width(xedd);
+    if (branch_width > 0) {
+        out->flags |= XED_RECORD_BRANCH;
+        out->branch_target = address + length + xed_decoded_inst_get_branch_displacement(xedd);
+
+        // 상대 분기의 displacement는 인스트럭션의 마지막에 위치
+        out->disp_offset = length - branch_width;
+        out->disp_width = branch_width;
     }
 
-    // ISA set 조회
-    xed_isa_set_enum_t isaset = xed_decoded_inst_get_isa_set(&xedd);
-    const char* isa_set_name = xed_isa_set_enum_t2str(isaset);
+    if (xed_decoded_inst_number_of_memory_operands(xedd) > 0) {
+        out->flags |= XED_RECORD_MEMOP;
 
-    result.isa_set = strdup(isa_set_name);
-    result.disassembly = disassemble(&xedd);
+        if (xed_decoded_inst_get_memory_displacement_width(xedd, 0) > 0)
+            out->flags |= XED_RECORD_MEM_DISP;
 
-    return result;
-}
\ No newline at end of file
+        xed_reg_enum_t base = xed_decoded_inst_get_base_reg(xedd, 0);
+        if (base == XED_REG_RIP) {
+            out->flags |= XED_RECORD_RIP_REL;
+            out->mem_target = address + length + xed_decoded_inst_get_memory_displacement(xedd, 0);
+
+            // displacement 뒤에는 immediate만 올 수 있음
+            unsigned int mem_width = xed_decoded_inst_get_memory_displacement_width(xedd, 0);
+            out->disp_offset = length - xed_decoded_inst_get_immediate_width(xedd) - mem_width;
+            out->disp_width = mem_width;
+        }
+    }
+}
+
+// 주어진 주소에 위치한 인스트럭션 하나를 디코딩. 성공 시 0, 실패 시 xed_error_enum_t 값을 반환.
+int decode_instruction(const unsigned char* bytes, unsigned int len, unsigned long long address, xed_decode_record* out) {
+    xed_decoded_inst_t xedd;
+    xed_error_enum_t xed_error;
+
+    ensure_tables();
+
+    xed_error = decode_at(&xedd, bytes, len);
+    if (xed_error != XED_ERROR_NONE)
+        return xed_error;
+
+    fill_record(&xedd, 0, address, out);
+    return 0;
+}
+
+/*
+ * 버퍼 전체를 한 번의 호출로 디코딩해 호출 측이 할당한 out 배열을 채움.
+ *
+ * stride == 0 : start 오프셋부터 선형 탐색. 디코딩할 수 없는 바이트는 1바이트씩 건너뛰며 재동기화.
+ * stride  > 0 : start 부터 stride 간격으로 놓인 인스트럭션을 하나씩 디코딩 (인코딩 테이블 분류용).
+ *               디코딩에 실패한 슬롯은 length가 0인 레코드로 채움.
+ *
+ * 반환값은 채운 레코드 수. out이 가득 차면 멈추며 *next 에 다음 호출의 start 오프셋을 기록함.
+ */
+size_t decode_buffer(const unsigned char* bytes, size_t len, size_t start, unsigned long long base,
+                     size_t stride, xed_decode_record* out, size_t max_records, size_t* next) {
+    xed_decoded_inst_t xedd;
+    size_t offset = start;
+    size_t count = 0;
+
+    ensure_tables();
+
+    while (offset < len && count < max_records) {
+        size_t remain = len - offset;
+        if (stride && remain > stride)
+            remain = stride;
+        if (remain > XED_MAX_INSTRUCTION_BYTES)
+            remain = XED_MAX_INSTRUCTION_BYTES;
+
+        if (decode_at(&xedd, bytes + offset, (unsigned int)remain) != XED_ERROR_NONE) {
+            if (stride) {
+                memset(&out[count], 0, sizeof(xed_decode_record));
+                out[count].offset = offset;
+                count++;
+                offset += stride;
+            } else {
+                offset++;
+            }
+            continue;
+        }
+
+        fill_record(&xedd, offset, base + offset, &out[count]);
+        offset += stride ? stride : out[count].length;
+        count++;
+    }
+
+    if (next)
+        *next = offset;
+    return count;
+}
+
+// 디코딩한 인스트럭션의 어셈블리 문자열을 호출 측 버퍼에 기록. 성공 시 1 반환.
+int format_instruction(const unsigned char* bytes, unsigned int len, char* buf, int buflen) {
+    xed_decoded_inst_t xedd;
+
+    ensure_tables();
+
+    if (decode_at(&xedd, bytes, len) != XED_ERROR_NONE)
+        return 0;
+
+    return format_decoded(&xedd, buf, buflen);
+}
+
+const char* isa_set_name(int isa_set) {
+    return xed_isa_set_enum_t2str((xed_isa_set_enum_t)isa_set);
+}
+
+const char* iclass_name(int iclass) {
+    return xed_iclass_enum_t2str((xed_iclass_enum_t)iclass);
+}
+
+const char* category_name(int category) {
+    return xed_category_enum_t2str((xed_category_enum_t)category);
+}